@@ -0,0 +1,54 @@
+"""
+Compare time of reading a million-row observations file and of converting its dates to years with the previous
+implementation (list of year start dates built in Python loop) and with the vectorized conversion.
+
+Usage: python -m benchmarks.date_conversion_benchmark
+"""
+import tempfile
+import timeit
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tracer_method.core.read_data.read_observations_file import convert_date_to_year, read_observations
+
+ROWS = 1_000_000
+REPEATS = 3
+
+
+def loop_convert_date_to_year(dates: np.ndarray) -> np.ndarray:
+    """ Conversion of dates to years used before the vectorized conversion. """
+    years = dates.astype(dtype="datetime64[Y]")
+
+    days = dates - np.array([np.datetime64(f'{year}-01-01') for year in years])
+    days = days / np.timedelta64(1, 'D') + 1
+
+    return np.round(years.astype(str).astype(float) + days / 365, 2)
+
+
+def main():
+    random = np.random.default_rng(0)
+    dates = np.datetime64('1960-01-01') + random.integers(0, 60 * 365, ROWS).astype('timedelta64[D]')
+
+    loop_time = timeit.timeit(lambda: loop_convert_date_to_year(dates), number=REPEATS) / REPEATS
+    legacy_time = timeit.timeit(lambda: convert_date_to_year(dates, True), number=REPEATS) / REPEATS
+    vectorized_time = timeit.timeit(lambda: convert_date_to_year(dates), number=REPEATS) / REPEATS
+
+    assert np.array_equal(loop_convert_date_to_year(dates), convert_date_to_year(dates, True))
+
+    print(f'{"conversion":>22} {"time [s]":>9} {"speedup":>8}')
+    print(f'{"loop":>22} {loop_time:>9.3f} {1:>7.1f}x')
+    print(f'{"vectorized (legacy)":>22} {legacy_time:>9.3f} {loop_time / legacy_time:>7.1f}x')
+    print(f'{"vectorized":>22} {vectorized_time:>9.3f} {loop_time / vectorized_time:>7.1f}x')
+
+    with tempfile.TemporaryDirectory() as directory:
+        obs_file = Path(directory) / 'observations.csv'
+        pd.DataFrame({'Date': dates, 'Concentration': random.uniform(0, 50, ROWS)}).to_csv(obs_file, index=False)
+
+        read_time = timeit.timeit(lambda: read_observations(obs_file), number=REPEATS) / REPEATS
+        print(f'\nread_observations ({ROWS} rows): {read_time:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
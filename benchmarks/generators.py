@@ -0,0 +1,112 @@
+"""
+Synthetic data used by benchmarks: monthly tritium input series, observations generated with known model
+parameters and input and observations files.
+"""
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import tracer_method.core.constans as const
+from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
+from tracer_method.core.tritium.tritium_input_preparer import TritiumInputPreparer
+
+START_YEAR = 1950
+DECAY = np.log(2) / const.DECAY_CONSTANTS['tritium']
+# model configurations with transit time range which covers given transit time
+MODEL_CONFIGS = {
+    'EM': lambda t_t: ['EM', ((t_t * 0.5, t_t * 1.5), )],
+    'EPM': lambda t_t: ['EPM', ((t_t * 0.5, t_t * 1.5), (1.0, 3.0))],
+    'DM': lambda t_t: ['DM', ((t_t * 0.5, t_t * 1.5), (0.05, 1.0))],
+}
+# parameters of models (besides transit time) used to generate observations
+MODEL_PARAMS = {'EM': [], 'EPM': [1.5], 'DM': [0.2]}
+
+
+def generate_monthly_input(years: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Generate monthly tritium concentration with the bomb peak in 1963 and seasonal precipitation.
+
+    :param years: number of years of input
+    :param seed: seed of random numbers generator
+    :return: arrays with dates(year-month), tritium concentration and precipitation
+    """
+    random = np.random.default_rng(seed)
+    dates = np.arange(f'{START_YEAR}-01', f'{START_YEAR + years}-01', dtype='datetime64[M]')
+    time = np.arange(len(dates)) / 12
+
+    concentration = (10 + 1000 * np.exp(-((time - 13) / 3) ** 2)) * random.lognormal(0, 0.2, len(dates))
+    precipitation = (60 + 40 * np.sin(2 * np.pi * time)) * random.lognormal(0, 0.3, len(dates))
+
+    return dates, concentration, precipitation
+
+
+def generate_input_data(years: int, alpha: float = 0.7, seed: int = 0) -> np.ndarray:
+    """ Generate yearly input data of fitters (calculated from generated monthly input). """
+    return TritiumInputPreparer(*generate_monthly_input(years, seed), alpha).calculate_input()
+
+
+def get_model_config(model_type: str, transit_time: float) -> ConfigModel:
+    """ Get configuration of model with transit time range which covers given transit time. """
+    return ConfigModel(MODEL_CONFIGS[model_type](transit_time))
+
+
+def get_model_params(model_type: str, transit_time: float) -> np.ndarray:
+    """ Get parameters of model with given transit time used to generate observations. """
+    return np.array([transit_time] + MODEL_PARAMS[model_type])
+
+
+def generate_observations(input_data: np.ndarray, model_type: str, transit_time: float, n_obs: int,
+                          seed: int = 0) -> np.ndarray:
+    """
+    Generate observations from predictions of model with known parameters and 5% noise. Observations dates are
+    drawn from the second half of the input range.
+
+    :param input_data: input data of fitters
+    :param model_type: model type (EM, EPM or DM)
+    :param transit_time: transit time of the model
+    :param n_obs: number of observations
+    :param seed: seed of random numbers generator
+    :return: array with observations dates and concentration
+    """
+    random = np.random.default_rng(seed)
+    years = max(input_data[0]) + 1
+    dates = np.round(np.sort(random.uniform(START_YEAR + years / 2, START_YEAR + years - 0.5, n_obs)), 2)
+
+    fitter = ParamsFitter(input_data, np.array([dates, dates]), START_YEAR, get_model_config(model_type, transit_time),
+                          DECAY)
+    x, y = fitter._get_predictions(get_model_params(model_type, transit_time))
+
+    return np.array([dates, np.interp(dates, x, y) * random.normal(1, 0.05, n_obs)])
+
+
+def write_input_file(file: Path, years: int, seed: int = 0):
+    """ Write generated monthly input to csv, excel, parquet, feather or npz file. """
+    dates, concentration, precipitation = generate_monthly_input(years, seed)
+    write_columns(file, ['Date', 'Concentration', 'Precipitation'],
+                  [dates.astype('datetime64[D]'), concentration, precipitation])
+
+
+def write_observations_file(file: Path, rows: int, seed: int = 0):
+    """ Write observations with random dates to csv, excel, parquet, feather or npz file. """
+    random = np.random.default_rng(seed)
+    dates = np.sort(np.datetime64('1960-01-01') + random.integers(0, 60 * 365, rows).astype('timedelta64[D]'))
+    write_columns(file, ['Date', 'Concentration'], [dates, random.uniform(0, 50, rows)])
+
+
+def write_columns(file: Path, names: List[str], columns: List[np.ndarray]):
+    """ Write columns to file in format given by its extension. """
+    if file.suffix == '.npz':
+        np.savez(file, **dict(zip(names, columns)))
+        return
+
+    data = pd.DataFrame(dict(zip(names, columns)))
+    writers = {
+        '.csv': lambda: data.to_csv(file, index=False),
+        '.xlsx': lambda: data.to_excel(file, index=False),
+        '.parquet': lambda: data.to_parquet(file),
+        '.feather': lambda: data.to_feather(file),
+    }
+    writers[file.suffix]()
@@ -0,0 +1,48 @@
+"""
+Compare wall time and final MSE of single local minimization from the middle of parameters range and global search
+(Latin hypercube samples evaluated in batches and local minimizations from the best samples).
+
+Usage: python -m benchmarks.global_search_benchmark
+"""
+import time
+
+import numpy as np
+
+from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
+
+MODELS = [
+    (['EPM', ((1.0, 200.0), (1.0, 4.0))], [12.0, 3.2]),
+    (['EPM', ((1.0, 200.0), (1.0, 4.0))], [140.0, 1.2]),
+    (['DM', ((1.0, 200.0), (0.01, 2.0))], [9.0, 0.03]),
+    (['DM', ((1.0, 200.0), (0.01, 2.0))], [150.0, 1.5]),
+    (['EM', ((1.0, 200.0), )], [8.0]),
+]
+
+
+def main():
+    years = 70
+    random = np.random.default_rng(0)
+    # bomb peak shaped input
+    input_data = np.array([np.round(np.arange(0.00001, years, 1), 2),
+                           10 + 1000 * np.exp(-((np.arange(years) - 13) / 3) ** 2)])
+    obs_dates = np.arange(1975.5, 2020, 4)
+
+    print(f'{"model":>5} {"true params":>14} {"search":>7} {"time [ms]":>10} {"mse":>10} {"params":>18}')
+    for model_cfg, true_params in MODELS:
+        x, y = ParamsFitter(input_data, np.array([obs_dates, obs_dates]), 1950, ConfigModel(model_cfg), 0.056) \
+            ._get_predictions(np.array(true_params))
+        obs = np.array([obs_dates, np.interp(obs_dates, x, y) * random.normal(1, 0.03, len(obs_dates))])
+
+        for search in ('local', 'global'):
+            fitter = ParamsFitter(input_data, obs, 1950, ConfigModel(model_cfg + [0, search]), 0.056)
+            start = time.perf_counter()
+            solution = fitter.run_algorithm()
+            elapsed = (time.perf_counter() - start) * 1000
+
+            print(f'{model_cfg[0]:>5} {str(true_params):>14} {search:>7} {elapsed:>10.1f} {solution.fun:>10.3f} '
+                  f'{str(np.round(solution.x, 2)):>18}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Compare number of objective evaluations and time of a single fit for TNC with finite differences, TNC with analytic
+gradient and least squares with analytic Jacobian.
+
+Usage: python -m benchmarks.gradient_benchmark
+"""
+import time
+
+import numpy as np
+
+from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
+
+MODELS = [
+    (['EM', ((5.0, 100.0), )], [17.0]),
+    (['EPM', ((5.0, 100.0), (1.0, 3.0))], [17.0, 1.4]),
+    (['DM', ((5.0, 100.0), (0.01, 1.0))], [17.0, 0.15]),
+]
+
+
+class FiniteDifferencesParamsFitter(ParamsFitter):
+    """ ParamsFitter which lets TNC approximate gradient with finite differences. """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gradient_functions = {}
+
+
+def main():
+    years = 70
+    input_data = np.array([np.round(np.arange(0.00001, years, 1), 2), 10 + 50 * np.exp(-np.arange(years) / 10)])
+    obs_dates = np.arange(1985.5, 2020, 3)
+    random = np.random.default_rng(0)
+
+    fitters = [('TNC, finite differences', FiniteDifferencesParamsFitter, {}),
+               ('TNC, analytic', ParamsFitter, {}),
+               ('least squares, analytic', ParamsFitter, {'optimizer': 'least_squares'})]
+
+    print(f'{"model":>5} {"optimizer":>24} {"nfev":>6} {"njev":>6} {"time [ms]":>10} {"mse":>10}')
+    for model_cfg, true_params in MODELS:
+        cfg = ConfigModel(model_cfg)
+
+        # observations generated with known parameters and 5% noise
+        x, y = ParamsFitter(input_data, np.array([obs_dates, obs_dates]), 1950, cfg, 0.056)._get_predictions(
+            np.array(true_params))
+        obs_values = np.interp(obs_dates, x, y)
+        obs = np.array([obs_dates, obs_values * random.normal(1, 0.05, len(obs_values))])
+
+        for name, fitter_class, options in fitters:
+            fitter = fitter_class(input_data, obs, 1950, cfg, 0.056, **options)
+            start = time.perf_counter()
+            solution = fitter.run_algorithm()
+            elapsed = (time.perf_counter() - start) * 1000
+
+            print(f'{cfg.type:>5} {name:>24} {solution.nfev:>6} {solution.get("njev", 0):>6} {elapsed:>10.1f} '
+                  f'{solution.fun:>10.4f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Compare time of reading large long-format observations archive (many sites) saved as csv, npz, npy, parquet and
+feather and splitting it by site.
+
+Usage: python -m benchmarks.readers_benchmark
+"""
+import tempfile
+import timeit
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tracer_method.core.read_data.read_observations_file import read_sites_observations
+
+ROWS = 1_000_000
+SITES = 1000
+REPEATS = 3
+
+
+def main():
+    random = np.random.default_rng(0)
+    data = pd.DataFrame({'Site': np.sort(random.integers(0, SITES, ROWS)).astype(str),
+                         'Date': np.datetime64('1960-01-01') + random.integers(0, 60 * 365, ROWS).astype(
+                             'timedelta64[D]'),
+                         'Concentration': random.uniform(0, 50, ROWS)})
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory)
+        data.to_csv(path / 'observations.csv', index=False)
+
+        array = np.zeros(ROWS, dtype=[('Site', 'U8'), ('Date', 'datetime64[D]'), ('Concentration', float)])
+        for name in data.columns:
+            array[name] = data[name].to_numpy()
+        np.save(path / 'observations.npy', array)
+        np.savez(path / 'observations.npz', **{name: array[name] for name in data.columns})
+
+        files = ['observations.csv', 'observations.npz', 'observations.npy']
+        try:
+            data.to_parquet(path / 'observations.parquet')
+            data.to_feather(path / 'observations.feather')
+            files += ['observations.parquet', 'observations.feather']
+        except ImportError:
+            print('pyarrow is not installed - parquet and feather files are skipped')
+
+        print(f'{"file":>21} {"time [ms]":>10}')
+        for file in files:
+            read_time = timeit.timeit(lambda: read_sites_observations(path / file), number=REPEATS) / REPEATS * 1000
+            print(f'{file:>21} {read_time:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,305 @@
+"""
+Benchmark suite of the hot paths: response functions, predictions of ParamsFitter, whole fit with and without params
+accuracy, input preparation and file readers. Data is generated with benchmarks.generators. Results (minimum and
+median time of a single call in seconds) are saved as JSON, so they can be compared with a baseline saved before
+a change - cases which are slower than the baseline by more than the threshold are reported as regressions.
+
+Usage:
+    python -m benchmarks.suite list
+    python -m benchmarks.suite run [--output benchmarks/results.json] [--filter REGEX] [--repeats 5]
+                                   [--baseline benchmarks/baselines/baseline.json] [--threshold 0.1]
+    python -m benchmarks.suite compare RESULTS --baseline benchmarks/baselines/baseline.json [--threshold 0.1]
+
+Run and compare commands exit with status 1 if any case regressed against the baseline. The committed baseline
+is updated only explicitly with run --output benchmarks/baselines/baseline.json.
+"""
+import argparse
+import json
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from benchmarks.generators import DECAY, generate_input_data, generate_monthly_input, generate_observations, \
+    get_model_config, get_model_params, START_YEAR, write_input_file, write_observations_file
+from tracer_method.core.config.accuracy_config import AccuracyConfig
+from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
+from tracer_method.core.curve_fitter.support_length import get_support
+from tracer_method.core.read_data.read_input_file import read_tritium_file
+from tracer_method.core.read_data.read_observations_file import read_observations
+from tracer_method.core.run import run
+from tracer_method.core.session import FittingSession
+from tracer_method.core.tritium.tritium_input_preparer import TritiumInputPreparer
+
+RESULTS_VERSION = 1
+DEFAULT_OUTPUT = Path(__file__).parent / 'results.json'
+DEFAULT_REPEATS = 5
+DEFAULT_THRESHOLD = 0.1
+
+MODEL_TYPES = ['EM', 'EPM', 'DM']
+TRANSIT_TIMES = [10, 100, 500]
+# (years of input, transit time, number of observations)
+PREDICTIONS_SIZES = [(10, 10, 5), (70, 50, 50), (200, 500, 500)]
+RUN_SIZES = [(70, 30, 5), (70, 30, 50), (200, 100, 500)]
+ACCURACY_SAMPLES = 20
+INPUT_YEARS = [10, 200]
+ALPHAS = 100
+READER_FORMATS = ['.csv', '.parquet', '.npz']
+OBSERVATIONS_ROWS = [500, 100_000]
+
+
+def response_function_case(model_type: str, transit_time: float, directory: Path) -> Callable:
+    fitter = ParamsFitter(np.zeros((2, 1)), np.zeros((2, 1)), START_YEAR, get_model_config(model_type, transit_time),
+                          DECAY)
+    params = get_model_params(model_type, transit_time)
+    t = get_support(model_type, params)
+
+    return partial(fitter.response_functions[model_type], t, params)
+
+
+def predictions_case(model_type: str, years: int, transit_time: float, n_obs: int, directory: Path) -> Callable:
+    input_data = generate_input_data(years)
+    obs = generate_observations(input_data, model_type, transit_time, n_obs)
+    fitter = ParamsFitter(input_data, obs, START_YEAR, get_model_config(model_type, transit_time), DECAY)
+
+    return partial(fitter._get_predictions, get_model_params(model_type, transit_time))
+
+
+def run_case(model_type: str, years: int, transit_time: float, n_obs: int, calculate_params_accuracy: bool,
+             directory: Path) -> Callable:
+    input_data = generate_input_data(years)
+    obs = generate_observations(input_data, model_type, transit_time, n_obs)
+    session = FittingSession(0, n_samples=ACCURACY_SAMPLES)
+
+    return partial(run, input_data, obs, START_YEAR, get_model_config(model_type, transit_time), DECAY, ParamsFitter,
+                   calculate_params_accuracy, session, AccuracyConfig(seed=0))
+
+
+def input_preparer_case(years: int, alphas: int, directory: Path) -> Callable:
+    dates, concentration, precipitation = generate_monthly_input(years)
+
+    # preparer is created in each call, because it caches sums of its input
+    if alphas:
+        return lambda: TritiumInputPreparer(dates, concentration, precipitation, 0.7).calculate_alpha_inputs(
+            np.linspace(0.01, 1, alphas))
+
+    return lambda: TritiumInputPreparer(dates, concentration, precipitation, 0.7).calculate_input()
+
+
+def read_input_case(extension: str, years: int, directory: Path) -> Callable:
+    input_file = directory / f'input_{years}{extension}'
+    write_input_file(input_file, years)
+
+    return partial(read_tritium_file, input_file)
+
+
+def read_observations_case(extension: str, rows: int, directory: Path) -> Callable:
+    obs_file = directory / f'observations_{rows}{extension}'
+    write_observations_file(obs_file, rows)
+
+    return partial(read_observations, obs_file)
+
+
+def get_cases() -> Dict[str, Callable[[Path], Callable]]:
+    """ Get benchmark cases - functions which prepare data in given directory and return function to measure. """
+    cases = {}
+
+    for model_type in MODEL_TYPES:
+        for transit_time in TRANSIT_TIMES:
+            cases[f'response_function/{model_type}/t_t={transit_time}'] = \
+                partial(response_function_case, model_type, transit_time)
+
+        for years, transit_time, n_obs in PREDICTIONS_SIZES:
+            cases[f'get_predictions/{model_type}/years={years}/t_t={transit_time}/obs={n_obs}'] = \
+                partial(predictions_case, model_type, years, transit_time, n_obs)
+
+        for years, transit_time, n_obs in RUN_SIZES:
+            cases[f'run/{model_type}/years={years}/t_t={transit_time}/obs={n_obs}'] = \
+                partial(run_case, model_type, years, transit_time, n_obs, False)
+
+        years, transit_time, n_obs = RUN_SIZES[1]
+        cases[f'run_accuracy/{model_type}/years={years}/t_t={transit_time}/obs={n_obs}'] = \
+            partial(run_case, model_type, years, transit_time, n_obs, True)
+
+    for years in INPUT_YEARS:
+        cases[f'input_preparer/years={years}'] = partial(input_preparer_case, years, 0)
+        cases[f'input_preparer/years={years}/alphas={ALPHAS}'] = partial(input_preparer_case, years, ALPHAS)
+
+    for extension in READER_FORMATS:
+        cases[f'read_tritium_file/{extension[1:]}/years={INPUT_YEARS[-1]}'] = \
+            partial(read_input_case, extension, INPUT_YEARS[-1])
+
+        for rows in OBSERVATIONS_ROWS:
+            cases[f'read_observations/{extension[1:]}/rows={rows}'] = partial(read_observations_case, extension, rows)
+
+    return cases
+
+
+def measure(function: Callable, repeats: int) -> Dict[str, float]:
+    """
+    Measure time of a single call of function. Number of calls in one repeat is chosen so that the repeat takes
+    at least 0.2 s.
+
+    :param function: function to measure
+    :param repeats: number of repeats
+    :return: minimum and median time of a single call in seconds, number of calls in repeat and number of repeats
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    times = np.array(timer.repeat(repeat=repeats, number=number)) / number
+
+    return {'min': float(np.min(times)), 'median': float(np.median(times)), 'number': number, 'repeats': repeats}
+
+
+def get_metadata() -> Dict:
+    """ Get description of environment in which benchmarks are run. """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=Path(__file__).parent).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    return {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
+
+
+def run_benchmarks(pattern: str = None, repeats: int = DEFAULT_REPEATS) -> Dict:
+    """
+    Run benchmark cases (cases which need missing optional packages are skipped).
+
+    :param pattern: regular expression which selects cases by name (all cases by default)
+    :param repeats: number of repeats of each case
+    :return: results with metadata of environment
+    """
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, case in get_cases().items():
+            if pattern is not None and not re.search(pattern, name):
+                continue
+
+            try:
+                function = case(Path(directory))
+            except ImportError as error:
+                print(f'{name:<60} skipped ({error})')
+                continue
+
+            results[name] = measure(function, repeats)
+            print(f'{name:<60} {results[name]["min"] * 1000:>12.3f} ms')
+
+    return {'version': RESULTS_VERSION, 'metadata': get_metadata(), 'results': results}
+
+
+def compare_results(baseline: Dict, results: Dict, threshold: float = DEFAULT_THRESHOLD) \
+        -> List[Tuple[str, float, float, str]]:
+    """
+    Compare minimum times of cases with the baseline.
+
+    :param baseline: results saved before a change
+    :param results: results saved after a change
+    :param threshold: relative slowdown above which case is a regression (eg. 0.1 for 10%)
+    :return: list of case name, ratio of times (current / baseline), time in baseline and status - regression,
+    improvement, unchanged or new (case is not present in the baseline), cases not present in results are skipped
+    """
+    comparison = []
+
+    for name in sorted(results['results']):
+        if name not in baseline['results']:
+            comparison.append((name, np.nan, np.nan, 'new'))
+            continue
+
+        baseline_time = baseline['results'][name]['min']
+        ratio = results['results'][name]['min'] / baseline_time
+
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            status = 'improvement'
+        else:
+            status = 'unchanged'
+
+        comparison.append((name, ratio, baseline_time, status))
+
+    return comparison
+
+
+def load_results(file: Path) -> Dict:
+    """ Load results saved by run command. """
+    with open(file) as results_file:
+        results = json.load(results_file)
+
+    if results.get('version') != RESULTS_VERSION:
+        raise ValueError(f'Not supported version of results: {file}')
+
+    return results
+
+
+def main(args: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmarks of tracer method hot paths')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help='list benchmark cases')
+
+    run_parser = commands.add_parser('run', help='run benchmark cases and save results')
+    run_parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT, help='file with results')
+    run_parser.add_argument('--filter', default=None, help='regular expression which selects cases')
+    run_parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help='number of repeats of each case')
+    run_parser.add_argument('--baseline', type=Path, default=None, help='file with baseline results to compare with')
+    run_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                            help='relative slowdown reported as regression')
+
+    compare_parser = commands.add_parser('compare', help='compare results with baseline')
+    compare_parser.add_argument('results', type=Path, help='file with current results')
+    compare_parser.add_argument('--baseline', type=Path, required=True, help='file with baseline results')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help='relative slowdown reported as regression')
+
+    args = parser.parse_args(args)
+
+    if args.command == 'list':
+        print('\n'.join(get_cases()))
+        return 0
+
+    if args.command == 'run':
+        results = run_benchmarks(args.filter, args.repeats)
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+        print(f'Results saved to {args.output}')
+
+        if args.baseline is None:
+            return 0
+    else:
+        results = load_results(args.results)
+
+    return print_comparison(compare_results(load_results(args.baseline), results, args.threshold), args.threshold)
+
+
+def print_comparison(comparison: List[Tuple[str, float, float, str]], threshold: float) -> int:
+    """ Print comparison of results with the baseline and return exit status (1 if any case regressed). """
+    print(f'{"case":<60} {"baseline [ms]":>14} {"ratio":>7} {"status":>12}')
+    for name, ratio, baseline_time, status in comparison:
+        print(f'{name:<60} {baseline_time * 1000:>14.3f} {ratio:>7.2f} {status:>12}')
+
+    regressions = [i for i in comparison if i[3] == 'regression']
+    print(f'\n{len(regressions)} regressions (threshold {threshold:.0%})')
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Compare objective evaluation time of ParamsFitter with response function truncation based on numerical integration
+(scipy.integrate.quad called in a loop) and with the cached closed-form support length.
+
+Usage: python -m benchmarks.support_length_benchmark
+"""
+import timeit
+from typing import Tuple
+
+import numpy as np
+from scipy import integrate
+
+from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
+
+TRANSIT_TIMES = [1, 5, 10, 50, 100, 250, 500]
+MODELS = {
+    'EM': lambda t_t: ((t_t * 0.5, t_t * 1.5), ),
+    'EPM': lambda t_t: ((t_t * 0.5, t_t * 1.5), (1.0, 2.0)),
+    'DM': lambda t_t: ((t_t * 0.5, t_t * 1.5), (0.05, 0.5)),
+}
+REPEATS = 20
+
+
+class QuadParamsFitter(ParamsFitter):
+    """ ParamsFitter with the response function truncation used before the closed-form support length. """
+
+    def _get_predictions(self, params: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        response_function = self.response_functions[self.cfg.type]
+        t = np.arange(0.001, 2, 1)
+        g_t = response_function(t, params)
+
+        while 1 - integrate.quad(response_function, min(t), max(t), args=params)[0] >= 0.01:
+            t = np.arange(0.001, (len(t) + params[0]) + 1, 1)
+            g_t = response_function(t, params)
+
+        x = np.round(np.arange(min(t) + min(self.input[0]), max(t) + max(self.input[0]) + 1, 1), 2) + self.start_year
+        y = self._ParamsFitter__calculate_convolution(g_t, t)
+
+        return x, y
+
+
+def evaluation_time(fitter: ParamsFitter, params: np.ndarray) -> float:
+    """ Get mean time [ms] of a single MSE evaluation. """
+    return timeit.timeit(lambda: fitter._ParamsFitter__calculate_mse(params), number=REPEATS) / REPEATS * 1000
+
+
+def main():
+    years = 70
+    input_data = np.array([np.round(np.arange(0.00001, years, 1), 2), 10 + 50 * np.exp(-np.arange(years) / 10)])
+    obs = np.array([np.arange(1990, 2020, 5), np.linspace(20, 5, 6)])
+
+    print(f'{"model":>5} {"t_t":>5} {"quad [ms]":>10} {"closed [ms]":>12} {"speedup":>8}')
+    for model_type, params_range in MODELS.items():
+        for t_t in TRANSIT_TIMES:
+            cfg = ConfigModel([model_type, params_range(t_t)])
+            params = cfg.initial_values
+            params[0] = t_t
+
+            # numba and sparse engines do not call _get_predictions, so both fitters use NumPy engine
+            quad_time = evaluation_time(QuadParamsFitter(input_data, obs, 1950, cfg, 0.056, engine='numpy'), params)
+            closed_time = evaluation_time(ParamsFitter(input_data, obs, 1950, cfg, 0.056, engine='numpy'), params)
+
+            print(f'{model_type:>5} {t_t:>5} {quad_time:>10.3f} {closed_time:>12.3f} {quad_time / closed_time:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
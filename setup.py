@@ -13,4 +13,8 @@ setup(name='tracer_method',
           'scipy==1.4.1',
           'xlrd==1.2.0',
       ],
+      extras_require={
+          'arrow': ['pyarrow>=3.0'],
+          'numba': ['numba>=0.50'],
+      },
       zip_safe=False)
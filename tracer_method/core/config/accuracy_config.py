@@ -0,0 +1,22 @@
+class AccuracyConfig:
+    """ Holds configuration of params accuracy calculation: uncertainty method and seed of random numbers generator.
+
+    Methods:
+    - monte_carlo - refits to observations drawn uniformly within one sigma of observations,
+    - bootstrap - refits to predictions of the best fit with resampled residuals,
+    - linearized - covariance of params calculated from Jacobian at the best fit (no refits).
+
+    Refits are warm-started from the best fit (warm_start) and can be stopped early with tolerances which are passed
+    as options to the optimizer (e.g. {'ftol': 1e-4, 'maxfun': 50} for TNC). """
+
+    METHODS = ('monte_carlo', 'bootstrap', 'linearized')
+
+    def __init__(self, method: str = 'monte_carlo', seed: int = None, warm_start: bool = True,
+                 tolerances: dict = None):
+        if method not in self.METHODS:
+            raise ValueError(f'Uncertainty method not found: {", ".join(self.METHODS)}')
+
+        self.method = method
+        self.seed = seed
+        self.warm_start = warm_start
+        self.tolerances = tolerances
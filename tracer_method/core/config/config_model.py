@@ -9,16 +9,23 @@ class Model(Enum):
     TYPE = 0
     PARAMS_RANGE = 1
     BETA = 2
+    SEARCH = 3
 
 
 class ConfigModel:
-    """ Holds model configuration with all the necessary data like model type, parameters range, beta value
-    and start values for each model parameter. """
+    """ Holds model configuration with all the necessary data like model type, parameters range, beta value (or
+    beta range if beta is fitted), search mode ('local' - single local minimization from the middle of parameters
+    range, 'global' - coarse search over parameters range before local minimizations) and start values for each
+    model parameter. """
 
     def __init__(self, model_data: List[Union[str, float]]):
         self.type = model_data[Model.TYPE.value]
         self.params_range = model_data[Model.PARAMS_RANGE.value]
-        self.beta = model_data[Model.BETA.value] if len(model_data) > Model.BETA.value else 0
+        beta = model_data[Model.BETA.value] if len(model_data) > Model.BETA.value else 0
+        # beta can be a range (it is fitted together with model parameters) or a fixed value
+        self.beta_range = tuple(beta) if isinstance(beta, (tuple, list)) else None
+        self.beta = 0 if self.beta_range is not None else beta
+        self.search = model_data[Model.SEARCH.value] if len(model_data) > Model.SEARCH.value else 'local'
         self.initial_values = self.__calculate_initial_values()
 
     def __calculate_initial_values(self) -> np.ndarray:
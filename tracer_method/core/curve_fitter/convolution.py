@@ -0,0 +1,110 @@
+import numpy as np
+from scipy import fft
+from scipy.signal import fftconvolve
+
+# direct convolution is faster than FFT based methods if one of the vectors is short or both are small
+DIRECT_MAX_SIZE = 256
+DIRECT_MAX_OPERATIONS = 2 ** 18
+
+
+class Convolver:
+    """ Calculate full convolution of fixed vector (input) with different response functions. Convolution can be
+    calculated directly, with FFT or with overlap-add method which reuses FFT of the fixed vector on every call.
+    Many kernels of the same length can be convolved at once. """
+
+    def __init__(self, vector: np.ndarray, method: str = 'auto'):
+        self.vector = vector
+        self.methods = self.__get_methods()
+
+        if method != 'auto' and method not in self.methods:
+            raise ValueError(f'Convolution method not found: auto, {", ".join(self.methods)}')
+
+        self.method = method
+        self.fft_size = fft.next_fast_len(2 * len(vector), real=True)
+        self.block_size = self.fft_size - len(vector) + 1
+        self.__vector_spectrum = None
+
+    def __getstate__(self):
+        # bound private methods cannot be unpickled, so methods are created again in __setstate__
+        state = self.__dict__.copy()
+        del state['methods']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.methods = self.__get_methods()
+
+    def __get_methods(self):
+        return {
+            'direct': self.__convolve_direct,
+            'fft': self.__convolve_fft,
+            'overlap-add': self.__convolve_overlap_add,
+        }
+
+    def choose_method(self, kernel_size: int) -> str:
+        """
+        Choose convolution method based on sizes of both vectors (if method was not set explicitly).
+
+        :param kernel_size: length of the second vector (response function)
+        :return: name of convolution method
+        """
+        if self.method != 'auto':
+            return self.method
+
+        vector_size = len(self.vector)
+        if min(vector_size, kernel_size) <= DIRECT_MAX_SIZE or vector_size * kernel_size <= DIRECT_MAX_OPERATIONS:
+            return 'direct'
+
+        return 'overlap-add'
+
+    def convolve(self, kernel: np.ndarray) -> np.ndarray:
+        """
+        Calculate convolution of fixed vector and kernel (full mode).
+
+        :param kernel: second vector (response function) of size M or array of K vectors of shape (K, M)
+        :return: calculated convolution of size N + M - 1 or array of convolutions of shape (K, N + M - 1)
+        """
+        return self.methods[self.choose_method(kernel.shape[-1])](kernel)
+
+    def __convolve_direct(self, kernel: np.ndarray) -> np.ndarray:
+        if kernel.ndim == 1:
+            return np.convolve(self.vector, kernel, mode='full')
+
+        # each kernel is convolved separately, so memory does not grow with product of vectors sizes
+        output = np.empty(kernel.shape[:-1] + (len(self.vector) + kernel.shape[-1] - 1, ))
+        for index in np.ndindex(kernel.shape[:-1]):
+            output[index] = np.convolve(self.vector, kernel[index], mode='full')
+
+        return output
+
+    def __convolve_fft(self, kernel: np.ndarray) -> np.ndarray:
+        return fftconvolve(self.vector.reshape((1, ) * (kernel.ndim - 1) + (-1, )), kernel, mode='full', axes=-1)
+
+    def __convolve_overlap_add(self, kernel: np.ndarray) -> np.ndarray:
+        """
+        Split kernel into blocks, convolve each block with fixed vector using its cached FFT and add overlapping
+        parts of the blocks convolutions.
+        """
+        if self.__vector_spectrum is None:
+            self.__vector_spectrum = fft.rfft(self.vector, self.fft_size)
+
+        vector_size, kernel_size, block_size = len(self.vector), kernel.shape[-1], self.block_size
+        batch_shape = kernel.shape[:-1]
+        blocks_number = -(-kernel_size // block_size)
+
+        blocks = np.zeros(batch_shape + (blocks_number * block_size, ))
+        blocks[..., :kernel_size] = kernel
+        blocks = blocks.reshape(batch_shape + (blocks_number, block_size))
+
+        blocks_convolution = fft.irfft(fft.rfft(blocks, self.fft_size, axis=-1) * self.__vector_spectrum,
+                                       self.fft_size, axis=-1)
+
+        # block convolution overlaps only the next block because block size is not smaller than vector size
+        output = np.zeros(batch_shape + ((blocks_number + 1) * block_size, ))
+        output[..., :blocks_number * block_size] = \
+            blocks_convolution[..., :block_size].reshape(batch_shape + (blocks_number * block_size, ))
+        output[..., block_size:].reshape(batch_shape + (blocks_number, block_size))[..., :vector_size - 1] += \
+            blocks_convolution[..., block_size:]
+
+        return output[..., :vector_size + kernel_size - 1]
@@ -0,0 +1,123 @@
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+from scipy.optimize import OptimizeResult
+
+from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.curve_fitter.convolution import Convolver
+from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
+from tracer_method.core.curve_fitter.pfm_params_fitter import PFMParamsFitter
+
+
+class JointFitter:
+    """ Fitter mixin which fits infiltration rate (alpha) and beta together with model parameters. Alpha is the last
+    parameter of minimization and input is calculated for each alpha with alpha inputs function (e.g.
+    TritiumInputPreparer.calculate_alpha_inputs which uses sums calculated only once). Beta only scales predictions
+    by (1 - beta), so for given model parameters and alpha the best beta is calculated analytically (least squares
+    scale of predictions clipped to beta range) instead of being a parameter of minimization. """
+
+    def __init__(self, input: np.ndarray, obs: np.ndarray, start_year: int, cfg: ConfigModel, decay: float,
+                 alpha_inputs: Callable[[np.ndarray], np.ndarray] = None, alpha_range: Tuple[float, float] = None,
+                 optimizer: str = 'TNC', **kwargs):
+        self.alpha_inputs = alpha_inputs
+        self.alpha_range = alpha_range
+        self.alpha = np.mean(alpha_range) if alpha_range is not None else None
+        self.beta_range = cfg.beta_range if cfg.beta_range is not None else (cfg.beta, cfg.beta)
+        self.scale = 1 - self.beta_range[0]
+        # scale of the solution used by snapshot of the fitter (the best scale is calculated for each params if None)
+        self.fixed_scale: Optional[float] = None
+
+        params_range = tuple(cfg.params_range) + ((tuple(alpha_range), ) if alpha_range is not None else ())
+        joint_cfg = ConfigModel([cfg.type, params_range, 0, cfg.search])
+
+        if alpha_range is not None:
+            input = np.array([input[0], alpha_inputs([self.alpha])[0]])
+
+        super().__init__(input, obs, start_year, joint_cfg, decay, optimizer=optimizer, **kwargs)
+        # predictions depend on alpha and beta, so derivatives of response functions and numba engine which does
+        # not call _get_predictions cannot be used
+        self.gradient_functions = {}
+        self.engine = 'numpy'
+
+    def _get_predictions(self, params: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get predictions for model's parameters and alpha (input is calculated again only if alpha changed) scaled by
+        the best (1 - beta).
+
+        :param params: model's parameters and alpha (if it is fitted)
+        :return: x points and predictions
+        """
+        if self.alpha_range is not None:
+            params, alpha = params[:-1], params[-1]
+
+            if alpha != self.alpha:
+                self.alpha = alpha
+                self.input = np.array([self.input[0], self.alpha_inputs([alpha])[0]])
+                self.convolver = Convolver(self.input[1], self.convolver.method)
+
+        x, y = super()._get_predictions(params)
+        if self.fixed_scale is not None:
+            return x, y * self.fixed_scale
+
+        interpolated = np.interp(self.fit_data.observations[0], x, y)
+        norm = interpolated @ interpolated
+        scale = interpolated @ self.fit_data.observations[1] / norm if norm else 1
+        self.scale = np.clip(scale, 1 - self.beta_range[1], 1 - self.beta_range[0])
+
+        return x, y * self.scale
+
+    def get_response_function(self, params: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Get response function of the model (alpha is removed from params).
+
+        :param params: model's parameters and alpha (if it is fitted)
+        :return: time range and response function g(t) (None for PFM)
+        """
+        return super().get_response_function(params[:-1] if self.alpha_range is not None else params)
+
+    def get_batch_predictions(self, params: np.ndarray) -> np.ndarray:
+        """
+        Get interpolated y predictions for many parameters sets (one after another, because each alpha needs its own
+        input).
+
+        :param params: array of shape (K, n) with K sets of model's parameters and alpha
+        :return: array of shape (K, number of observations) with interpolated y predictions
+        """
+        return np.array([self.residuals(i) for i in np.atleast_2d(params)]) + self.fit_data.observations[1]
+
+    def get_snapshot(self) -> 'JointFitter':
+        """
+        Get copy of the fitter used to calculate output of the solution, the best scale of the solution is fixed (so
+        output is scaled by reported beta).
+
+        :return: shallow copy of the fitter with fixed scale
+        """
+        snapshot = super().get_snapshot()
+        snapshot.fixed_scale = float(self.scale)
+
+        return snapshot
+
+    def get_data_solution(self, solution: OptimizeResult, params_accuracy=None):
+        """
+        Get all solution information, alpha is removed from model's parameters and stored separately with the best
+        beta.
+
+        :param solution: solution of the parameters minimization
+        :param params_accuracy: model's parameters accuracy
+        """
+        fit_data = super().get_data_solution(solution, params_accuracy)
+
+        if self.alpha_range is not None:
+            fit_data.params, fit_data.alpha = fit_data.params[:-1], fit_data.params[-1]
+
+        fit_data.beta = round(1 - float(self.scale), 3)
+
+        return fit_data
+
+
+class JointParamsFitter(JointFitter, ParamsFitter):
+    """ ParamsFitter (EM, EPM and DM) which fits alpha and beta together with model parameters. """
+
+
+class JointPFMParamsFitter(JointFitter, PFMParamsFitter):
+    """ PFMParamsFitter which fits alpha and beta together with transit time (with TNC optimizer by default). """
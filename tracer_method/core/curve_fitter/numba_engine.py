@@ -0,0 +1,130 @@
+import math
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    # numba is an optional dependency - without it ParamsFitter uses sparse NumPy engine
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+MODEL_CODES = {'EM': 0, 'EPM': 1, 'DM': 2}
+
+
+def jit(function):
+    """ Compile function with numba (compiled functions are cached on disk) or return it unchanged without numba. """
+    return numba.njit(cache=True)(function) if NUMBA_AVAILABLE else function
+
+
+@jit
+def response_function_value(model_code: int, t: float, t_t: float, param: float) -> float:
+    """
+    Calculate response function g(t) of EM, EPM or DM for one time point (the same formulas as in response_functions).
+
+    :param model_code: code of model from MODEL_CODES
+    :param t: time point
+    :param t_t: transit time
+    :param param: η for EPM, dispersion parameter (Pd) for DM (not used for EM)
+    :return: value of response function
+    """
+    if model_code == 0:
+        return 1 / t_t * math.exp(-t / t_t)
+
+    if model_code == 1:
+        if t >= t_t * (1 - 1 / param):
+            return param / t_t * math.exp(-param * t / t_t + param - 1)
+        return 0.0
+
+    return ((4 * math.pi * param * t / t_t) ** -0.5) * (1 / t) * math.exp(-((1 - (t / t_t)) ** 2) /
+                                                                            (4 * param * t / t_t))
+
+
+@jit
+def convolution_value(vector: np.ndarray, kernel: np.ndarray, k: int) -> float:
+    """ Calculate k-th element of full convolution of vector and kernel. """
+    value = 0.0
+    for j in range(max(0, k - len(vector) + 1), min(k, len(kernel) - 1) + 1):
+        value += vector[k - j] * kernel[j]
+
+    return value
+
+
+@jit
+def interpolate_convolution(vector: np.ndarray, kernel: np.ndarray, index: np.ndarray, weight: np.ndarray,
+                            predictions: np.ndarray):
+    """
+    Calculate full convolution of vector and kernel only at points needed to interpolate it at observations points
+    (each point is calculated once, so it is never slower than the full convolution) and interpolate it.
+
+    :param vector: input concentration
+    :param kernel: response function weighted by decay kernel
+    :param index: indices of x points preceding observations points
+    :param weight: interpolation weights of the next x points
+    :param predictions: output array for interpolated predictions
+    """
+    needed = np.zeros(len(vector) + len(kernel) - 1, dtype=np.bool_)
+    for i in range(len(index)):
+        needed[index[i]] = True
+        needed[index[i] + 1] = True
+
+    values = np.empty(len(needed))
+    for k in range(len(needed)):
+        if needed[k]:
+            values[k] = convolution_value(vector, kernel, k)
+
+    for i in range(len(index)):
+        predictions[i] = values[index[i]] * (1 - weight[i]) + values[index[i] + 1] * weight[i]
+
+
+@jit
+def fused_interpolated_predictions(model_code: int, vector: np.ndarray, t: np.ndarray, params: np.ndarray,
+                                   decay_kernel: np.ndarray, index: np.ndarray, weight: np.ndarray) -> np.ndarray:
+    """
+    Calculate predictions interpolated at observations points in one pass - response function is evaluated and
+    weighted by decay kernel once and convolution is calculated only at points around observations.
+
+    :param model_code: code of model from MODEL_CODES
+    :param vector: input concentration
+    :param t: time range of response function
+    :param params: model's parameters
+    :param decay_kernel: radioactive decay kernel for time range (ones if tracer is not a radionuclide)
+    :param index: indices of x points preceding observations points
+    :param weight: interpolation weights of the next x points
+    :return: interpolated y predictions
+    """
+    param = params[1] if len(params) > 1 else 0.0
+    kernel = np.empty(len(t))
+    for j in range(len(t)):
+        kernel[j] = response_function_value(model_code, t[j], params[0], param) * decay_kernel[j]
+
+    predictions = np.empty(len(index))
+    interpolate_convolution(vector, kernel, index, weight, predictions)
+
+    return predictions
+
+
+@jit
+def interpolated_convolutions(vector: np.ndarray, kernels: np.ndarray, decay_kernel: np.ndarray, index: np.ndarray,
+                              weight: np.ndarray) -> np.ndarray:
+    """
+    Calculate convolutions of input with many kernels weighted by decay kernel only at points around observations
+    and interpolate them at observations points.
+
+    :param vector: input concentration
+    :param kernels: array of shape (K, M) with response functions (or their derivatives)
+    :param decay_kernel: radioactive decay kernel of size M (ones if tracer is not a radionuclide)
+    :param index: indices of x points preceding observations points
+    :param weight: interpolation weights of the next x points
+    :return: array of shape (K, number of observations) with interpolated convolutions
+    """
+    predictions = np.empty((kernels.shape[0], len(index)))
+    kernel = np.empty(kernels.shape[1])
+
+    for row in range(kernels.shape[0]):
+        for j in range(kernels.shape[1]):
+            kernel[j] = kernels[row, j] * decay_kernel[j]
+
+        interpolate_convolution(vector, kernel, index, weight, predictions[row])
+
+    return predictions
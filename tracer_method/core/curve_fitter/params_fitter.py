@@ -1,21 +1,52 @@
-from copy import deepcopy
-from typing import Tuple
+from concurrent.futures import Executor
+from copy import copy, deepcopy
+from typing import Dict, Optional, Tuple
 
 import numpy as np
-from scipy import integrate
-from scipy.optimize import minimize, OptimizeResult
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.optimize import least_squares, minimize, OptimizeResult
 
 from tracer_method.core.config.config_model import ConfigModel
-from tracer_method.core.curve_fitter.response_functions import dispersion, exponential, exponential_piston_flow
+from tracer_method.core.curve_fitter.convolution import Convolver
+from tracer_method.core.curve_fitter.numba_engine import fused_interpolated_predictions, interpolated_convolutions, \
+    MODEL_CODES, NUMBA_AVAILABLE
+from tracer_method.core.curve_fitter.prediction_table import PredictionTable
+from tracer_method.core.curve_fitter.response_functions import dispersion, dispersion_batch, dispersion_gradient, \
+    exponential, exponential_batch, exponential_gradient, exponential_piston_flow, exponential_piston_flow_batch, \
+    exponential_piston_flow_gradient
+from tracer_method.core.curve_fitter.support_length import get_support, get_support_length, START_TIME
 from tracer_method.core.fitting_result import FittingResult
+from tracer_method.core.instrumentation import Instrumentation, NULL_INSTRUMENTATION
+
+# global search - number of Latin hypercube samples, number of best samples used as start points of local
+# minimization and number of samples evaluated in one batch
+GLOBAL_SEARCH_SAMPLES = 256
+GLOBAL_SEARCH_STARTS = 4
+GLOBAL_SEARCH_BATCH_SIZE = 128
+# engines of predictions at observations points (auto - numba if it is installed, sparse NumPy engine otherwise)
+ENGINES = ('auto', 'numpy', 'sparse', 'numba')
+# models with incomplete analytic gradient (EPM gradient leaves out the shift of the piston flow front, so TNC may
+# stall on its nonsmooth MSE) - TNC is run also with finite differences and the better solution is kept
+PARTIAL_GRADIENT_MODELS = ('EPM', )
 
 
 class ParamsFitter:
     """ Get the output which provides the best fit to observations data points. It depends on input, selected model
-    (EM, EPM and DM), its parameters range and beta (if provided). """
+    (EM, EPM and DM), its parameters range and beta (if provided). Parameters are found with TNC or least squares
+    minimization (optionally started from global search or prediction table), predictions at observations are
+    calculated by NumPy, sparse or numba engine. """
+
+    def __init__(self, input: np.ndarray, obs: np.ndarray, start_year: int, cfg: ConfigModel, decay: float,
+                 convolution_method: str = 'auto', optimizer: str = 'TNC', prepared_input: bool = False,
+                 tolerances: dict = None, prediction_table: PredictionTable = None,
+                 instrumentation: Instrumentation = None, engine: str = 'auto'):
+        if engine not in ENGINES:
+            raise ValueError(f'Engine not found: {", ".join(ENGINES)}')
 
-    def __init__(self, input: np.ndarray, obs: np.ndarray, start_year: int, cfg: ConfigModel, decay: float):
-        self.input = deepcopy(input)
+        if engine == 'numba' and not NUMBA_AVAILABLE:
+            raise ValueError('Numba engine requires numba package')
+
+        self.input = input if prepared_input else deepcopy(input)
         self.cfg = cfg
         self.decay = decay
         self.fit_data = FittingResult(cfg.type, obs, self.cfg.beta)
@@ -25,10 +56,110 @@ class ParamsFitter:
             'EM': exponential,
             'EPM': exponential_piston_flow,
         }
+        self.batch_response_functions = {
+            'DM': dispersion_batch,
+            'EM': exponential_batch,
+            'EPM': exponential_piston_flow_batch,
+        }
+        self.gradient_functions = {
+            'DM': dispersion_gradient,
+            'EM': exponential_gradient,
+            'EPM': exponential_piston_flow_gradient,
+        }
+        self.optimizer = optimizer
+        self.tolerances = tolerances or {}
+        self.prediction_table = prediction_table
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self.engine = engine if engine != 'auto' else ('numba' if NUMBA_AVAILABLE else 'sparse')
 
-        if self.cfg.beta:
+        if self.cfg.beta and not prepared_input:
             self.input[1] *= (1 - self.cfg.beta)
 
+        self.convolver = Convolver(self.input[1], convolution_method)
+        self.__grids: Dict[int, Tuple[np.ndarray, ...]] = {}
+        self.__sparse_grids: Dict[int, Tuple[np.ndarray, ...]] = {}
+        self.__decay_table = np.empty(0)
+        # params and interpolated predictions of the last evaluation (reused to calculate MSE and ME of solution)
+        self.__last_predictions: Tuple[bytes, np.ndarray] = (b'', np.empty(0))
+
+    def __getstate__(self):
+        # cached grids (windows of sparse engine are expanded to full arrays when pickled) are calculated again
+        # by the worker process
+        state = self.__dict__.copy()
+        state['_ParamsFitter__grids'] = {}
+        state['_ParamsFitter__sparse_grids'] = {}
+        state['_ParamsFitter__decay_table'] = np.empty(0)
+        state['_ParamsFitter__last_predictions'] = (b'', np.empty(0))
+
+        return state
+
+    def __get_grid(self, length: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get arrays which depend only on support length (calculated once for each length, they are read-only).
+
+        :param length: number of time steps of response function
+        :return: time range, x points of predictions and interpolation indices and weights of observations
+        """
+        if length not in self.__grids:
+            t = np.arange(START_TIME, length, 1)
+            x = np.round(np.arange(min(t) + self.input[0].min(), max(t) + self.input[0].max() + 1, 1), 2) + \
+                self.start_year
+
+            obs_x = self.fit_data.observations[0]
+            index = np.clip(np.searchsorted(x, obs_x, side='right') - 1, 0, len(x) - 2)
+            weight = np.clip((obs_x - x[index]) / (x[index + 1] - x[index]), 0, 1)
+
+            for array in (t, x, index, weight):
+                array.flags.writeable = False
+            self.__grids[length] = (t, x, index, weight)
+
+        return self.__grids[length]
+
+    def __get_sparse_grid(self, length: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get arrays used by sparse engine to calculate convolution only at points around observations (calculated once
+        for each length). Reversed input is padded with zeros, so k-th point of full convolution is a dot product of
+        one window of reversed input and kernel.
+
+        :param length: number of time steps of response function
+        :return: windows of reversed padded input (view of shape (number of x points, length)), rows of windows of
+        needed x points and positions of x points preceding and following observations points in needed points
+        """
+        if length not in self.__sparse_grids:
+            _, _, index, _ = self.__get_grid(length)
+            padding = np.zeros(length - 1)
+            windows = sliding_window_view(np.concatenate([padding, self.convolver.vector[::-1], padding]), length)
+
+            needed = np.unique(np.concatenate([index, index + 1]))
+            rows = len(windows) - 1 - needed
+            position = np.searchsorted(needed, index)
+            next_position = np.searchsorted(needed, index + 1)
+
+            for array in (rows, position, next_position):
+                array.flags.writeable = False
+            self.__sparse_grids[length] = (windows, rows, position, next_position)
+
+        return self.__sparse_grids[length]
+
+    def __get_decay_kernel(self, length: int) -> np.ndarray:
+        """
+        Get radioactive decay kernel exp(-t * decay) for time range of given length (view of the cached table which
+        is extended twice when a longer kernel is needed).
+
+        :param length: number of time steps of response function
+        :return: decay kernel
+        """
+        if length > len(self.__decay_table):
+            self.__decay_table = np.exp(-np.arange(START_TIME, max(length, 2 * len(self.__decay_table)), 1) *
+                                        self.decay)
+            self.__decay_table.flags.writeable = False
+
+        return self.__decay_table[:length]
+
+    def __get_engine_decay_kernel(self, length: int) -> np.ndarray:
+        """ Get decay kernel used by numba engine (ones if tracer is not a radionuclide). """
+        return self.__get_decay_kernel(length) if self.decay is not None else np.ones(length)
+
     def __calculate_mse(self, params: np.ndarray) -> float:
         """
         Get calculated MSE (mean-square error) for predictions and observations.
@@ -40,19 +171,64 @@ class ParamsFitter:
 
         return ((interpolated_y_predictions - self.fit_data.observations[1]) ** 2).mean()
 
-    def __calculate_me(self, params: np.ndarray) -> float:
+    def __calculate_mse_and_gradient(self, params: np.ndarray) -> Tuple[float, np.ndarray]:
         """
-        Get calculated Model Efficiency (ME)
+        Get calculated MSE (mean-square error) and its gradient with respect to model's parameters.
 
         :param params: model's parameters used in order to calculate response function - g(t)
-        :return: value of calculated ME
+        :return: value of calculated MSE and array of its derivatives
         """
-        interpolated_y_predictions = self.__get_interpolated_y_predictions(params)
+        interpolated_y_predictions, jacobian = self.__get_interpolated_y_predictions_and_jacobian(params)
+        residuals = interpolated_y_predictions - self.fit_data.observations[1]
+
+        return (residuals ** 2).mean(), 2 * jacobian.T @ residuals / len(residuals)
+
+    def residuals(self, params: np.ndarray) -> np.ndarray:
+        """
+        Get residuals of predictions (least squares formulation of fitting).
+
+        :param params: model's parameters used in order to calculate response function - g(t)
+        :return: differences between interpolated y predictions and observations
+        """
+        return self.__get_interpolated_y_predictions(params) - self.fit_data.observations[1]
+
+    def jacobian(self, params: np.ndarray) -> np.ndarray:
+        """
+        Get Jacobian of residuals calculated from analytic derivatives of response function (or with central finite
+        differences if analytic derivatives are not available).
+
+        :param params: model's parameters used in order to calculate response function - g(t)
+        :return: array of shape (number of observations, number of params) with derivatives of residuals
+        """
+        if self.has_gradient:
+            return self.__get_interpolated_y_predictions_and_jacobian(params)[1]
+
+        steps = np.maximum(np.abs(params), 1) * 1e-6
+
+        return np.array([(self.residuals(params + step) - self.residuals(params - step)) / (2 * h)
+                         for step, h in zip(np.diag(steps), steps)]).T
+
+    @property
+    def has_gradient(self) -> bool:
+        """ True if analytic derivatives of predictions are available for the model, False otherwise. """
+        return self.cfg.type in self.gradient_functions
+
+    def __calculate_mse_and_me(self, params: np.ndarray) -> Tuple[float, float]:
+        """
+        Get calculated MSE and Model Efficiency (ME) from the same predictions (predictions of the last evaluation
+        are reused if it was done for the same params).
+
+        :param params: model's parameters used in order to calculate response function - g(t)
+        :return: values of calculated MSE and ME
+        """
+        last_params, interpolated_y_predictions = self.__last_predictions
+        if np.asarray(params, dtype=float).tobytes() != last_params:
+            interpolated_y_predictions = self.__get_interpolated_y_predictions(params)
 
         a = np.sum((interpolated_y_predictions - self.fit_data.observations[1]) ** 2)
         b = np.sum((interpolated_y_predictions - self.fit_data.observations[1].mean()) ** 2)
 
-        return 1 - (a / b)
+        return a / len(interpolated_y_predictions), 1 - (a / b)
 
     def __get_interpolated_y_predictions(self, params: np.array):
         """
@@ -62,8 +238,53 @@ class ParamsFitter:
         :param params: model's parameters used in order to calculate response function - g(t)
         :return: interpolated y predictions
         """
-        x_predictions, y_predictions = self._get_predictions(params)
-        return np.interp(self.fit_data.observations[0], x_predictions, y_predictions)
+        if self.engine == 'numba':
+            with self.instrumentation.timer('support_length'):
+                t, _, index, weight = self.__get_grid(get_support_length(self.cfg.type, params))
+
+            with self.instrumentation.timer('convolution'):
+                interpolated = fused_interpolated_predictions(MODEL_CODES[self.cfg.type], self.convolver.vector, t,
+                                                              np.asarray(params, dtype=float),
+                                                              self.__get_engine_decay_kernel(len(t)), index, weight)
+        elif self.engine == 'sparse':
+            with self.instrumentation.timer('support_length'):
+                t, _, index, weight = self.__get_grid(get_support_length(self.cfg.type, params))
+
+            with self.instrumentation.timer('response_function'):
+                g_t = self.response_functions[self.cfg.type](t, params)
+
+            interpolated = self.__calculate_interpolated_convolutions(g_t, t, index, weight)
+        else:
+            x_predictions, y_predictions = self._get_predictions(params)
+
+            with self.instrumentation.timer('interpolation'):
+                interpolated = np.interp(self.fit_data.observations[0], x_predictions, y_predictions)
+
+        self.__last_predictions = (np.asarray(params, dtype=float).tobytes(), interpolated)
+
+        return interpolated
+
+    def __get_interpolated_y_predictions_and_jacobian(self, params: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get interpolated y predictions and their derivatives with respect to model's parameters. Convolution and
+        interpolation are linear, so derivatives of predictions are convolutions of input with derivatives of g(t)
+        interpolated at observations points (changes of the response function time range are not included).
+
+        :param params: model's parameters used in order to calculate response function - g(t)
+        :return: interpolated y predictions and array of shape (number of observations, number of params) with
+        their derivatives
+        """
+        with self.instrumentation.timer('support_length'):
+            t, x, index, weight = self.__get_grid(get_support_length(self.cfg.type, params))
+
+        with self.instrumentation.timer('response_function'):
+            g_t = np.vstack([self.response_functions[self.cfg.type](t, params),
+                             self.gradient_functions[self.cfg.type](t, params)])
+
+        interpolated = self.__calculate_interpolated_convolutions(g_t, t, index, weight)
+        self.__last_predictions = (np.asarray(params, dtype=float).tobytes(), interpolated[0])
+
+        return interpolated[0], interpolated[1:].T
 
     def _get_predictions(self, params: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -75,65 +296,246 @@ class ParamsFitter:
         points based on convolution of input and g(t)
         """
         response_function = self.response_functions[self.cfg.type]
-        t = np.arange(0.001, 2, 1)
-        g_t = response_function(t, params)
+        with self.instrumentation.timer('support_length'):
+            t, x, _, _ = self.__get_grid(get_support_length(self.cfg.type, params))
 
-        while 1 - integrate.quad(response_function, min(t), max(t), args=params)[0] >= 0.01:
-            t = np.arange(0.001, (len(t) + params[0]) + 1, 1)
+        with self.instrumentation.timer('response_function'):
             g_t = response_function(t, params)
 
-        # print(params)
+        y = self.__calculate_convolution(g_t, t)
 
-        x = np.round(np.arange(min(t) + min(self.input[0]), max(t) + max(self.input[0]) + 1, 1), 2) + self.start_year
-        y = self.__calculate_convolution(self.input[1], g_t, t)
-        self.time = t
+        return x, y
 
-        self.fit_data.set_output(np.round(x, 4), np.round(y, 4))
-        self.fit_data.set_response_function(np.round(self.time, 4), np.round(g_t, 4))
+    def get_response_function(self, params: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Get response function of the model (used to calculate it for the best fit only).
 
-        return x, y
+        :param params: model's parameters
+        :return: time range and response function g(t)
+        """
+        t = get_support(self.cfg.type, params)
+
+        return t, self.response_functions[self.cfg.type](t, params)
+
+    def calculate_batch_mse(self, params: np.ndarray) -> np.ndarray:
+        """
+        Get calculated MSE (mean-square error) for many parameters sets at once.
+
+        :param params: array of shape (K, n) with K sets of model's parameters
+        :return: array of size K with calculated MSE for each parameters set
+        """
+        return ((self.get_batch_predictions(params) - self.fit_data.observations[1]) ** 2).mean(axis=1)
+
+    def get_batch_predictions(self, params: np.ndarray) -> np.ndarray:
+        """
+        Get interpolated y predictions for many parameters sets in one pass. Response functions are calculated on
+        the longest time range needed and truncated after their own support length, so predictions at observations
+        within predictions range are the same as calculated separately for each parameters set.
+
+        :param params: array of shape (K, n) with K sets of model's parameters
+        :return: array of shape (K, number of observations) with interpolated y predictions
+        """
+        params = np.atleast_2d(params)
+        with self.instrumentation.timer('support_length'):
+            lengths = np.array([get_support_length(self.cfg.type, i) for i in params])
+            t, x, index, weight = self.__get_grid(lengths.max())
+
+        with self.instrumentation.timer('response_function'):
+            g_t = self.batch_response_functions[self.cfg.type](t, params)
+            g_t[np.arange(len(t)) >= lengths[:, np.newaxis]] = 0
+
+        return self.__calculate_interpolated_convolutions(g_t, t, index, weight)
+
+    def __calculate_interpolated_convolutions(self, kernels: np.ndarray, t: np.ndarray, index: np.ndarray,
+                                              weight: np.ndarray) -> np.ndarray:
+        """
+        Calculate convolutions of input with many kernels interpolated at observations points (numba and sparse
+        engines calculate convolutions only at points around observations).
+
+        :param kernels: array of shape (K, len(t)) with response functions (or their derivatives)
+        :param t: time range of response functions
+        :param index: indices of x points preceding observations points
+        :param weight: interpolation weights of the next x points
+        :return: array of shape (K, number of observations) with interpolated convolutions
+        """
+        if self.engine == 'numba':
+            with self.instrumentation.timer('convolution'):
+                return interpolated_convolutions(self.convolver.vector, kernels, self.__get_engine_decay_kernel(len(t)),
+                                                 index, weight)
+
+        if self.engine == 'sparse':
+            return self.__calculate_sparse_convolutions(kernels, t, weight)
+
+        return self.__interpolate(self.__calculate_convolution(kernels, t), index, weight)
+
+    def __calculate_sparse_convolutions(self, kernels: np.ndarray, t: np.ndarray, weight: np.ndarray) -> np.ndarray:
+        """
+        Calculate convolutions of input with kernels only at x points preceding and following observations points
+        (products of reversed input windows and kernels) and interpolate them at observations points. Decay kernel is
+        applied in place, so kernels must be a temporary array.
+
+        :param kernels: response function or array of shape (K, len(t)) with response functions (or their derivatives)
+        :param t: time range of response functions
+        :param weight: interpolation weights of the next x points
+        :return: interpolated convolutions of shape (number of observations) or (K, number of observations)
+        """
+        windows, rows, position, next_position = self.__get_sparse_grid(len(t))
+
+        with self.instrumentation.timer('convolution'):
+            if self.decay is not None:
+                kernels *= self.__get_decay_kernel(len(t))
 
-    def __calculate_convolution(self, vector_a: np.ndarray, vector_b: np.ndarray, t) -> np.ndarray:
+            values = kernels @ windows[rows].T
+
+        with self.instrumentation.timer('interpolation'):
+            return values[..., position] * (1 - weight) + values[..., next_position] * weight
+
+    def __interpolate(self, y: np.ndarray, index: np.ndarray, weight: np.ndarray) -> np.ndarray:
+        """
+        Interpolate many predictions calculated on the same x points at observations points (the same as np.interp
+        for each row of y).
+
+        :param y: array of shape (K, number of x points) with y predictions
+        :param index: indices of x points preceding observations points
+        :param weight: interpolation weights of the next x points
+        :return: array of shape (K, number of observations) with interpolated y predictions
         """
-        Calculate convolution of two vectors (full mode), include radioactive decay constant if tracer
-        is a radionuclide.
+        with self.instrumentation.timer('interpolation'):
+            return y[:, index] * (1 - weight) + y[:, index + 1] * weight
 
-        :param vector_a: first vector (input)
-        :param vector_b: second vector (response function)
+    def __calculate_convolution(self, vector_b: np.ndarray, t: np.ndarray) -> np.ndarray:
+        """
+        Calculate convolution of input and response function (full mode), include radioactive decay constant if tracer
+        is a radionuclide. Convolution method is chosen by the convolver based on vectors sizes. Decay kernel is
+        applied in place, so vector_b must be a temporary array.
+
+        :param vector_b: second vector (response function) or array of response functions of shape (K, len(t))
+        :param t: time range of response function
         :return: calculated convolution of two vectors
         """
-        if self.decay is not None:
-            return np.convolve(vector_a, vector_b * np.exp(-t * self.decay), mode="full")
+        with self.instrumentation.timer('convolution'):
+            if self.decay is not None:
+                vector_b *= self.__get_decay_kernel(len(t))
+
+            return self.convolver.convolve(vector_b)
+
+    def get_snapshot(self) -> 'ParamsFitter':
+        """
+        Get copy of the fitter used to calculate output of the solution on first access (cached grids are not copied,
+        so they are not kept by unread result and the fitter can be reused).
 
-        return np.convolve(vector_a, vector_b, mode="full")
+        :return: shallow copy of the fitter without cached grids
+        """
+        return copy(self)
 
     def get_data_solution(self, solution: OptimizeResult, params_accuracy=None):
         """
         Get all solution information - output data, response function data and model efficiency based on chosen
-        parameters.
+        parameters. Params are rounded to 2 decimals, but MSE and model efficiency are calculated at unrounded params
+        of the minimization (rounding can change MSE a lot, e.g. it moves the piston flow front of EPM).
 
         :param solution: solution of the parameters minimization
         :param params_accuracy: model's parameters accuracy
         """
         params = np.round(solution.x, 2)
         self.fit_data.params = params
+        self.fit_data.optimum = solution.x
 
-        self.fit_data.set_mse(round(solution.fun, 3))
-        self.fit_data.set_model_efficiency(round(self.__calculate_me(params), 3))
+        mse, model_efficiency = self.__calculate_mse_and_me(solution.x)
+        self.fit_data.set_mse(round(mse, 3))
+        self.fit_data.set_model_efficiency(round(model_efficiency, 3))
+        self.fit_data.set_solution(self.get_snapshot(), params)
 
         if params_accuracy is not None:
             self.fit_data.confidence_level = params_accuracy[0]
             self.fit_data.confidence_interval = params_accuracy[1]
 
+            if len(params_accuracy) > 2:
+                self.fit_data.refits_evaluations = params_accuracy[2]
+
         return self.fit_data
 
-    def run_algorithm(self):
+    def run_algorithm(self, initial_values: np.ndarray = None, executor: Executor = None):
+        """
+        Run whole algorithm for finding the best model parameters. If initial values are not provided, they are
+        taken from prediction table (if it is provided) or global search is run (if it is set in model configuration).
+
+        :param initial_values: start point of the minimization (middle of parameters range if not provided)
+        :param executor: executor used to run local minimizations of global search in parallel (optional)
+        :return: solution of the minimization
+        """
+        if self.prediction_table is not None and initial_values is None:
+            initial_values = self.prediction_table.get_best_params(self.fit_data.observations, self.cfg.params_range)
+
+        if self.cfg.search == 'global' and initial_values is None:
+            return self.run_global_algorithm(executor)
+
+        return self.run_local_algorithm(initial_values)
+
+    def run_global_algorithm(self, executor: Executor = None):
+        """
+        Evaluate MSE for Latin hypercube samples of parameters range and run local minimizations from the best
+        samples.
+
+        :param executor: executor used to run local minimizations in parallel (optional)
+        :return: the best solution of local minimizations
+        """
+        lower_bounds, upper_bounds = np.array(self.cfg.params_range, dtype=float).T
+        random = np.random.default_rng(0)
+
+        # each parameter range is divided into equal strata and each stratum is sampled once
+        strata = np.array([random.permutation(GLOBAL_SEARCH_SAMPLES) for _ in lower_bounds]).T
+        samples = lower_bounds + (strata + random.uniform(size=strata.shape)) / GLOBAL_SEARCH_SAMPLES * \
+            (upper_bounds - lower_bounds)
+
+        mse = np.concatenate([self.calculate_batch_mse(samples[i:i + GLOBAL_SEARCH_BATCH_SIZE])
+                              for i in range(0, GLOBAL_SEARCH_SAMPLES, GLOBAL_SEARCH_BATCH_SIZE)])
+        start_points = samples[np.argsort(np.where(np.isnan(mse), np.inf, mse))[:GLOBAL_SEARCH_STARTS]]
+
+        map_function = executor.map if executor is not None else map
+        solutions = list(map_function(self.run_local_algorithm, start_points))
+
+        solution = min(solutions, key=lambda i: i.fun if not np.isnan(i.fun) else np.inf)
+        solution.nfev = sum(i.nfev for i in solutions) + GLOBAL_SEARCH_SAMPLES
+
+        return solution
+
+    def run_local_algorithm(self, initial_values: np.ndarray = None):
         """
-        Run whole algorithm for finding the best model parameters.
+        Run local minimization for finding the best model parameters. Initial values are clipped to parameters range.
+        If least squares optimizer is chosen, MSE is set as the solution function value (the same as for TNC). TNC
+        of models with incomplete analytic gradient is run also with finite differences (the better solution is kept).
 
+        :param initial_values: start point of the minimization (middle of parameters range if not provided)
         :return: solution of the minimization
         """
-        solution = minimize(self.__calculate_mse, self.cfg.initial_values, method='TNC', options={'maxiter': 200},
-                            bounds=self.cfg.params_range)
+        lower_bounds, upper_bounds = np.array(self.cfg.params_range, dtype=float).T
+        initial_values = self.cfg.initial_values if initial_values is None else initial_values
+        initial_values = np.clip(initial_values, lower_bounds, upper_bounds)
+
+        if self.optimizer == 'least_squares':
+            solution = least_squares(self.residuals, initial_values, jac=self.jacobian,
+                                     bounds=(lower_bounds, upper_bounds), **self.tolerances)
+            solution.fun = (solution.fun ** 2).mean()
+
+            return solution
+
+        options = {'maxiter': 200, **self.tolerances}
+        solution = None
+        if self.has_gradient:
+            solution = minimize(self.__calculate_mse_and_gradient, initial_values, method='TNC', jac=True,
+                                options=options, bounds=self.cfg.params_range)
+            if self.cfg.type not in PARTIAL_GRADIENT_MODELS:
+                return solution
+
+        finite_differences_solution = minimize(self.__calculate_mse, initial_values, method='TNC', options=options,
+                                               bounds=self.cfg.params_range)
+        if solution is None:
+            return finite_differences_solution
+
+        evaluations = solution.nfev + finite_differences_solution.nfev
+        if finite_differences_solution.fun < solution.fun or np.isnan(solution.fun):
+            solution = finite_differences_solution
+        solution.nfev = evaluations
 
         return solution
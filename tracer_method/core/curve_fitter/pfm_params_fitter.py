@@ -1,17 +1,35 @@
+from concurrent.futures import Executor
 from typing import Tuple
 
 import numpy as np
+from scipy.optimize import minimize_scalar, OptimizeResult
 
 from tracer_method.core.config.config_model import ConfigModel
 from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
+from tracer_method.core.curve_fitter.prediction_table import PredictionTable
+from tracer_method.core.instrumentation import Instrumentation
+
+# number of transit times in the grid of PFM solver
+PFM_GRID_SIZE = 2001
+# tolerances supported by bounded scalar minimization which refines the best transit time of the grid
+GRID_TOLERANCES = ('xatol', 'maxiter')
 
 
 class PFMParamsFitter(ParamsFitter):
     """ Get the output data which gets the best fit to observations data points. It depends on PFM model params
-    and beta (if provided). """
+    and beta (if provided). By default (grid optimizer) MSE is evaluated for a dense grid of transit times in one
+    pass and the best one is refined with bounded scalar minimization, TNC and least squares can be used as well. """
 
-    def __init__(self, input: np.ndarray, obs: np.ndarray, start_year: int, cfg: ConfigModel, decay: float):
-        super().__init__(input, obs, start_year, cfg, decay)
+    def __init__(self, input: np.ndarray, obs: np.ndarray, start_year: int, cfg: ConfigModel, decay: float,
+                 optimizer: str = 'grid', prepared_input: bool = False, tolerances: dict = None,
+                 prediction_table: PredictionTable = None, instrumentation: Instrumentation = None):
+        super().__init__(input, obs, start_year, cfg, decay, optimizer=optimizer, prepared_input=prepared_input,
+                         tolerances=tolerances, prediction_table=prediction_table, instrumentation=instrumentation)
+        # predictions are not calculated with response functions, so their derivatives cannot be used
+        self.gradient_functions = {}
+        # output is shifted input, so it is not rounded and it is not calculated by numba engine
+        self.fit_data.decimals = None
+        self.engine = 'numpy'
 
     def _get_predictions(self, params: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -26,6 +44,64 @@ class PFMParamsFitter(ParamsFitter):
         x = self.input[0] + t_t + self.start_year
         y = self.input[1] * np.exp(-t_t * self.decay) if self.decay is not None else self.input[1]
 
-        self.fit_data.set_output(x, y)
-
         return x, y
+
+    def get_response_function(self, params: np.ndarray) -> None:
+        """ PFM output is shifted input, so response function is not calculated. """
+        return None
+
+    def get_batch_predictions(self, params: np.ndarray) -> np.ndarray:
+        """
+        Get interpolated y predictions for many transit times in one pass - input shifted by transit time is
+        interpolated at observations points.
+
+        :param params: array of shape (K, 1) with transit times
+        :return: array of shape (K, number of observations) with interpolated y predictions
+        """
+        t_t = np.atleast_2d(params)[:, 0:1]
+
+        with self.instrumentation.timer('interpolation'):
+            y = np.interp(self.fit_data.observations[0] - t_t - self.start_year, self.input[0], self.input[1])
+
+        return y * np.exp(-t_t * self.decay) if self.decay is not None else y
+
+    def run_algorithm(self, initial_values: np.ndarray = None, executor: Executor = None):
+        """
+        Run whole algorithm for finding the best transit time (grid optimizer searches whole parameters range,
+        so initial values, prediction table and global search are not used).
+
+        :param initial_values: start point of the minimization for TNC and least squares
+        :param executor: executor used to run local minimizations of global search in parallel (optional)
+        :return: solution of the minimization
+        """
+        if self.optimizer == 'grid':
+            return self.run_grid_algorithm()
+
+        return super().run_algorithm(initial_values, executor)
+
+    def run_grid_algorithm(self):
+        """
+        Evaluate MSE for a dense grid of transit times and refine the best one with bounded scalar minimization
+        between its neighbours.
+
+        :return: solution of the minimization
+        """
+        (lower_bound, upper_bound), = self.cfg.params_range
+        grid = np.linspace(lower_bound, upper_bound, PFM_GRID_SIZE)
+
+        mse = self.calculate_batch_mse(grid[:, np.newaxis])
+        best = int(np.argmin(np.where(np.isnan(mse), np.inf, mse)))
+
+        # tolerances of TNC and least squares (e.g. of params accuracy refits) are not used
+        tolerances = {key: value for key, value in self.tolerances.items() if key in GRID_TOLERANCES}
+        refined = minimize_scalar(lambda t_t: self.calculate_batch_mse(np.array([[t_t]]))[0], method='bounded',
+                                  bounds=(grid[max(best - 1, 0)], grid[min(best + 1, PFM_GRID_SIZE - 1)]),
+                                  options={'xatol': 1e-6, **tolerances})
+
+        if refined.fun <= mse[best]:
+            t_t, fun = refined.x, refined.fun
+        else:
+            t_t, fun = grid[best], mse[best]
+
+        return OptimizeResult(x=np.array([t_t]), fun=fun, nit=refined.nit, nfev=PFM_GRID_SIZE + refined.nfev,
+                              success=True)
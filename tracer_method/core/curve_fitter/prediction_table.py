@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from tracer_method.core.config.config_model import ConfigModel
+
+# number of nodes of the table for each model parameter and number of nodes calculated in one batch
+TABLE_GRID_SIZE = 41
+TABLE_BATCH_SIZE = 64
+
+
+def get_table_key(input: np.ndarray, start_year: int, cfg: ConfigModel, decay: float, grid_size: int) -> str:
+    """ Get key of prediction table - hash of input, model configuration and decay constant. """
+    metadata = json.dumps([cfg.type, np.array(cfg.params_range, dtype=float).tolist(), cfg.beta, start_year, decay,
+                           grid_size])
+
+    return hashlib.sha1(np.ascontiguousarray(input, dtype=float).tobytes() + metadata.encode()).hexdigest()
+
+
+class PredictionTable:
+    """ Predicted concentrations for a regular grid of model parameters calculated once for the input and stored
+    in memory-mapped file, so they can be reused by fits of many sites which share the same input (and by worker
+    processes - only path and grid are pickled). Predictions are calculated on common dates grid (the same x points
+    as output of convolution) and are interpolated at observations dates and between parameters grid nodes. """
+
+    def __init__(self, path: Path, model_type: str, params_grid: List[np.ndarray], dates: np.ndarray):
+        self.path = Path(path)
+        self.model_type = model_type
+        self.params_grid = params_grid
+        self.dates = dates
+        self.__values = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_PredictionTable__values'] = None
+
+        return state
+
+    @property
+    def values(self) -> np.ndarray:
+        """ Read-only memory-mapped array of shape (number of grid nodes, number of dates) with predictions. """
+        if self.__values is None:
+            self.__values = np.load(self.path.with_suffix('.npy'), mmap_mode='r')
+
+        return self.__values
+
+    @property
+    def nodes(self) -> np.ndarray:
+        """ Array of shape (number of grid nodes, number of params) with parameters of grid nodes. """
+        return np.array(np.meshgrid(*self.params_grid, indexing='ij')).reshape(len(self.params_grid), -1).T
+
+    @classmethod
+    def build(cls, path: Path, input: np.ndarray, start_year: int, cfg: ConfigModel, decay: float,
+              fitting_method: Callable, grid_size: int = TABLE_GRID_SIZE) -> 'PredictionTable':
+        """
+        Calculate predictions for each node of parameters grid and save them to memory-mapped file (.npy file with
+        predictions and .json file with grid and dates). Files are written under temporary names and then renamed,
+        so table built by another process at the same time is not corrupted.
+
+        :param path: path of the table (without suffix)
+        :param input: input data (not scaled by beta)
+        :param start_year: start year for which calculations begin
+        :param cfg: model configuration with parameters range of the grid
+        :param decay: decay constant
+        :param fitting_method: fitting method used to calculate predictions
+        :param grid_size: number of grid nodes for each parameter
+        :return: built table
+        """
+        path = Path(path)
+        params_grid = [np.linspace(lower, upper, grid_size) for lower, upper in cfg.params_range]
+        # the same x points as output of convolution, including one year after the last input year
+        dates = np.round(np.arange(min(input[0]), max(input[0]) + 2, 1), 2) + start_year
+        table = cls(path, cfg.type, params_grid, dates)
+
+        fitter = fitting_method(input, np.array([dates, np.zeros(len(dates))]), start_year, cfg, decay)
+        nodes = table.nodes
+
+        temporary_suffix = f'.{os.getpid()}-{uuid.uuid4().hex}.tmp'
+        values = open_memmap(path.with_suffix('.npy' + temporary_suffix), mode='w+', dtype=float,
+                             shape=(len(nodes), len(dates)))
+        for i in range(0, len(nodes), TABLE_BATCH_SIZE):
+            values[i:i + TABLE_BATCH_SIZE] = fitter.get_batch_predictions(nodes[i:i + TABLE_BATCH_SIZE])
+        values.flush()
+        del values
+
+        with open(path.with_suffix('.json' + temporary_suffix), 'w') as file:
+            json.dump({'model_type': cfg.type, 'params_grid': [i.tolist() for i in params_grid],
+                       'dates': dates.tolist()}, file)
+
+        os.replace(path.with_suffix('.npy' + temporary_suffix), path.with_suffix('.npy'))
+        os.replace(path.with_suffix('.json' + temporary_suffix), path.with_suffix('.json'))
+
+        return table
+
+    @classmethod
+    def load(cls, path: Path) -> 'PredictionTable':
+        """
+        Load table saved with build (predictions are memory-mapped on first use).
+
+        :param path: path of the table (without suffix)
+        :return: loaded table
+        """
+        path = Path(path)
+        with open(path.with_suffix('.json')) as file:
+            metadata = json.load(file)
+
+        return cls(path, metadata['model_type'], [np.array(i) for i in metadata['params_grid']],
+                   np.array(metadata['dates']))
+
+    @classmethod
+    def get_or_build(cls, directory: Path, input: np.ndarray, start_year: int, cfg: ConfigModel, decay: float,
+                     fitting_method: Callable, grid_size: int = TABLE_GRID_SIZE) -> 'PredictionTable':
+        """
+        Load table for input and model configuration from directory or build it if it does not exist.
+
+        :return: prediction table
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{cfg.type}-{get_table_key(input, start_year, cfg, decay, grid_size)}'
+
+        if path.with_suffix('.json').exists() and path.with_suffix('.npy').exists():
+            return cls.load(path)
+
+        return cls.build(path, input, start_year, cfg, decay, fitting_method, grid_size)
+
+    def get_nodes_predictions(self, obs_dates: np.ndarray) -> np.ndarray:
+        """
+        Get predictions of all grid nodes interpolated at observations dates.
+
+        :param obs_dates: observations dates
+        :return: array of shape (number of grid nodes, number of observations) with predictions
+        """
+        if obs_dates.min() < self.dates[0] or obs_dates.max() > self.dates[-1]:
+            raise ValueError('Observations are outside of prediction table dates')
+
+        index = np.clip(np.searchsorted(self.dates, obs_dates, side='right') - 1, 0, len(self.dates) - 2)
+        weight = (obs_dates - self.dates[index]) / (self.dates[index + 1] - self.dates[index])
+
+        return self.values[:, index] * (1 - weight) + self.values[:, index + 1] * weight
+
+    def interpolate(self, params: np.ndarray, obs_dates: np.ndarray) -> np.ndarray:
+        """
+        Get predictions at observations dates for many parameters sets with multilinear interpolation between grid
+        nodes.
+
+        :param params: array of shape (K, n) with K sets of model's parameters
+        :param obs_dates: observations dates
+        :return: array of shape (K, number of observations) with interpolated predictions
+        """
+        params = np.atleast_2d(params)
+        predictions = self.get_nodes_predictions(obs_dates).reshape(*[len(i) for i in self.params_grid], -1)
+
+        indices, weights = [], []
+        for grid, values in zip(self.params_grid, params.T):
+            index = np.clip(np.searchsorted(grid, values, side='right') - 1, 0, len(grid) - 2)
+            indices.append(index)
+            weights.append(np.clip((values - grid[index]) / (grid[index + 1] - grid[index]), 0, 1))
+
+        result = np.zeros((len(params), len(obs_dates)))
+        for corner in np.ndindex(*[2] * len(self.params_grid)):
+            weight = np.prod([w if c else 1 - w for c, w in zip(corner, weights)], axis=0)
+            result += weight[:, np.newaxis] * predictions[tuple(i + c for c, i in zip(corner, indices))]
+
+        return result
+
+    def get_best_params(self, obs: np.ndarray, params_range) -> np.ndarray:
+        """
+        Get grid node with the lowest MSE within parameters range.
+
+        :param obs: observations data with date and concentration
+        :param params_range: parameters range of the fit (it can be narrower than range of the table)
+        :return: parameters of the best node (None if there is no node within parameters range or observations are
+        outside of table dates)
+        """
+        if obs[0].min() < self.dates[0] or obs[0].max() > self.dates[-1]:
+            return None
+
+        lower_bounds, upper_bounds = np.array(params_range, dtype=float).T
+        nodes = self.nodes
+        inside = np.all((nodes >= lower_bounds) & (nodes <= upper_bounds), axis=1)
+
+        if not inside.any():
+            return None
+
+        mse = ((self.get_nodes_predictions(obs[0])[inside] - obs[1]) ** 2).mean(axis=1)
+
+        return nodes[inside][np.argmin(np.where(np.isnan(mse), np.inf, mse))]
@@ -39,3 +39,80 @@ def dispersion(t: np.ndarray, params: np.ndarray):
     t_t, p_d = params
 
     return ((4 * np.pi * p_d * t / t_t) ** -0.5) * (1 / t) * np.exp(-((1 - (t / t_t)) ** 2) / (4 * p_d * t / t_t))
+
+
+def exponential_batch(t: np.ndarray, params: np.ndarray):
+    """
+    Calculate response function for EM for many parameters sets
+
+    :param t: time range of size T
+    :param params: array of shape (K, 1) with transit times
+    :return: calculated response functions g(t) of shape (K, T)
+    """
+    return exponential(t, params.T[..., np.newaxis])
+
+
+def exponential_piston_flow_batch(t: np.ndarray, params: np.ndarray):
+    """
+    Calculate response function for EPM for many parameters sets
+
+    :param t: time range of size T
+    :param params: array of shape (K, 2) with transit times and η values
+    :return: calculated response functions g(t) of shape (K, T)
+    """
+    return exponential_piston_flow(t, params.T[..., np.newaxis])
+
+
+def dispersion_batch(t: np.ndarray, params: np.ndarray):
+    """
+    Calculate response function for DM for many parameters sets
+
+    :param t: time range of size T
+    :param params: array of shape (K, 2) with transit times and dispersion parameters (Pd)
+    :return: calculated response functions g(t) of shape (K, T)
+    """
+    return dispersion(t, params.T[..., np.newaxis])
+
+
+def exponential_gradient(t: np.ndarray, params: np.ndarray):
+    """
+    Calculate derivatives of response function for EM with respect to its parameters
+
+    :param t: time range
+    :param params: transit time
+    :return: array of shape (1, len(t)) with dg/dt_t
+    """
+    t_t, = params
+    g_t = exponential(t, params)
+
+    return np.array([g_t * (t - t_t) / t_t ** 2])
+
+
+def exponential_piston_flow_gradient(t: np.ndarray, params: np.ndarray):
+    """
+    Calculate derivatives of response function for EPM with respect to its parameters (the shift of the piston
+    flow front is not included, the response function is not differentiable there)
+
+    :param t: time range
+    :param params: transit time and η
+    :return: array of shape (2, len(t)) with dg/dt_t and dg/dη
+    """
+    t_t, n = params
+    g_t = exponential_piston_flow(t, params)
+
+    return np.array([g_t * (n * t / t_t - 1) / t_t, g_t * (1 / n - t / t_t + 1)])
+
+
+def dispersion_gradient(t: np.ndarray, params: np.ndarray):
+    """
+    Calculate derivatives of response function for DM with respect to its parameters
+
+    :param t: time range
+    :param params: transit time and dispersion parameter (Pd)
+    :return: array of shape (2, len(t)) with dg/dt_t and dg/dPd
+    """
+    t_t, p_d = params
+    g_t = dispersion(t, params)
+
+    return np.array([g_t * (1 / (2 * t_t) - (t_t ** 2 - t ** 2) / (4 * p_d * t * t_t ** 2)),
+                     g_t * ((t_t - t) ** 2 / (4 * p_d ** 2 * t_t * t) - 1 / (2 * p_d))])
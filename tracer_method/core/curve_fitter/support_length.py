@@ -0,0 +1,105 @@
+import math
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+from scipy.special import log_ndtr, ndtr
+
+START_TIME = 0.001
+MAX_LOST_MASS = 0.01
+PARAMS_PRECISION = 6
+
+
+def exponential_cdf(t: np.ndarray, params: np.ndarray):
+    """
+    Calculate cumulative distribution of response function for EM
+
+    :param t: time range
+    :param params: transit time
+    :return: integral of g(t) from 0 to t
+    """
+    t_t, = params
+
+    return 1 - np.exp(-t / t_t)
+
+
+def exponential_piston_flow_cdf(t: np.ndarray, params: np.ndarray):
+    """
+    Calculate cumulative distribution of response function for EPM
+
+    :param t: time range
+    :param params: transit time and η
+    :return: integral of g(t) from 0 to t
+    """
+    t_t, n = params
+
+    return np.where(t >= t_t * (1 - 1 / n), 1 - np.exp(-n * t / t_t + n - 1), 0)
+
+
+def dispersion_cdf(t: np.ndarray, params: np.ndarray):
+    """
+    Calculate cumulative distribution of response function for DM. The response function of DM is the inverse
+    Gaussian distribution with mean equal to transit time and shape parameter equal to t_t / (2 * Pd).
+
+    :param t: time range
+    :param params: transit time and dispersion parameter (Pd)
+    :return: integral of g(t) from 0 to t
+    """
+    t_t, p_d = params
+    a = np.sqrt(t_t / (2 * p_d * t))
+
+    # exp(1 / Pd) overflows for small Pd, so the second term is calculated in logarithmic scale
+    return ndtr(a * (t / t_t - 1)) + np.exp(1 / p_d + log_ndtr(-a * (t / t_t + 1)))
+
+
+CUMULATIVE_FUNCTIONS = {
+    'DM': dispersion_cdf,
+    'EM': exponential_cdf,
+    'EPM': exponential_piston_flow_cdf,
+}
+
+
+@lru_cache(maxsize=4096)
+def _get_support_length(model_type: str, params: Tuple[float, ...]) -> int:
+    """
+    Find the number of time steps after which the response function can be truncated.
+
+    The time range starts with two steps and grows by transit time + 1 steps until at least 99% of the response
+    function mass is included. Mass is calculated from closed-form cumulative distributions instead of numerical
+    integration.
+
+    :param model_type: model type (EM, EPM or DM)
+    :param params: model's parameters rounded to PARAMS_PRECISION
+    :return: number of time steps
+    """
+    cdf = CUMULATIVE_FUNCTIONS[model_type]
+    t_t = params[0]
+    start_mass = cdf(START_TIME, params)
+
+    length = 2
+    while 1 - (cdf(START_TIME + length - 1, params) - start_mass) >= MAX_LOST_MASS:
+        length = math.ceil((length + t_t + 1) - START_TIME)
+
+    return length
+
+
+def get_support_length(model_type: str, params: np.ndarray) -> int:
+    """
+    Get the number of time steps of the response function (cached for rounded params and model type).
+
+    :param model_type: model type (EM, EPM or DM)
+    :param params: model's parameters
+    :return: number of time steps
+    """
+    return _get_support_length(model_type, tuple(round(float(param), PARAMS_PRECISION) for param in params))
+
+
+def get_support(model_type: str, params: np.ndarray) -> np.ndarray:
+    """
+    Get time range for which response function is calculated.
+
+    :param model_type: model type (EM, EPM or DM)
+    :param params: model's parameters
+    :return: time range starting at START_TIME with step equal to one year
+    """
+    return np.arange(START_TIME, get_support_length(model_type, params), 1)
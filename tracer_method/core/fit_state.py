@@ -0,0 +1,161 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.fitting_result import FittingResult
+from tracer_method.core.tritium.tritium_method import fit_model
+
+
+def get_model_key(model_cfg: List[Union[str, float]]) -> str:
+    """ Get key of model configuration - model type and hash of the whole configuration. """
+    return f'{model_cfg[0]}-{hashlib.sha1(json.dumps(model_cfg).encode()).hexdigest()[:10]}'
+
+
+class FitState:
+    """ State of the fit of one model configuration to observations of one site: prepared input, observations, the
+    last optimum (unrounded params of minimization) and output (convolution) calculated for it. It can be saved and
+    loaded, so new observations only need a warm-started refit. Input is prepared for one infiltration rate, so fits
+    with alpha range are not supported. """
+
+    VERSION = 1
+
+    def __init__(self, site: str, model_cfg: List[Union[str, float]], input_data: np.ndarray, start_year: int,
+                 decay: float, obs: np.ndarray, params: np.ndarray, output: np.ndarray):
+        if len(params) != len(ConfigModel(model_cfg).params_range):
+            raise ValueError('Fit state is available only for model params (fits with alpha range are not supported)')
+
+        self.site = site
+        self.model_cfg = model_cfg
+        self.input_data = input_data
+        self.start_year = start_year
+        self.decay = decay
+        self.obs = obs
+        self.params = params
+        self.output = output
+
+    @classmethod
+    def create(cls, site: str, model_cfg: List[Union[str, float]], input_data: np.ndarray, start_year: int,
+               decay: float, obs: np.ndarray, alpha_range: Tuple[float, float] = None) -> 'FitState':
+        """
+        Fit model to observations from the middle of parameters range and create its state.
+
+        :param alpha_range: range of infiltration rate (fits with alpha range are not supported, it must be None)
+        :return: state of the fit
+        """
+        if alpha_range is not None:
+            raise ValueError('Fit state is not available if alpha is fitted')
+
+        model_cfg = json.loads(json.dumps(model_cfg))
+        result = fit_model(input_data, obs, start_year, decay, model_cfg)
+
+        return cls(site, model_cfg, input_data, start_year, decay, obs, result.optimum, result.output)
+
+    def predict(self, dates: np.ndarray) -> np.ndarray:
+        """
+        Get predictions at dates interpolated from output of the last optimum (without convolution).
+
+        :param dates: dates (years and part of it)
+        :return: interpolated predictions
+        """
+        return np.interp(dates, self.output[0], self.output[1])
+
+    def update(self, new_obs: np.ndarray) -> FittingResult:
+        """
+        Add new observations and refit model starting from the last optimum. Each update is a full refit to all
+        observations (only its start point is reused, nothing is calculated incrementally).
+
+        :param new_obs: new observations data with date and h3 concentration
+        :return: calculated output concentration with the best fit for all observations
+        """
+        obs = np.concatenate([self.obs, new_obs], axis=1)
+        obs = obs[:, np.argsort(obs[0], kind='stable')]
+
+        result = fit_model(self.input_data, obs, self.start_year, self.decay, self.model_cfg,
+                           initial_values=self.params)
+
+        self.obs, self.params, self.output = obs, result.optimum, result.output
+
+        return result
+
+    def save(self, path: Path):
+        """
+        Save state to npz file.
+
+        :param path: path of the file
+        """
+        metadata = {
+            'version': self.VERSION,
+            'site': self.site,
+            'model_cfg': self.model_cfg,
+            'start_year': self.start_year,
+            'decay': self.decay,
+        }
+
+        with open(path, 'wb') as file:
+            np.savez(file, metadata=np.array(json.dumps(metadata)), input_data=self.input_data, obs=self.obs,
+                     params=self.params, output=self.output)
+
+    @classmethod
+    def load(cls, path: Path) -> 'FitState':
+        """
+        Load state from npz file.
+
+        :param path: path of the file
+        :return: loaded state
+        """
+        with np.load(path) as data:
+            metadata = json.loads(str(data['metadata']))
+
+            if metadata['version'] != cls.VERSION:
+                raise ValueError(f'Not supported fit state version: {metadata["version"]}')
+
+            return cls(metadata['site'], metadata['model_cfg'], data['input_data'], metadata['start_year'],
+                       metadata['decay'], data['obs'], data['params'], data['output'])
+
+
+class FitStateStore:
+    """ Directory with saved fit states keyed on site and model configuration. """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get_path(self, site: str, model_cfg: List[Union[str, float]]) -> Path:
+        """ Get path of the file with state of the fit for site and model configuration. """
+        site_name = re.sub(r'[^\w.-]', '_', str(site))
+
+        return self.directory / f'{site_name}__{get_model_key(json.loads(json.dumps(model_cfg)))}.npz'
+
+    def load(self, site: str, model_cfg: List[Union[str, float]]) -> Union[FitState, None]:
+        """ Load state of the fit for site and model configuration (None if it was not saved). """
+        path = self.get_path(site, model_cfg)
+
+        return FitState.load(path) if path.exists() else None
+
+    def save(self, state: FitState):
+        """ Save state of the fit. """
+        state.save(self.get_path(state.site, state.model_cfg))
+
+    def update(self, site: str, model_cfg: List[Union[str, float]], new_obs: np.ndarray) -> FittingResult:
+        """
+        Add new observations to saved state of the fit, refit model starting from the last optimum and save state.
+
+        :param site: site id
+        :param model_cfg: model configuration
+        :param new_obs: new observations data with date and h3 concentration
+        :return: calculated output concentration with the best fit for all observations
+        """
+        state = self.load(site, model_cfg)
+
+        if state is None:
+            raise FileNotFoundError(f'Fit state not found for site {site} and model {model_cfg[0]}')
+
+        result = state.update(new_obs)
+        self.save(state)
+
+        return result
@@ -1,33 +1,181 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
 import numpy as np
 
+from tracer_method.core.exceptions import FileException
+from tracer_method.core.read_data.columns_reader import import_pyarrow
+
+# number of decimals of output and response function (None if they should not be rounded)
+OUTPUT_DECIMALS = 4
+RESULTS_EXTENSIONS = ['.npz', '.parquet', '.feather', '.arrow']
+
 
 class FittingResult:
     """ Class which holds output data(observations, model type, model params, beta param)  regarding obtaining the
-    best fit for specified observations. """
+    best fit for specified observations. Output and response function are calculated on first access. """
+
+    __slots__ = ('model_type', 'observations', 'params', 'beta', 'alpha', 'instrumentation', 'mse', 'model_efficiency',
+                 'confidence_level', 'confidence_interval', 'refits_evaluations', 'decimals', 'optimum', '_output',
+                 '_response_function', '_fitter', '_solution_params')
 
-    def __init__(self, model_type: str, observations: np.ndarray, beta: float=0):
+    def __init__(self, model_type: str, observations: np.ndarray, beta: float=0,
+                 decimals: Optional[int] = OUTPUT_DECIMALS):
         self.model_type = model_type
         self.observations = observations
-        self.output: np.ndarray
-        self.params: np.ndarray
-        self.response_function: np.array
+        self.params: Optional[np.ndarray] = None
         self.beta = beta
+        self.alpha = None
+        self.instrumentation = None
         self.mse = 0
         self.model_efficiency = 0
         self.confidence_level = []
         self.confidence_interval = []
+        self.refits_evaluations = np.empty((0, 2), dtype=int)
+        self.decimals = decimals
+        # unrounded params of minimization (used as start point of refits)
+        self.optimum: Optional[np.ndarray] = None
+        self._output: Optional[np.ndarray] = None
+        self._response_function: Optional[np.ndarray] = None
+        self._fitter = None
+        self._solution_params: Optional[np.ndarray] = None
+
+    def __getstate__(self):
+        # output and response function are calculated before pickling, so the fitter is not sent with the result
+        self.__calculate_solution()
+
+        return {name: getattr(self, name) for name in self.__slots__ if name != '_fitter'}
+
+    def __setstate__(self, state: Dict):
+        self._fitter = None
+
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @property
+    def output(self) -> Optional[np.ndarray]:
+        """ Dates and concentration of the best fit (calculated on first access). """
+        self.__calculate_solution()
+
+        return self._output
+
+    @property
+    def response_function(self) -> Optional[np.ndarray]:
+        """ Time and response function g(t) of the best fit (calculated on first access, None for PFM). """
+        self.__calculate_solution()
+
+        return self._response_function
+
+    def __calculate_solution(self):
+        """ Calculate output and response function from the final params (only once, the fitter is released). """
+        if self._fitter is None:
+            return
+
+        if self._output is None:
+            self._output = self.__round(np.array(self._fitter._get_predictions(self._solution_params)))
+
+        response_function = self._fitter.get_response_function(self._solution_params)
+        if self._response_function is None and response_function is not None:
+            self._response_function = self.__round(np.array(response_function))
+
+        self._fitter = None
+
+    def __round(self, values: np.ndarray) -> np.ndarray:
+        return np.round(values, self.decimals) if self.decimals is not None else values
+
+    def set_solution(self, fitter, params: np.ndarray):
+        """
+        Set fitter and params from which output and response function are calculated on first access.
+
+        :param fitter: fitter with _get_predictions and get_response_function methods (snapshot of the fitter, so it can
+        be reused while the result is not read)
+        :param params: params of minimization (with alpha if it was fitted)
+        """
+        self._fitter = fitter
+        self._solution_params = params
+        self._output = None
+        self._response_function = None
 
     def set_params(self, params: np.ndarray):
         self.params = params
 
     def set_response_function(self, time: np.ndarray, g_t: np.ndarray):
-        self.response_function = np.array([time, g_t])
+        self._response_function = np.array([time, g_t])
 
     def set_output(self, dates: np.ndarray, concentration: np.ndarray):
-        self.output = np.array([dates, concentration])
+        self._output = np.array([dates, concentration])
 
     def set_mse(self, mse: float):
         self.mse = mse
 
     def set_model_efficiency(self, model_efficiency: float):
         self.model_efficiency = model_efficiency
+
+
+def get_results_columns(results: List[FittingResult]) \
+        -> Tuple[Dict[str, np.ndarray], Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+    """
+    Get columns of batch of results - one row for each result. Params, observations, output and response function
+    have different lengths in each row, so they are stored as values of all rows and offsets of rows.
+
+    :param results: fitting results
+    :return: dictionary with name and array of scalar columns and dictionary with name, values and offsets of list
+    columns
+    """
+    columns = {
+        'model_type': np.array([i.model_type for i in results], dtype=str),
+        'beta': np.array([i.beta for i in results], dtype=float),
+        'alpha': np.array([np.nan if i.alpha is None else i.alpha for i in results], dtype=float),
+        'mse': np.array([i.mse for i in results], dtype=float),
+        'model_efficiency': np.array([i.model_efficiency for i in results], dtype=float),
+    }
+
+    list_columns = {}
+    for name, values in [('params', [[] if i.params is None else i.params for i in results]),
+                         ('observations_dates', [i.observations[0] for i in results]),
+                         ('observations_concentration', [i.observations[1] for i in results]),
+                         ('output_dates', [[] if i.output is None else i.output[0] for i in results]),
+                         ('output_concentration', [[] if i.output is None else i.output[1] for i in results]),
+                         ('response_function_time', [[] if i.response_function is None else i.response_function[0]
+                                                     for i in results]),
+                         ('response_function_values', [[] if i.response_function is None else i.response_function[1]
+                                                       for i in results])]:
+        values = [np.asarray(i, dtype=float) for i in values]
+        offsets = np.concatenate([[0], np.cumsum([len(i) for i in values])]).astype(np.int64)
+        list_columns[name] = (np.concatenate(values) if values else np.empty(0), offsets)
+
+    return columns, list_columns
+
+
+def save_results(results: List[FittingResult], file: Path):
+    """
+    Save batch of results to npz, parquet, feather or arrow file (parquet, feather and arrow files require pyarrow).
+    List columns are saved as list columns in Arrow formats and as {name}_values and {name}_offsets arrays in npz.
+
+    :param results: fitting results
+    :param file: output file
+    """
+    file = Path(file)
+    if file.suffix not in RESULTS_EXTENSIONS:
+        raise FileException(f'Not supported extension: {file.suffix}')
+
+    columns, list_columns = get_results_columns(results)
+
+    if file.suffix == '.npz':
+        arrays = dict(columns)
+        for name, (values, offsets) in list_columns.items():
+            arrays[f'{name}_values'], arrays[f'{name}_offsets'] = values, offsets
+
+        np.savez(file, **arrays)
+        return
+
+    pyarrow = import_pyarrow()
+    arrays = {name: pyarrow.array(values) for name, values in columns.items()}
+    for name, (values, offsets) in list_columns.items():
+        arrays[name] = pyarrow.LargeListArray.from_arrays(pyarrow.array(offsets), pyarrow.array(values))
+
+    table = pyarrow.table(arrays)
+    if file.suffix == '.parquet':
+        pyarrow.parquet.write_table(table, file)
+    else:
+        pyarrow.feather.write_feather(table, file)
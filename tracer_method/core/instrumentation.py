@@ -0,0 +1,147 @@
+import json
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+
+class StageTimer:
+    """ Context manager which adds time spent inside it to the stage timer. """
+
+    __slots__ = ('instrumentation', 'stage', 'start')
+
+    def __init__(self, instrumentation: 'Instrumentation', stage: str):
+        self.instrumentation = instrumentation
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.instrumentation.add_time(self.stage, time.perf_counter() - self.start)
+
+
+class NullTimer:
+    """ Context manager which does nothing (timer of disabled instrumentation). """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+NULL_TIMER = NullTimer()
+
+
+class Instrumentation:
+    """ Counters and timers (in seconds) of fitting pipeline stages eg. input preparation, response function
+    evaluation, convolution, interpolation, optimizer and pool startup. Instrumentation of each model fit is
+    created with create_child, its data is attached to the fitting result and reported back to the parent, which
+    sums it and calls hooks (eg. to forward data to metrics system). Hooks are called only in the calling process,
+    so they do not need to be picklable. """
+
+    enabled = True
+
+    def __init__(self, hooks: List[Callable[[Dict], None]] = None, labels: Dict = None):
+        self.hooks = list(hooks or [])
+        self.labels = dict(labels or {})
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.timers: Dict[str, float] = defaultdict(float)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['hooks'] = []
+
+        return state
+
+    def add_hook(self, hook: Callable[[Dict], None]):
+        """
+        Add function called with data of each reported model fit.
+
+        :param hook: function which gets dictionary with labels, counters and timers
+        """
+        self.hooks.append(hook)
+
+    def count(self, name: str, value: int = 1):
+        """ Increase counter by value. """
+        self.counters[name] += value
+
+    def add_time(self, stage: str, seconds: float):
+        """ Add time to the stage timer. """
+        self.timers[stage] += seconds
+
+    def timer(self, stage: str) -> StageTimer:
+        """
+        Get context manager which measures time of the stage.
+
+        :param stage: name of the stage
+        :return: timer context manager
+        """
+        return StageTimer(self, stage)
+
+    def create_child(self, **labels) -> 'Instrumentation':
+        """
+        Create instrumentation of one part of the pipeline (eg. one model fit) without hooks.
+
+        :param labels: labels of the part (eg. model type)
+        :return: new instrumentation with labels of the parent and given labels
+        """
+        return Instrumentation(labels={**self.labels, **labels})
+
+    def report(self, data: Optional[Dict]):
+        """
+        Add counters and timers of a child (eg. attached to fitting result) and call hooks with its data.
+
+        :param data: dictionary with labels, counters and timers of the child
+        """
+        if data is None:
+            return
+
+        for name, value in data['counters'].items():
+            self.count(name, value)
+
+        for stage, seconds in data['timers'].items():
+            self.add_time(stage, seconds)
+
+        for hook in self.hooks:
+            hook(data)
+
+    def to_dict(self) -> Dict:
+        """ Get labels, counters and timers as dictionary. """
+        return {'labels': dict(self.labels), 'counters': dict(self.counters), 'timers': dict(self.timers)}
+
+    def to_json(self, **kwargs) -> str:
+        """ Get labels, counters and timers as JSON string (keyword arguments are passed to json.dumps). """
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+class NullInstrumentation(Instrumentation):
+    """ Disabled instrumentation - all operations do nothing, so it can be used in the hot paths at almost no
+    cost. """
+
+    enabled = False
+
+    def count(self, name: str, value: int = 1):
+        pass
+
+    def add_time(self, stage: str, seconds: float):
+        pass
+
+    def timer(self, stage: str) -> NullTimer:
+        return NULL_TIMER
+
+    def create_child(self, **labels) -> 'NullInstrumentation':
+        return self
+
+    def report(self, data: Optional[Dict]):
+        pass
+
+    def to_dict(self) -> Optional[Dict]:
+        return None
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
@@ -0,0 +1,106 @@
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+from tracer_method.core.exceptions import FileException
+
+# number of rows read at once from csv and parquet files (and returned at once for other formats)
+CHUNK_SIZE = 100_000
+
+TEXT_EXTENSIONS = ['.csv']
+EXCEL_EXTENSIONS = ['.xlsx', '.xls']
+BINARY_EXTENSIONS = ['.parquet', '.feather', '.arrow', '.npz', '.npy']
+
+
+def import_pyarrow():
+    """ Import pyarrow which is an optional dependency used to read parquet and feather files. """
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError:
+        raise FileException('Reading parquet and feather files requires pyarrow package')
+
+    return pyarrow
+
+
+def iterate_columns(file: Path, names: List[str], dtypes: Dict[str, str],
+                    chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Read first columns of file in chunks of rows. Columns are selected by position (first column of file gets
+    the first name) and csv columns are parsed with explicit dtypes. Binary files are memory-mapped where format
+    allows it (feather, arrow and npy files), so only read chunks are loaded.
+
+    :param file: csv, excel, parquet, feather, arrow, npz or npy (structured array) file
+    :param names: names of columns
+    :param dtypes: dtypes of csv columns
+    :param chunk_size: number of rows in one chunk
+    :return: iterator over chunks - dictionaries with column name and array
+    """
+    if file.suffix in TEXT_EXTENSIONS:
+        if len(pd.read_csv(file, nrows=0).columns) < len(names):
+            raise FileException('Missing data')
+
+        for chunk in pd.read_csv(file, usecols=range(len(names)), header=0, names=names, dtype=dtypes,
+                                 chunksize=chunk_size):
+            yield {name: chunk[name].to_numpy() for name in names}
+
+    elif file.suffix in EXCEL_EXTENSIONS:
+        data = pd.read_excel(file, header=0)
+        if len(data.columns) < len(names):
+            raise FileException('Missing data')
+
+        yield {name: data[column].to_numpy() for name, column in zip(names, data.columns)}
+
+    elif file.suffix in ['.parquet', '.feather', '.arrow']:
+        pyarrow = import_pyarrow()
+
+        if file.suffix == '.parquet':
+            parquet_file = pyarrow.parquet.ParquetFile(file, memory_map=True)
+            columns = parquet_file.schema_arrow.names
+            batches = parquet_file.iter_batches(batch_size=chunk_size, columns=columns[:len(names)])
+        else:
+            table = pyarrow.feather.read_table(file, memory_map=True)
+            columns = table.column_names
+            batches = table.to_batches(max_chunksize=chunk_size)
+
+        if len(columns) < len(names):
+            raise FileException('Missing data')
+
+        for batch in batches:
+            yield {name: batch.column(i).to_numpy(zero_copy_only=False) for i, name in enumerate(names)}
+
+    elif file.suffix in ['.npz', '.npy']:
+        if file.suffix == '.npz':
+            with np.load(file) as data:
+                columns = [data[key] for key in data.files[:len(names)]]
+        else:
+            data = np.load(file, mmap_mode='r')
+            if data.dtype.names is None:
+                raise FileException('Invalid data')
+            columns = [data[key] for key in data.dtype.names]
+
+        if len(columns) < len(names):
+            raise FileException('Missing data')
+
+        for i in range(0, len(columns[0]), chunk_size):
+            yield {name: np.asarray(column[i:i + chunk_size]) for name, column in zip(names, columns)}
+
+    else:
+        raise FileException(f'Not supported extension: {file.suffix}')
+
+
+def to_dates(values: np.ndarray, unit: str) -> np.ndarray:
+    """
+    Convert column to dates (strings are parsed, datetime columns are only cast to unit).
+
+    :param values: column with dates
+    :param unit: unit of dates eg. 'D' or 'M'
+    :return: array with dates
+    """
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype(f'datetime64[{unit}]')
+
+    return pd.to_datetime(values).to_numpy(dtype=f'datetime64[{unit}]')
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple, Union
+
+import numpy as np
+
+from tracer_method.core.read_data.read_input_file import read_tritium_file
+from tracer_method.core.read_data.read_observations_file import read_observations
+
+# version of readers output - it is a part of cache key, so it must be increased when readers change their output
+READER_VERSION = 1
+DEFAULT_MAX_SIZE = 256 * 1024 ** 2
+HASH_BLOCK_SIZE = 1024 ** 2
+
+
+def get_file_hash(file: Path) -> str:
+    """ Get hash of file content (file is read in blocks). """
+    file_hash = hashlib.sha1()
+
+    with open(file, 'rb') as opened_file:
+        for block in iter(lambda: opened_file.read(HASH_BLOCK_SIZE), b''):
+            file_hash.update(block)
+
+    return file_hash.hexdigest()
+
+
+class ParsedFileCache:
+    """ On-disk cache of validated arrays read from input and observations files. Arrays are stored in npz files
+    keyed on hash of file content, reader and its options and version of readers, so changed files are read again.
+    The least recently used entries are removed when size of the cache exceeds maximum size. Numbers of hits,
+    misses and evictions are counted. Cache can be used by many threads and processes at once (entry removed by
+    another writer is a miss). """
+
+    def __init__(self, directory: Path, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def statistics(self) -> Dict[str, int]:
+        """ Numbers of hits, misses and evictions, number of cached files and their size in bytes. """
+        entries = self.__get_entries()
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(entries),
+            'size': sum(i[1].st_size for i in entries),
+        }
+
+    def __get_entries(self) -> List[Tuple[Path, os.stat_result]]:
+        """ Get cached files with their status (files removed by another writer in the meantime are skipped). """
+        entries = []
+        for entry in self.directory.glob('*.npz'):
+            try:
+                entries.append((entry, entry.stat()))
+            except FileNotFoundError:
+                continue
+
+        return entries
+
+    def read_tritium_file(self, input_file: Path) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Read file with input data or get its arrays from the cache.
+
+        :param input_file: file with input data
+        :return: arrays with dates(year-month), tritium concentration and precipitation
+        """
+        return self.read(read_tritium_file, input_file)
+
+    def read_observations(self, obs_file: Path, legacy_rounding: bool = False) -> np.ndarray:
+        """
+        Read file with observations data or get its array from the cache.
+
+        :param obs_file: file with observations
+        :param legacy_rounding: True if dates should be converted to years as in previous versions
+        :return: array with observations data (dates and h3 concentration)
+        """
+        return self.read(read_observations, obs_file, legacy_rounding=legacy_rounding)
+
+    def read(self, reader: Callable, file: Path, **options) -> Union[np.ndarray, Tuple[np.ndarray, ...]]:
+        """
+        Get arrays read from file by reader from the cache or read file and save its arrays in the cache (files
+        which cannot be read are not cached).
+
+        :param reader: function which reads file
+        :param file: file to read
+        :param options: keyword arguments of the reader
+        :return: arrays returned by the reader
+        """
+        key = hashlib.sha1(f'{get_file_hash(file)}-{file.suffix}-{reader.__name__}-{sorted(options.items())}-'
+                           f'{READER_VERSION}'.encode()).hexdigest()
+        path = self.directory / f'{key}.npz'
+
+        try:
+            os.utime(path)
+            with np.load(path) as data:
+                arrays = tuple(data[f'array_{i}'] for i in range(len(data.files) - 1))
+                is_tuple = bool(data['is_tuple'])
+        except FileNotFoundError:
+            pass
+        else:
+            self.hits += 1
+
+            return arrays if is_tuple else arrays[0]
+
+        self.misses += 1
+        result = reader(file, **options)
+        arrays = result if isinstance(result, tuple) else (result, )
+
+        temporary_path = path.with_suffix(f'.{os.getpid()}-{uuid.uuid4().hex}.tmp')
+        with open(temporary_path, 'wb') as cache_file:
+            np.savez(cache_file, is_tuple=isinstance(result, tuple), **{f'array_{i}': j for i, j in enumerate(arrays)})
+        os.replace(temporary_path, path)
+
+        self.evict()
+
+        return result
+
+    def evict(self):
+        """ Remove the least recently used entries until size of the cache does not exceed maximum size. """
+        entries = sorted(self.__get_entries(), key=lambda i: i[1].st_mtime)
+        size = sum(i[1].st_size for i in entries)
+
+        for entry, status in entries:
+            if size <= self.max_size:
+                break
+
+            size -= status.st_size
+            entry.unlink(missing_ok=True)
+            self.evictions += 1
+
+    def clear(self):
+        """ Remove all entries of the cache. """
+        for entry in self.directory.glob('*.npz'):
+            entry.unlink(missing_ok=True)
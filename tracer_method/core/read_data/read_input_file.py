@@ -2,39 +2,42 @@ from pathlib import Path
 from typing import Tuple
 
 import numpy as np
-import pandas as pd
 
 from tracer_method.core.exceptions import FileException
+from tracer_method.core.read_data.columns_reader import CHUNK_SIZE, iterate_columns, to_dates
 
+INPUT_COLUMNS = ['Date', 'Concentration', 'Precipitation']
+INPUT_DTYPES = {'Date': str, 'Concentration': 'float64', 'Precipitation': 'float64'}
 
-def read_tritium_file(input_file: Path) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+
+def read_tritium_file(input_file: Path, chunk_size: int = CHUNK_SIZE) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Read file with input data.
+    Read file with input data (csv, excel or binary columnar file - parquet, feather, npz or npy). Csv file is read
+    in chunks and each chunk is validated once it is converted.
 
     :param input_file: file with input data
+    :param chunk_size: number of rows read at once
     :return: arrays with dates(year-month), tritium concentration and precipitation
     """
-    if input_file.suffix == '.csv':
-        data = pd.read_csv(input_file, usecols=[0, 2], header=0, names=['Date', 'Concentration', 'Precipitation'])
-    elif input_file.suffix in ['.xlsx', '.xls']:
-        data = pd.read_excel(input_file, usecols='A,B,C', header=0, names=['Date', 'Concentration', 'Precipitation'])
-    else:
-        raise FileException(f'Not supported extension: {input_file.suffix}')
+    dates, h3_concentration, precipitation = [], [], []
 
     try:
-        dates = pd.to_datetime(data['Date']).to_numpy(dtype='datetime64[M]')
-        h3_concentration = data['Concentration'].to_numpy(dtype='float')
-        precipitation = data['Precipitation'].to_numpy(dtype='float')
-    except ValueError:
+        for chunk in iterate_columns(input_file, INPUT_COLUMNS, INPUT_DTYPES, chunk_size):
+            dates.append(to_dates(chunk['Date'], 'M'))
+            h3_concentration.append(np.asarray(chunk['Concentration'], dtype='float'))
+            precipitation.append(np.asarray(chunk['Precipitation'], dtype='float'))
+
+            if np.isnat(dates[-1]).any() or np.isnan(h3_concentration[-1]).any() or np.isnan(precipitation[-1]).any():
+                raise FileException('Invalid data')
+    except (ValueError, TypeError):
         raise FileException('Invalid data')
 
-    except KeyError:
+    if not dates:
         raise FileException('Missing data')
 
-    if data[data.columns[0:3]].isnull().sum().sum():
-        raise FileException('Invalid data')
+    dates = np.concatenate(dates)
 
     if not np.all(np.diff(dates) == np.timedelta64('1', 'M')) or dates.size % 12:
         raise FileException('Missing data for every month. Make sure that your file has header.')
 
-    return dates, h3_concentration, precipitation
+    return dates, np.concatenate(h3_concentration), np.concatenate(precipitation)
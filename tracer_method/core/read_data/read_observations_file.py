@@ -1,53 +1,143 @@
 from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
 
 import numpy as np
-import pandas as pd
 
 from tracer_method.core.exceptions import FileException
+from tracer_method.core.read_data.columns_reader import CHUNK_SIZE, iterate_columns, to_dates
 
+OBSERVATIONS_COLUMNS = ['Date', 'Concentration']
+SITES_OBSERVATIONS_COLUMNS = ['Site', 'Date', 'Concentration']
+OBSERVATIONS_DTYPES = {'Site': str, 'Date': str, 'Concentration': 'float64'}
 
-def read_observations(obs_file: Path) -> np.ndarray:
-    """
-    Read csv file with observations data.
 
-    :param obs_file: csv file with observations
-    :return: array with observations data (dates and h3 concentration)
+def iterate_observations_chunks(obs_file: Path, names: List[str], legacy_rounding: bool, chunk_size: int) \
+        -> Iterator[Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]]:
     """
-    if obs_file.suffix == '.csv':
-        data = pd.read_csv(obs_file, usecols=[0, 1], header=0, names=['Date', 'Concentration'])
-    elif obs_file.suffix in ['.xlsx', '.xls']:
-        data = pd.read_excel(obs_file, usecols='A,B', header=0, names=['Date', 'Concentration'])
-    else:
-        raise FileException(f'Not supported extension: {obs_file.suffix}')
+    Read observations file in chunks, convert and validate each chunk.
 
+    :return: iterator over chunks - read columns, dates converted to years and h3 concentration
+    """
     try:
-        dates = pd.to_datetime(data['Date']).to_numpy(dtype='datetime64[D]')
-        h3_concentration = data['Concentration'].to_numpy(dtype='float')
-    except ValueError:
+        for chunk in iterate_columns(obs_file, names, OBSERVATIONS_DTYPES, chunk_size):
+            dates = to_dates(chunk['Date'], 'D')
+            h3_concentration = np.asarray(chunk['Concentration'], dtype='float')
+
+            if np.isnat(dates).any() or np.isnan(h3_concentration).any():
+                raise FileException('Missing data')
+
+            yield chunk, convert_date_to_year(dates, legacy_rounding), h3_concentration
+    except (ValueError, TypeError):
         raise FileException('Invalid data')
-    except KeyError:
-        raise FileException('Missing data')
 
-    if data.isnull().sum().sum():
+
+def read_observations(obs_file: Path, legacy_rounding: bool = False, chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    """
+    Read file with observations data (csv, excel or binary columnar file - parquet, feather, npz or npy).
+
+    :param obs_file: file with observations
+    :param legacy_rounding: True if dates should be converted to years as in previous versions (see
+    convert_date_to_year)
+    :param chunk_size: number of rows read at once
+    :return: array with observations data (dates and h3 concentration)
+    """
+    chunks = [(dates, h3_concentration) for _, dates, h3_concentration in
+              iterate_observations_chunks(obs_file, OBSERVATIONS_COLUMNS, legacy_rounding, chunk_size)]
+
+    if not chunks:
         raise FileException('Missing data')
 
-    return np.array([convert_date_to_year(dates), h3_concentration])
+    return np.array([np.concatenate([i[0] for i in chunks]), np.concatenate([i[1] for i in chunks])])
 
 
-def convert_date_to_year(dates: np.ndarray):
+def read_sites_observations(obs_file: Path, legacy_rounding: bool = False,
+                            chunk_size: int = CHUNK_SIZE) -> Dict[str, np.ndarray]:
     """
-    Convert dates eg. ['1974-05-30' '1975-10-23' '1976-04-22'] to year and part of year eg. [1974.41, 1975.81, 1976.31].
+    Read long-format file with observations of many sites (columns: site id, date and h3 concentration) and split
+    it by site. File is read in chunks, only converted observations of each site are kept.
 
-    :param dates: array with dates in format '%Y-%m-%d'
-    :return: array with coverted dates into years and part of it eg. 1974-05-30 -> 1974 + 151/365 (30th May is 151st
-    day pf year) = 1974.41
+    :param obs_file: file with observations of many sites
+    :param legacy_rounding: True if dates should be converted to years as in previous versions
+    :param chunk_size: number of rows read at once
+    :return: observations data (dates and h3 concentration) for each site id in order of first appearance
+    """
+    sites_chunks: Dict[str, list] = {}
+
+    for chunk, dates, h3_concentration in iterate_observations_chunks(obs_file, SITES_OBSERVATIONS_COLUMNS,
+                                                                       legacy_rounding, chunk_size):
+        sites = chunk['Site'].astype(str)
+        unique_sites, first_index, inverse = np.unique(sites, return_index=True, return_inverse=True)
+
+        # rows of each site are gathered with one stable sort instead of a mask for each site
+        order = np.argsort(inverse.ravel(), kind='stable')
+        site_rows = np.split(order, np.cumsum(np.bincount(inverse.ravel()))[:-1])
+
+        for site_index in np.argsort(first_index):
+            rows = site_rows[site_index]
+            sites_chunks.setdefault(str(unique_sites[site_index]), []).append((dates[rows], h3_concentration[rows]))
+
+    return {site: np.array([np.concatenate([i[0] for i in chunks]), np.concatenate([i[1] for i in chunks])])
+            for site, chunks in sites_chunks.items()}
+
+
+def iterate_sites_observations(obs_file: Path, legacy_rounding: bool = False,
+                               chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, np.ndarray]]:
+    """
+    Read long-format file with observations of many sites in which rows of each site are next to each other and
+    yield observations of each site as soon as they are read (only observations of one site are kept in memory).
+
+    :param obs_file: file with observations of many sites grouped by site
+    :param legacy_rounding: True if dates should be converted to years as in previous versions
+    :param chunk_size: number of rows read at once
+    :return: iterator over site id and its observations data (dates and h3 concentration)
     """
-    years = dates.astype(dtype="datetime64[Y]")
+    completed_sites = set()
+    current_site, current_chunks = None, []
+
+    for chunk, dates, h3_concentration in iterate_observations_chunks(obs_file, SITES_OBSERVATIONS_COLUMNS,
+                                                                       legacy_rounding, chunk_size):
+        sites = chunk['Site'].astype(str)
+        boundaries = np.flatnonzero(sites[1:] != sites[:-1]) + 1
+
+        for start, end in zip(np.concatenate([[0], boundaries]), np.concatenate([boundaries, [len(sites)]])):
+            site = str(sites[start])
+
+            if site != current_site:
+                if current_site is not None:
+                    completed_sites.add(current_site)
+                    yield current_site, np.concatenate(current_chunks, axis=1)
+
+                if site in completed_sites:
+                    raise FileException(f'Observations of site {site} are not grouped')
 
-    days = dates - np.array([np.datetime64(f'{year}-01-01') for year in years])
-    days = days / np.timedelta64(1, 'D') + 1
+                current_site, current_chunks = site, []
+
+            current_chunks.append(np.array([dates[start:end], h3_concentration[start:end]]))
+
+    if current_site is not None:
+        yield current_site, np.concatenate(current_chunks, axis=1)
+
+
+def convert_date_to_year(dates: np.ndarray, legacy_rounding: bool = False) -> np.ndarray:
+    """
+    Convert dates eg. ['1974-05-30' '1975-10-23' '1976-04-22'] to year and part of year eg. [1974.408, 1975.808,
+    1976.306] ([1974.41, 1975.81, 1976.31] with legacy_rounding=True). Conversion is vectorized and uses real length
+    of each year (366 days for leap years).
+
+    :param dates: array with dates in format '%Y-%m-%d'
+    :param legacy_rounding: True if dates should be converted as in previous versions - number of the day of year
+    divided by 365 and rounded to 2 decimal places, eg. 1974-05-30 -> 1974 + 150/365 = 1974.41
+    :return: array with converted dates into years and part of it eg. 1974-05-30 -> 1974 + 149/365 (29 days of year
+    passed before 30th May)
+    """
+    dates = dates.astype('datetime64[D]')
+    years = dates.astype('datetime64[Y]')
+    year_start = years.astype('datetime64[D]')
+    days = (dates - year_start).astype(float)
 
-    year_part = days / 365
+    if legacy_rounding:
+        return np.round(years.astype(float) + 1970 + (days + 1) / 365, 2)
 
-    return np.round(years.astype(str).astype(float) + year_part, 2)
+    year_length = ((years + 1).astype('datetime64[D]') - year_start).astype(float)
 
+    return years.astype(float) + 1970 + days / year_length
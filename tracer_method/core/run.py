@@ -1,29 +1,84 @@
-import multiprocessing
 from functools import partial
-from typing import Callable
+from typing import Callable, Tuple, Union
 
 import numpy as np
 
+from tracer_method.core.config.accuracy_config import AccuracyConfig
 from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.curve_fitter.prediction_table import PredictionTable
 from tracer_method.core.fitting_result import FittingResult
+from tracer_method.core.instrumentation import Instrumentation, NULL_INSTRUMENTATION
+from tracer_method.core.session import FittingSession, LocalArray, SharedArray
+from tracer_method.core.uncertainty import draw_bootstrap_observations, draw_uniform_observations, get_linearized_std
 
 
-def get_params_accuracy(params, input, obs, start_year, config, decay, fitting_method):
+def get_params_accuracy(params, input, obs, start_year, config, decay, fitting_method, session=None,
+                        accuracy_config=None, prepared_input=False, prediction_table=None, instrumentation=None):
     """
-    Calculate measurement uncertainties of calculated parameters as standard deviations based on multiple
-    observations data set which are randomly obtained within one sigma.
+    Calculate measurement uncertainties of calculated parameters with method of accuracy configuration (Monte-Carlo
+    by default). Refits are run in worker processes of the session.
 
-    :return: params accuracy (standard deviations)
+    :return: params accuracy (confidence level, confidence interval and numbers of iterations and function
+    evaluations of each refit)
     """
-    std = np.std(obs[1])
-    obs_sets = [np.array([obs[0], np.array([np.random.uniform(i - std, i + std) for i in obs[1]])])
-                for i in range(100)]
+    accuracy_config = accuracy_config or AccuracyConfig()
+    instrumentation = instrumentation or NULL_INSTRUMENTATION
+    fitter = fitting_method(input, obs, start_year, config, decay, prepared_input=prepared_input)
 
-    with multiprocessing.Pool(multiprocessing.cpu_count()) as pool:
-        results = pool.map(partial(run_method, input=input, start_year=start_year, config=config,
-                                   decay=decay, fitting_method=fitting_method), obs_sets)
+    if accuracy_config.method == 'linearized':
+        std = get_linearized_std(fitter.jacobian(params), fitter.residuals(params))
+        return (*get_linearized_interval_confidence(np.round(params, 2), std), np.empty((0, 2), dtype=int))
 
-    return get_params_interval_confidence(np.round(params, 2), np.round(results, 4))
+    if session is None:
+        with FittingSession() as temporary_session:
+            return get_params_accuracy(params, input, obs, start_year, config, decay, fitting_method,
+                                       temporary_session, accuracy_config, prepared_input, prediction_table,
+                                       instrumentation)
+
+    random = np.random.default_rng(accuracy_config.seed)
+    if accuracy_config.method == 'bootstrap':
+        obs_values = draw_bootstrap_observations(obs, fitter.residuals(params) + obs[1], session.n_samples, random)
+    else:
+        obs_values = draw_uniform_observations(obs, session.n_samples, random)
+
+    obs_sets = [np.array([obs[0], i]) for i in obs_values]
+
+    if session.n_workers and not session.started:
+        with instrumentation.timer('pool_startup'):
+            session.start()
+
+    shared_input = session.share(input)
+    try:
+        with instrumentation.timer('refits'):
+            results = session.map(partial(run_shared_method, input=shared_input, start_year=start_year,
+                                          config=config, decay=decay, fitting_method=fitting_method,
+                                          initial_values=params if accuracy_config.warm_start else None,
+                                          prepared_input=prepared_input, tolerances=accuracy_config.tolerances,
+                                          prediction_table=prediction_table), obs_sets)
+    finally:
+        session.release(shared_input)
+
+    results_params = np.array([i[0] for i in results])
+    evaluations = np.array([i[1:] for i in results], dtype=int)
+
+    instrumentation.count('refits', len(results))
+    instrumentation.count('refits_objective_evaluations', int(evaluations[:, 1].sum()))
+
+    return (*get_params_interval_confidence(np.round(params, 2), np.round(results_params, 4)), evaluations)
+
+
+def get_linearized_interval_confidence(params: np.ndarray, std: np.ndarray):
+    """
+    Get params confidence level and confidence interval based on standard deviations of linearized model.
+
+    :param params: obtained parameters
+    :param std: standard deviations of parameters
+    :return: calculated confidence level and confidence interval
+    """
+    confidence_level = [0.95 for _ in params]
+    confidence_interval = [(params[i] - std[i] * 1.96, params[i] + std[i] * 1.96) for i in range(0, len(params))]
+
+    return confidence_level, confidence_interval
 
 
 def get_params_interval_confidence(params: np.ndarray, results: np.ndarray):
@@ -57,8 +112,30 @@ def run_method(obs, input, start_year, config, decay, fitting_method) -> np.ndar
     return solution.x
 
 
+def run_refit(obs, input, start_year, config, decay, fitting_method, initial_values=None, prepared_input=False,
+              tolerances=None, prediction_table=None) -> Tuple[np.ndarray, int, int]:
+    """ Run fitting method from initial values and return the best model parameters, number of iterations and
+    number of function evaluations. """
+    solution = fitting_method(input, obs, start_year, config, decay, prepared_input=prepared_input,
+                              tolerances=tolerances, prediction_table=prediction_table).run_algorithm(initial_values)
+
+    return solution.x, solution.get('nit', solution.get('njev', 0)), solution.nfev
+
+
+def run_shared_method(obs, input: Union[SharedArray, LocalArray], start_year, config, decay, fitting_method,
+                      initial_values=None, prepared_input=False, tolerances=None, prediction_table=None) \
+        -> Tuple[np.ndarray, int, int]:
+    """ Run fitting method for input placed in shared memory and return the best model parameters, number of
+    iterations and number of function evaluations. """
+    return run_refit(obs, input.get(), start_year, config, decay, fitting_method, initial_values, prepared_input,
+                     tolerances, prediction_table)
+
+
 def run(input: np.ndarray, obs: np.ndarray, start_year: int, config: ConfigModel, decay: float,
-        fitting_method: Callable, calculate_params_accuracy: bool) -> FittingResult:
+        fitting_method: Callable, calculate_params_accuracy: bool, session: FittingSession = None,
+        accuracy_config: AccuracyConfig = None, prediction_table: PredictionTable = None,
+        instrumentation: Instrumentation = None, initial_values: np.ndarray = None,
+        optimizer: str = None) -> FittingResult:
     """
     Run whole simulation and get all fitting data, calculate parameters accuracy
 
@@ -70,14 +147,32 @@ def run(input: np.ndarray, obs: np.ndarray, start_year: int, config: ConfigModel
     :param decay: decay constant
     :param fitting_method: fitting method (different type for PFM)
     :param calculate_params_accuracy: True if accuracy of params should be included, False otherwise
+    :param session: session with worker processes used to calculate params accuracy (optional)
+    :param accuracy_config: configuration of params accuracy calculation (Monte-Carlo method by default)
+    :param prediction_table: table with precomputed predictions used to find start points of minimizations
+    :param instrumentation: counters and timers of fitting stages attached to the result (disabled by default)
+    :param initial_values: start point of the minimization (optional)
+    :param optimizer: optimizer of the fit and refits of params accuracy (default optimizer of fitting method if not
+    provided)
     :return: Fit Data which includes observations, model type, calculated parameters, beta value and final output
 
     """
-    base_fitter = fitting_method(input, obs, start_year, config, decay)
+    instrumentation = instrumentation or NULL_INSTRUMENTATION
+    if optimizer is not None:
+        fitting_method = partial(fitting_method, optimizer=optimizer)
 
-    solution = base_fitter.run_algorithm()
+    base_fitter = fitting_method(input, obs, start_year, config, decay, prediction_table=prediction_table,
+                                 instrumentation=instrumentation)
+
+    # local minimizations of global search are run in worker processes of the session
+    use_executor = session is not None and session.n_workers and config.search == 'global'
+    with instrumentation.timer('optimizer'):
+        solution = base_fitter.run_algorithm(initial_values, session.executor if use_executor else None)
     params = solution.x
 
+    instrumentation.count('objective_evaluations', int(solution.nfev))
+    instrumentation.count('optimizer_iterations', int(solution.get('nit', solution.get('njev', 0))))
+
     if calculate_params_accuracy:
         if params.size == 2:
             params_range = tuple([(i - 0.1 * i, i + 0.1 * i) for i in params])
@@ -86,7 +181,15 @@ def run(input: np.ndarray, obs: np.ndarray, start_year: int, config: ConfigModel
 
         new_config = ConfigModel([config.type, params_range, config.beta])
 
-        params_accuracy = get_params_accuracy(params, input, obs, start_year, new_config, decay, fitting_method)
-        return base_fitter.get_data_solution(solution, params_accuracy)
+        # refits reuse input already scaled by (1 - beta) in the base fitter
+        with instrumentation.timer('params_accuracy'):
+            params_accuracy = get_params_accuracy(params, base_fitter.input, obs, start_year, new_config, decay,
+                                                  fitting_method, session, accuracy_config, prepared_input=True,
+                                                  prediction_table=prediction_table, instrumentation=instrumentation)
+        fitting_result = base_fitter.get_data_solution(solution, params_accuracy)
+    else:
+        fitting_result = base_fitter.get_data_solution(solution)
+
+    fitting_result.instrumentation = instrumentation.to_dict()
 
-    return base_fitter.get_data_solution(solution)
+    return fitting_result
@@ -0,0 +1,288 @@
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import as_completed, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+# shared memory blocks attached in the current process (name -> block and array)
+_attached_arrays: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+class SharedArray:
+    """ Description of numpy array placed in shared memory. It is cheap to pickle, so it can be sent to workers
+    instead of the array itself. """
+
+    def __init__(self, name: str, shape: Tuple[int, ...], dtype: str):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+    def get(self) -> np.ndarray:
+        """
+        Get array from shared memory, memory block is attached only once in each process (other blocks released by
+        the session are detached). Worker processes share resource tracker with the session process, so the block is
+        unlinked only once by the session.
+
+        :return: read-only array backed by shared memory
+        """
+        detach_released_arrays(keep=self.name)
+
+        if self.name not in _attached_arrays:
+            block = shared_memory.SharedMemory(name=self.name)
+            array = np.ndarray(self.shape, dtype=self.dtype, buffer=block.buf)
+            array.flags.writeable = False
+            _attached_arrays[self.name] = (block, array)
+
+        return _attached_arrays[self.name][1]
+
+
+def detach_released_arrays(keep: str = None):
+    """ Detach memory blocks which were released (unlinked) by the session from the current process (except block
+    with name keep). """
+    for name in [i for i in _attached_arrays if i != keep]:
+        try:
+            shared_memory.SharedMemory(name=name).close()
+        except FileNotFoundError:
+            block, _ = _attached_arrays.pop(name)
+            try:
+                block.close()
+            except BufferError:
+                # array is still used, memory is freed when the process exits
+                pass
+
+
+def get_result(future: Future, return_exceptions: bool = False) -> Any:
+    """ Get result of future (or its exception if return_exceptions is True). """
+    if return_exceptions and future.exception() is not None:
+        return future.exception()
+
+    return future.result()
+
+
+class LocalArray:
+    """ Array used directly by a session which runs tasks in the calling process (the same interface as
+    SharedArray). """
+
+    def __init__(self, array: np.ndarray):
+        self.array = array
+
+    def get(self) -> np.ndarray:
+        return self.array
+
+
+class FittingSession:
+    """ Holds a persistent pool of worker processes and arrays placed in shared memory, which can be reused across
+    many tritium_method calls. Number of Monte-Carlo samples, workers and tasks chunk size are configurable.
+    Session with 0 workers runs all tasks in the calling process (it is used inside worker processes, so parallel
+    tasks do not start nested pools). """
+
+    def __init__(self, n_workers: int = None, n_samples: int = 100, chunk_size: int = None):
+        self.n_workers = multiprocessing.cpu_count() if n_workers is None else n_workers
+        self.n_samples = n_samples
+        self.chunk_size = chunk_size
+        self.__executor = None
+        # pool and shared blocks can be created by many threads (models fitted in thread mode)
+        self.__lock = threading.Lock()
+        # key of array content -> memory block, description of shared array and number of its users
+        self.__shared_blocks: Dict[str, Tuple[shared_memory.SharedMemory, SharedArray, int]] = {}
+
+    def __getstate__(self):
+        # session is sent to workers without its lock (it is created again in __setstate__)
+        state = self.__dict__.copy()
+        del state['_FittingSession__lock']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """ Pool of worker processes, started on first use. """
+        with self.__lock:
+            if self.__executor is None:
+                # workers must share resource tracker of the session process, otherwise trackers of workers remove
+                # shared memory blocks when workers exit
+                resource_tracker.ensure_running()
+                self.__executor = ProcessPoolExecutor(self.n_workers)
+
+            return self.__executor
+
+    @property
+    def started(self) -> bool:
+        """ True if pool of worker processes was started, False otherwise. """
+        return self.__executor is not None
+
+    def start(self):
+        """ Start pool of worker processes and wait until a worker runs a task (otherwise pool is started on first
+        use). """
+        if self.n_workers:
+            self.executor.submit(int).result()
+
+    def get_chunk_size(self, n_tasks: int) -> int:
+        """
+        Get number of tasks sent to a worker at once (about four chunks per worker if chunk size was not set).
+
+        :param n_tasks: number of all tasks
+        :return: chunk size
+        """
+        if self.chunk_size:
+            return self.chunk_size
+
+        return max(1, -(-n_tasks // (4 * max(self.n_workers, 1))))
+
+    def in_worker(self) -> 'FittingSession':
+        """
+        Get session which can be sent to worker processes - it runs tasks in the worker process with the same number
+        of samples.
+
+        :return: session without worker processes
+        """
+        return FittingSession(0, self.n_samples, self.chunk_size)
+
+    def map(self, function: Callable, tasks: Iterable) -> List:
+        """
+        Run function for each task in worker processes.
+
+        :param function: function to run, it must be picklable
+        :param tasks: arguments of the function
+        :return: results in order of tasks
+        """
+        tasks = list(tasks)
+
+        if not self.n_workers:
+            return [function(i) for i in tasks]
+
+        return list(self.executor.map(function, tasks, chunksize=self.get_chunk_size(len(tasks))))
+
+    def iterate_parallel(self, function: Callable, tasks: Sequence[Tuple], mode: str = 'process',
+                         return_exceptions: bool = False) -> Iterator[Tuple[int, Any]]:
+        """
+        Run function for each task in worker processes or threads and yield results as they complete.
+
+        :param function: function to run (it must be picklable in process mode)
+        :param tasks: tuples with arguments of the function
+        :param mode: 'process' (worker processes of the session) or 'thread' (threads of the calling process)
+        :param return_exceptions: True if exceptions of tasks (e.g. BrokenProcessPool if a worker process crashed)
+        should be yielded as their results, False if they should be raised
+        :return: iterator over task indices and results in order of completion
+        """
+        if mode not in ('process', 'thread'):
+            raise ValueError('Parallel mode not found: process or thread')
+
+        if not self.n_workers:
+            for index, task in enumerate(tasks):
+                try:
+                    result = function(*task)
+                except Exception as error:
+                    if not return_exceptions:
+                        raise
+                    result = error
+                yield index, result
+            return
+
+        if mode == 'process':
+            futures = {self.executor.submit(function, *task): index for index, task in enumerate(tasks)}
+            yield from ((futures[i], get_result(i, return_exceptions)) for i in as_completed(futures))
+            return
+
+        with ThreadPoolExecutor(max(1, min(len(tasks), self.n_workers))) as executor:
+            futures = {executor.submit(function, *task): index for index, task in enumerate(tasks)}
+            yield from ((futures[i], get_result(i, return_exceptions)) for i in as_completed(futures))
+
+    def run_parallel(self, function: Callable, tasks: Sequence[Tuple], mode: str = 'process',
+                     callback: Callable = None) -> List:
+        """
+        Run function for each task in worker processes or threads.
+
+        :param function: function to run (it must be picklable in process mode)
+        :param tasks: tuples with arguments of the function
+        :param mode: 'process' (worker processes of the session) or 'thread' (threads of the calling process)
+        :param callback: function called with each result as soon as it is completed
+        :return: results in order of tasks
+        """
+        results = [None] * len(tasks)
+
+        for index, result in self.iterate_parallel(function, tasks, mode):
+            if callback is not None:
+                callback(result)
+            results[index] = result
+
+        return results
+
+    def share(self, array: np.ndarray) -> SharedArray:
+        """
+        Place array in shared memory. Arrays with the same content are placed only once while they are used, each
+        call must be followed by release when the array is not needed anymore.
+
+        :param array: array to share with workers
+        :return: description of shared array (or array itself if session has no workers)
+        """
+        if not self.n_workers:
+            return LocalArray(array)
+
+        array = np.ascontiguousarray(array)
+        key = hashlib.sha1(array.tobytes() + str((array.shape, array.dtype.str)).encode()).hexdigest()
+
+        with self.__lock:
+            if key not in self.__shared_blocks:
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+                self.__shared_blocks[key] = (block, SharedArray(block.name, array.shape, array.dtype.str), 0)
+
+            block, shared, users = self.__shared_blocks[key]
+            self.__shared_blocks[key] = (block, shared, users + 1)
+
+            return shared
+
+    def release(self, shared_array: Union[SharedArray, LocalArray]):
+        """
+        Release array shared with share, it is removed from shared memory when it is released by all its users
+        (worker processes detach it before they attach another array).
+
+        :param shared_array: description of shared array
+        """
+        if not isinstance(shared_array, SharedArray):
+            return
+
+        with self.__lock:
+            for key, (block, shared, users) in list(self.__shared_blocks.items()):
+                if shared.name == shared_array.name:
+                    if users > 1:
+                        self.__shared_blocks[key] = (block, shared, users - 1)
+                    else:
+                        del self.__shared_blocks[key]
+                        block.close()
+                        block.unlink()
+
+    def restart(self):
+        """ Shut down pool of worker processes (e.g. broken by a crashed worker), a new pool is started on next use.
+        Arrays placed in shared memory are kept. """
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        """ Shut down worker processes and remove all arrays from shared memory. """
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+            shared_blocks, self.__shared_blocks = self.__shared_blocks, {}
+
+        if executor is not None:
+            executor.shutdown()
+
+        for block, _, _ in shared_blocks.values():
+            block.close()
+            block.unlink()
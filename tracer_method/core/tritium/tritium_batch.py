@@ -0,0 +1,245 @@
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Iterator, List, Mapping, Tuple, Union
+
+import numpy as np
+
+import tracer_method.core.constans as const
+from tracer_method.core.config.accuracy_config import AccuracyConfig
+from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.curve_fitter.prediction_table import PredictionTable
+from tracer_method.core.fitting_result import FittingResult
+from tracer_method.core.session import FittingSession, LocalArray, SharedArray
+from tracer_method.core.tritium.tritium_input_preparer import TritiumInputPreparer
+from tracer_method.core.tritium.tritium_method import fit_model, get_fitting_method, uses_prediction_table
+
+
+class SiteResult:
+    """ Result of fitting one model configuration to observations of one site (fitting result or error message if
+    fitting failed). """
+
+    def __init__(self, site: Hashable, model_index: int, result: FittingResult = None, error: str = None):
+        self.site = site
+        self.model_index = model_index
+        self.result = result
+        self.error = error
+
+
+class BatchResults:
+    """ Columnar table with params, MSE and model efficiency for each site and model configuration. """
+
+    COLUMNS = ('site', 'model_index', 'model_type', 'params', 'mse', 'model_efficiency', 'error')
+
+    def __init__(self):
+        self.columns: Dict[str, list] = {name: [] for name in self.COLUMNS}
+
+    def __len__(self):
+        return len(self.columns['site'])
+
+    def append(self, site_result: SiteResult, model_type: str):
+        """
+        Add row with result of fitting one model configuration to one site.
+
+        :param site_result: result of fitting
+        :param model_type: model type of fitted configuration
+        """
+        result = site_result.result
+        row = {
+            'site': site_result.site,
+            'model_index': site_result.model_index,
+            'model_type': model_type,
+            'params': list(result.params) if result is not None else [],
+            'mse': result.mse if result is not None else np.nan,
+            'model_efficiency': result.model_efficiency if result is not None else np.nan,
+            'error': site_result.error,
+        }
+
+        for name in self.COLUMNS:
+            self.columns[name].append(row[name])
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Get columns as numpy arrays, params are stored in array of shape (number of rows, maximum number of params)
+        filled with NaN for models with fewer params and failed fits.
+
+        :return: dictionary with column name and array
+        """
+        arrays = {name: np.array(values) for name, values in self.columns.items() if name != 'params'}
+        arrays['mse'] = arrays['mse'].astype(float)
+        arrays['model_efficiency'] = arrays['model_efficiency'].astype(float)
+
+        params = np.full((len(self), max([len(i) for i in self.columns['params']], default=0)), np.nan)
+        for row, values in enumerate(self.columns['params']):
+            params[row, :len(values)] = values
+        arrays['params'] = params
+
+        return arrays
+
+
+def get_error_message(error: BaseException) -> str:
+    """ Get error message of failed fit stored in results. """
+    return f'{type(error).__name__}: {error}'
+
+
+def fit_site_model(input: Union[SharedArray, LocalArray], site: Hashable, obs: np.ndarray, start_year: int,
+                   decay: float, model_index: int, model_cfg: List[Union[str, float]], calculate_params_accuracy: bool,
+                   session: FittingSession, accuracy_config: AccuracyConfig,
+                   table_directory: Path = None) -> SiteResult:
+    """ Fit one model configuration to observations of one site for input placed in shared memory, failure is
+    returned as error message. """
+    try:
+        result = fit_model(input.get(), obs, start_year, decay, model_cfg, calculate_params_accuracy, session,
+                           accuracy_config, table_directory)
+    except Exception as error:
+        return SiteResult(site, model_index, error=get_error_message(error))
+
+    return SiteResult(site, model_index, result)
+
+
+def iterate_sites(input: Tuple[np.ndarray, np.ndarray, np.ndarray], observations: Mapping[Hashable, np.ndarray],
+                  alpha: float, model_configs: List[List[Union[str, float]]], calculate_params_accuracy=False,
+                  session: FittingSession = None, accuracy_config: AccuracyConfig = None,
+                  table_directory: Path = None) -> Iterator[SiteResult]:
+    """
+    Fit each model configuration to observations of each site which share the same input. Input is prepared once
+    and placed in shared memory, (site x model) fits are run in worker processes of the session and yielded as they
+    complete. Prediction tables are built once for each model configuration (if table directory is provided) and
+    shared by all sites. Failure of a fit (also crash of its worker process) is yielded as error of its site.
+
+    :param input: input data with dates and monthly h3 concentration and precipitation (data must be provided
+    for whole year)
+    :param observations: observations data with date and h3 concentration for each site id
+    :param alpha: infiltration rate (from 0.01 to 1)
+    :param model_configs: models configuration for which the output concentration should be calculated
+    :param calculate_params_accuracy: True if accuracy of params should be included, False otherwise
+    :param session: session with worker processes (a temporary session is created if it is not provided)
+    :param accuracy_config: configuration of params accuracy calculation - uncertainty method and seed
+    :param table_directory: directory with prediction tables (optional)
+    :return: iterator over results of fitting in order of completion
+    """
+    for model_cfg in model_configs:
+        get_fitting_method(ConfigModel(model_cfg).type)
+
+    dates, concentration, precipitation = input
+    start_year = int(str(min(dates.astype('datetime64[Y]'))))
+    input_data = TritiumInputPreparer(dates, concentration, precipitation, alpha).calculate_input()
+
+    decay = np.log(2) / const.DECAY_CONSTANTS['tritium']
+
+    if table_directory is not None:
+        for model_cfg in model_configs:
+            config = ConfigModel(model_cfg)
+            if uses_prediction_table(config.type):
+                PredictionTable.get_or_build(table_directory, input_data, start_year, config, decay,
+                                             get_fitting_method(config.type))
+
+    with nullcontext(session) if session is not None else FittingSession() as batch_session:
+        shared_input = batch_session.share(input_data)
+        try:
+            tasks = [(shared_input, site, obs, start_year, decay, model_index, model_cfg, calculate_params_accuracy,
+                      batch_session.in_worker(), accuracy_config, table_directory)
+                     for site, obs in observations.items() for model_index, model_cfg in enumerate(model_configs)]
+
+            broken = []
+            for index, site_result in batch_session.iterate_parallel(fit_site_model, tasks, return_exceptions=True):
+                if isinstance(site_result, BrokenProcessPool):
+                    broken.append(index)
+                else:
+                    yield get_site_result(tasks[index], site_result)
+
+            # crashed worker process breaks the whole pool, so unfinished fits are run again one by one in a new pool
+            # (crash is stored only as error of the site which caused it)
+            if broken:
+                batch_session.restart()
+
+            for index in broken:
+                _, site_result = next(batch_session.iterate_parallel(fit_site_model, [tasks[index]],
+                                                                     return_exceptions=True))
+                if isinstance(site_result, BrokenProcessPool):
+                    batch_session.restart()
+
+                yield get_site_result(tasks[index], site_result)
+        finally:
+            batch_session.release(shared_input)
+
+
+def get_site_result(task: Tuple, result: Union[SiteResult, BaseException]) -> SiteResult:
+    """ Get site result of finished task (exception raised outside of the fit is stored as error of the site). """
+    if isinstance(result, BaseException):
+        _, site, _, _, _, model_index, *_ = task
+        return SiteResult(site, model_index, error=get_error_message(result))
+
+    return result
+
+
+def tritium_method_batch(input: Tuple[np.ndarray, np.ndarray, np.ndarray],
+                         observations: Mapping[Hashable, np.ndarray], alpha: float,
+                         model_configs: List[List[Union[str, float]]], calculate_params_accuracy=False,
+                         session: FittingSession = None, accuracy_config: AccuracyConfig = None,
+                         callback: Callable[[SiteResult], None] = None, table_directory: Path = None) -> BatchResults:
+    """
+    Fit each model configuration to observations of many sites which share the same input. Failure of one fit does
+    not stop the batch, it is stored as error in the results table.
+
+    :param input: input data with dates and monthly h3 concentration and precipitation (data must be provided
+    for whole year)
+    :param observations: observations data with date and h3 concentration for each site id
+    :param alpha: infiltration rate (from 0.01 to 1)
+    :param model_configs: models configuration for which the output concentration should be calculated
+    :param calculate_params_accuracy: True if accuracy of params should be included, False otherwise
+    :param session: session with worker processes (a temporary session is created if it is not provided)
+    :param accuracy_config: configuration of params accuracy calculation - uncertainty method and seed
+    :param callback: function called with each site result as soon as it is calculated
+    :param table_directory: directory with prediction tables shared by all sites (optional)
+    :return: columnar table with results in order of completion
+    """
+    results = BatchResults()
+
+    for site_result in iterate_sites(input, observations, alpha, model_configs, calculate_params_accuracy, session,
+                                     accuracy_config, table_directory):
+        results.append(site_result, ConfigModel(model_configs[site_result.model_index]).type)
+
+        if callback is not None:
+            callback(site_result)
+
+    return results
+
+
+def tritium_method_alpha_sweep(input: Tuple[np.ndarray, np.ndarray, np.ndarray], obs: np.ndarray,
+                               alphas: np.ndarray, model_configs: List[List[Union[str, float]]],
+                               calculate_params_accuracy=False, session: FittingSession = None,
+                               accuracy_config: AccuracyConfig = None,
+                               callback: Callable[[FittingResult], None] = None) -> List[List[FittingResult]]:
+    """
+    Fit each model configuration to observations for many infiltration rates (alpha). Inputs for all alphas are
+    calculated in one pass and (alpha x model) fits are run in worker processes of the session.
+
+    :param input: input data with dates and monthly h3 concentration and precipitation (data must be provided
+    for whole year)
+    :param obs: observations data with date and h3 concentration
+    :param alphas: infiltration rates (from 0.01 to 1)
+    :param model_configs: models configuration for which the output concentration should be calculated
+    :param calculate_params_accuracy: True if accuracy of params should be included, False otherwise
+    :param session: session with worker processes (a temporary session is created if it is not provided)
+    :param accuracy_config: configuration of params accuracy calculation - uncertainty method and seed
+    :param callback: function called with each fitting result as soon as it is calculated
+    :return: fitting results for each alpha (in order of alphas) and each model (in order of model configurations)
+    """
+    for model_cfg in model_configs:
+        get_fitting_method(ConfigModel(model_cfg).type)
+
+    dates, concentration, precipitation = input
+    start_year = int(str(min(dates.astype('datetime64[Y]'))))
+    preparer = TritiumInputPreparer(dates, concentration, precipitation, alphas[0])
+    times, inputs = preparer.get_times(), preparer.calculate_alpha_inputs(alphas)
+
+    decay = np.log(2) / const.DECAY_CONSTANTS['tritium']
+
+    with nullcontext(session) if session is not None else FittingSession() as sweep_session:
+        tasks = [(np.array([times, alpha_input]), obs, start_year, decay, model_cfg, calculate_params_accuracy,
+                  sweep_session.in_worker(), accuracy_config) for alpha_input in inputs for model_cfg in model_configs]
+
+        results = sweep_session.run_parallel(fit_model, tasks, callback=callback)
+
+    return [results[i:i + len(model_configs)] for i in range(0, len(results), len(model_configs))]
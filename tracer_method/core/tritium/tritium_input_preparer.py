@@ -1,8 +1,15 @@
+from typing import Tuple
+
 import numpy as np
 
+# summer months (from april to september) has different infiltration rate that winter months
+SUMMER_MONTHS = slice(3, 9)
+
 
 class TritiumInputPreparer:
-    """ Read input file with tritium concentration and precipitation and calculate the input for each calendar year. """
+    """ Read input file with tritium concentration and precipitation and calculate the input for each calendar year.
+    Input is linear in infiltration rate alpha within summer and winter sums, so these sums are calculated once and
+    input can be calculated for many alpha values at once. """
 
     def __init__(self, dates: np.ndarray, concentration: np.ndarray, precipitation: np.ndarray, alpha: float):
         self.alpha = alpha
@@ -10,32 +17,54 @@ class TritiumInputPreparer:
         self.concentration = concentration
         self.precipitation = precipitation
         self.dates_range = 0
+        self.__partial_sums = None
 
         self.dates_range = int(max(self.dates.astype('datetime64[Y]')) - min(self.dates.astype('datetime64[Y]')) + 1)
 
-    def __calculate_infiltration_rated(self) -> np.ndarray:
-        """ Calculate infiltration rates for each year which was provided, summer moths (from april to september)
-        has different infiltration rate that winter months (from october to march)
+    def __calculate_partial_sums(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate sums of precipitation weighted tritium concentration and sums of precipitation of summer and winter
+        months for each year (they are calculated only once).
 
-        :return: infiltration rates for each year
+        :return: summer and winter sums of weighted concentration and summer and winter sums of precipitation
         """
-        infiltration_rates = np.ones(12)
-        infiltration_rates[3:9] = self.alpha  # summer months has smaller infiltration rates
+        if self.__partial_sums is None:
+            summer = np.zeros(12, dtype=bool)
+            summer[SUMMER_MONTHS] = True
+            summer = np.tile(summer, self.dates_range)[:len(self.precipitation)]
 
-        return np.tile(infiltration_rates, self.dates_range)
+            years = np.arange(0, len(self.precipitation), 12)
+            concentrations = self.precipitation * self.concentration
 
-    def calculate_input(self) -> np.ndarray:
+            self.__partial_sums = tuple(np.add.reduceat(np.where(months, values, 0), years)
+                                        for values in (concentrations, self.precipitation)
+                                        for months in (summer, ~summer))
+
+        return self.__partial_sums
+
+    def get_times(self) -> np.ndarray:
+        """ Get time points of input (years from the first year of input). """
+        return np.round(np.arange(0.00001, self.dates_range, 1), 2)
+
+    def calculate_alpha_inputs(self, alphas: np.ndarray) -> np.ndarray:
         """
-        Calculate input for each year based on tritium concentration, precipitation and infiltration rates
+        Calculate input concentration for many infiltration rates in one pass.
 
-        :return: input data for tritium method
+        :param alphas: infiltration rates of summer months
+        :return: array of shape (number of alphas, number of years) with input concentration for each alpha (time
+        points are the same as in calculate_input)
         """
-        infiltration_rates = self.__calculate_infiltration_rated()
+        summer_concentrations, winter_concentrations, summer_precipitations, winter_precipitations = \
+            self.__calculate_partial_sums()
+        alphas = np.asarray(alphas, dtype=float)[:, np.newaxis]
 
-        concentrations = self.precipitation * infiltration_rates * self.concentration
-        precipitations = self.precipitation * infiltration_rates
+        return (winter_concentrations + alphas * summer_concentrations) / \
+            (winter_precipitations + alphas * summer_precipitations)
 
-        year_concentration = np.add.reduceat(concentrations, np.arange(0, len(concentrations), 12)) / \
-            np.add.reduceat(precipitations, np.arange(0, len(precipitations), 12))
+    def calculate_input(self) -> np.ndarray:
+        """
+        Calculate input for each year based on tritium concentration, precipitation and infiltration rates
 
-        return np.array([np.round(np.arange(0.00001, self.dates_range, 1), 2), year_concentration])
+        :return: input data for tritium method
+        """
+        return np.array([self.get_times(), self.calculate_alpha_inputs([self.alpha])[0]])
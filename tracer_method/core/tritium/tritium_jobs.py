@@ -0,0 +1,281 @@
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from tracer_method.core.config.accuracy_config import AccuracyConfig
+from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.fitting_result import FittingResult
+from tracer_method.core.session import FittingSession
+from tracer_method.core.tritium.tritium_method import get_fitting_method, tritium_method
+
+# number of jobs whose results are kept in the cache
+RESULTS_CACHE_SIZE = 128
+
+
+def fit_job_model(input: Tuple[np.ndarray, np.ndarray, np.ndarray], obs: np.ndarray,
+                  alpha: Union[float, Tuple[float, float]], model_cfg: List[Union[str, float]],
+                  calculate_params_accuracy: bool, n_samples: int, accuracy_config: AccuracyConfig) -> FittingResult:
+    """ Fit one model configuration of a job in a worker process (params accuracy refits run in the same process,
+    so no nested pool is started). """
+    return tritium_method(input, obs, alpha, [model_cfg], calculate_params_accuracy, FittingSession(0, n_samples),
+                          accuracy_config)[0]
+
+
+def get_job_key(input: Tuple[np.ndarray, np.ndarray, np.ndarray], obs: np.ndarray,
+                alpha: Union[float, Tuple[float, float]], model_configs: List[List[Union[str, float]]],
+                calculate_params_accuracy: bool, n_samples: int, accuracy_config: AccuracyConfig) -> str:
+    """ Get key of job - hash of content of input and observations and of all options of the fit. """
+    job_hash = hashlib.sha1()
+    for array in (*input, obs):
+        array = np.ascontiguousarray(array)
+        job_hash.update(str((array.shape, array.dtype.str)).encode())
+        job_hash.update(array.tobytes())
+
+    options = [alpha, model_configs, calculate_params_accuracy, n_samples,
+               vars(accuracy_config) if accuracy_config is not None else None]
+    job_hash.update(json.dumps(options, sort_keys=True, default=str).encode())
+
+    return job_hash.hexdigest()
+
+
+class FittingJob:
+    """ Awaitable handle of fit submitted to TritiumJobs. Identical fits submitted at the same time share one task,
+    so cancelling a handle (or its timeout) cancels the task only if no other handle waits for it. Awaiting the
+    handle gives fitting results in order of model configurations. """
+
+    def __init__(self, task: '_JobTask', callback: Callable[[FittingResult], None] = None, timeout: float = None):
+        self.callback = callback
+        self.timeout = timeout
+        self.__task = task
+        self.__future = asyncio.get_running_loop().create_future()
+        self.__future.add_done_callback(self.__on_done)
+        task.attach(self)
+
+    def __await__(self):
+        return self.result(self.timeout).__await__()
+
+    @property
+    def key(self) -> str:
+        """ Hash of content of input, observations and options of the fit. """
+        return self.__task.key
+
+    @property
+    def progress(self) -> Tuple[int, int]:
+        """ Number of fitted model configurations and number of all model configurations. """
+        return self.__task.completed, self.__task.total
+
+    def done(self) -> bool:
+        """ True if the job is finished, failed or cancelled, False otherwise. """
+        return self.__future.done()
+
+    def cancelled(self) -> bool:
+        """ True if the job was cancelled (or timed out), False otherwise. """
+        return self.__future.cancelled()
+
+    def cancel(self) -> bool:
+        """
+        Cancel the job. Fits which are already running in worker processes are finished, but their results are
+        not used.
+
+        :return: True if the job was cancelled, False if it was already done
+        """
+        return self.__future.cancel()
+
+    async def result(self, timeout: float = None) -> List[FittingResult]:
+        """
+        Wait for fitting results, the job is cancelled if it is not finished before timeout.
+
+        :param timeout: maximum time of waiting in seconds (no limit by default)
+        :return: fitting results in order of model configurations
+        """
+        return await asyncio.wait_for(self.__future, timeout)
+
+    def _report(self, result: FittingResult):
+        if self.callback is not None and not self.__future.done():
+            self.callback(result)
+
+    def _finish(self, results: List[FittingResult] = None, exception: BaseException = None):
+        if self.__future.done():
+            return
+
+        if exception is not None:
+            self.__future.set_exception(exception)
+        else:
+            self.__future.set_result(list(results))
+
+    def __on_done(self, future: asyncio.Future):
+        if future.cancelled():
+            self.__task.detach(self)
+
+
+class _JobTask:
+    """ Fits of model configurations of one job running in worker processes, shared by handles of identical jobs. """
+
+    def __init__(self, key: str, total: int, on_finished: Callable[['_JobTask', Optional[List[FittingResult]]], None]):
+        self.key = key
+        self.total = total
+        self.results: List[Optional[FittingResult]] = [None] * total
+        self.completed = 0
+        self.finished = False
+        self.__handles: List[FittingJob] = []
+        self.__futures: List[asyncio.Future] = []
+        self.__exception = None
+        self.__on_finished = on_finished
+
+    @classmethod
+    def from_results(cls, key: str, results: List[FittingResult]) -> '_JobTask':
+        """ Create finished task with results taken from the cache. """
+        task = cls(key, len(results), lambda *args: None)
+        task.results = list(results)
+        task.completed = len(results)
+        task.finished = True
+
+        return task
+
+    def start(self, futures: List[asyncio.Future]):
+        """ Set futures of fits of model configurations (in order of model configurations). """
+        self.__futures = futures
+        for index, future in enumerate(futures):
+            future.add_done_callback(partial(self.__complete, index))
+
+    def attach(self, handle: FittingJob):
+        """ Add handle of the task, results which are already fitted are reported to it. """
+        for result in self.results:
+            if result is not None:
+                handle._report(result)
+
+        if self.finished:
+            handle._finish(self.results, self.__exception)
+        else:
+            self.__handles.append(handle)
+
+    def detach(self, handle: FittingJob):
+        """ Remove cancelled handle of the task, the task is cancelled if it was the last one. """
+        if handle in self.__handles:
+            self.__handles.remove(handle)
+
+        if not self.__handles and not self.finished:
+            self.__finish(cancelled=True)
+
+    def __complete(self, index: int, future: asyncio.Future):
+        if self.finished or future.cancelled():
+            return
+
+        if future.exception() is not None:
+            self.__finish(future.exception())
+            return
+
+        self.results[index] = future.result()
+        self.completed += 1
+        for handle in list(self.__handles):
+            handle._report(self.results[index])
+
+        if self.completed == self.total:
+            self.__finish()
+
+    def __finish(self, exception: BaseException = None, cancelled: bool = False):
+        self.finished = True
+        self.__exception = exception
+
+        for future in self.__futures:
+            future.cancel()
+
+        if not cancelled:
+            for handle in self.__handles:
+                handle._finish(self.results, exception)
+        self.__handles = []
+
+        self.__on_finished(self, None if exception is not None or cancelled else self.results)
+
+    def cancel(self):
+        """ Cancel the task and all its handles. """
+        for handle in list(self.__handles):
+            handle.cancel()
+
+        if not self.finished:
+            self.__finish(cancelled=True)
+
+
+class TritiumJobs:
+    """ Runs tritium method fits in a managed pool of worker processes without blocking the event loop (e.g. of
+    a web service). Each model configuration of a job is fitted in a separate worker process together with its params
+    accuracy refits. Submitted jobs return awaitable handles with progress, cancellation and timeouts. Identical jobs
+    (the same content of input and observations and the same options) which run at the same time are fitted once and
+    results of finished jobs are kept in a cache (the least recently used results are removed first). """
+
+    def __init__(self, n_workers: int = None, n_samples: int = 100, cache_size: int = RESULTS_CACHE_SIZE):
+        if n_workers == 0:
+            raise ValueError('Jobs require at least one worker process')
+
+        self.session = FittingSession(n_workers, n_samples)
+        self.cache_size = cache_size
+        self.cache: 'OrderedDict[str, List[FittingResult]]' = OrderedDict()
+        self.__tasks: Dict[str, _JobTask] = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def submit(self, input: Tuple[np.ndarray, np.ndarray, np.ndarray], obs: np.ndarray,
+               alpha: Union[float, Tuple[float, float]], model_configs: List[List[Union[str, float]]],
+               calculate_params_accuracy=False, accuracy_config: AccuracyConfig = None,
+               callback: Callable[[FittingResult], None] = None, timeout: float = None) -> FittingJob:
+        """
+        Submit fit of model configurations to worker processes (it must be called from a running event loop). Job
+        is taken from the cache or joined with a running identical job if possible.
+
+        :param input: input data with dates and monthly h3 concentration and precipitation
+        :param obs: observations data with date and h3 concentration
+        :param alpha: infiltration rate (from 0.01 to 1) or its range if it should be fitted
+        :param model_configs: models configuration for which the output concentration should be calculated
+        :param calculate_params_accuracy: True if accuracy of params should be included, False otherwise
+        :param accuracy_config: configuration of params accuracy calculation - uncertainty method and seed
+        :param callback: function called in the event loop with each fitting result as soon as it is calculated
+        :param timeout: maximum time of waiting for results in seconds when the handle is awaited
+        :return: awaitable handle of the job
+        """
+        loop = asyncio.get_running_loop()
+
+        for model_cfg in model_configs:
+            get_fitting_method(ConfigModel(model_cfg).type)
+
+        options = (alpha, model_configs, calculate_params_accuracy, self.session.n_samples, accuracy_config)
+        key = get_job_key(input, obs, *options)
+
+        if key in self.__tasks:
+            task = self.__tasks[key]
+        elif key in self.cache:
+            self.cache.move_to_end(key)
+            task = _JobTask.from_results(key, self.cache[key])
+        else:
+            task = _JobTask(key, len(model_configs), self.__on_finished)
+            self.__tasks[key] = task
+            task.start([asyncio.wrap_future(self.session.executor.submit(
+                fit_job_model, input, obs, alpha, model_cfg, calculate_params_accuracy, self.session.n_samples,
+                accuracy_config), loop=loop) for model_cfg in model_configs])
+
+        return FittingJob(task, callback, timeout)
+
+    def __on_finished(self, task: _JobTask, results: Optional[List[FittingResult]]):
+        if self.__tasks.get(task.key) is task:
+            del self.__tasks[task.key]
+
+        if results is not None and self.cache_size:
+            self.cache[task.key] = results
+            self.cache.move_to_end(task.key)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    async def close(self):
+        """ Cancel running jobs and shut down worker processes (without blocking the event loop). """
+        for task in list(self.__tasks.values()):
+            task.cancel()
+
+        await asyncio.get_running_loop().run_in_executor(None, self.session.close)
@@ -1,4 +1,6 @@
-from typing import List, Union
+from contextlib import nullcontext
+from functools import partial
+from typing import Callable, List, Union
 from typing import Tuple
 
 import numpy as np
@@ -7,10 +9,16 @@ from tracer_method.core.read_data.read_input_file import read_tritium_file
 from tracer_method.core.read_data.read_observations_file import read_observations
 
 import tracer_method.core.constans as const
+from tracer_method.core.config.accuracy_config import AccuracyConfig
 from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.curve_fitter.joint_params_fitter import JointParamsFitter, JointPFMParamsFitter
 from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
 from tracer_method.core.curve_fitter.pfm_params_fitter import PFMParamsFitter
+from tracer_method.core.curve_fitter.prediction_table import PredictionTable
+from tracer_method.core.fitting_result import FittingResult
+from tracer_method.core.instrumentation import Instrumentation, NULL_INSTRUMENTATION
 from tracer_method.core.run import run
+from tracer_method.core.session import FittingSession
 from tracer_method.core.tritium.tritium_input_preparer import TritiumInputPreparer
 from pathlib import Path
 
@@ -21,36 +29,140 @@ FITTING_METHODS = {
     'PFM': PFMParamsFitter,
 }
 
+JOINT_FITTING_METHODS = {
+    'DM': JointParamsFitter,
+    'EM': JointParamsFitter,
+    'EPM': JointParamsFitter,
+    'PFM': JointPFMParamsFitter,
+}
+
+
+def get_fitting_method(model_type: str) -> Callable:
+    """ Get fitting method for model type. """
+    try:
+        return FITTING_METHODS[model_type]
+    except KeyError:
+        raise Exception('Model type not found: PFM, EM, EPM or DM')
+
+
+def uses_prediction_table(model_type: str) -> bool:
+    """ Check if fitting method of model type uses prediction table (PFM grid optimizer searches whole parameters
+    range, so it does not need start points). """
+    return get_fitting_method(model_type) is not PFMParamsFitter
+
+
+def fit_model(input_data: np.ndarray, obs: np.ndarray, start_year: int, decay: float,
+              model_cfg: List[Union[str, float]], calculate_params_accuracy=False, session: FittingSession = None,
+              accuracy_config: AccuracyConfig = None, table_directory: Path = None,
+              alpha_inputs: Callable[[np.ndarray], np.ndarray] = None,
+              alpha_range: Tuple[float, float] = None, instrumentation: Instrumentation = None,
+              initial_values: np.ndarray = None, optimizer: str = None) -> FittingResult:
+    """
+    Fit one model configuration to observations for already prepared input. If table directory is provided,
+    prediction table for the input and model configuration is loaded from it (or built once and saved there).
+    If alpha range is provided (input is calculated for each alpha with alpha inputs function) or beta range is set
+    in model configuration, they are fitted together with model parameters. Minimization is started from initial
+    values if they are provided (e.g. optimum of the previous fit). Optimizer (if provided) is used by the fit and
+    by refits of params accuracy.
+
+    :return: calculated output concentration with the best fit for the model
+    """
+    config = ConfigModel(model_cfg)
+    fitting_method = get_fitting_method(config.type)
+
+    if alpha_range is not None or config.beta_range is not None:
+        if calculate_params_accuracy:
+            raise ValueError('Params accuracy is not available if alpha or beta is fitted')
+
+        fitting_method = partial(JOINT_FITTING_METHODS[config.type], alpha_inputs=alpha_inputs,
+                                 alpha_range=alpha_range)
 
-def tritium_method(input: Tuple[np.ndarray, np.ndarray, np.ndarray], obs: np.ndarray, alpha: float,
-                   model_configs: List[List[Union[str, float]]], calculate_params_accuracy=False):
+        return run(input_data, obs, start_year, config, decay, fitting_method, False, session,
+                   instrumentation=instrumentation, initial_values=initial_values, optimizer=optimizer)
+
+    prediction_table = None
+    if table_directory is not None and uses_prediction_table(config.type):
+        prediction_table = PredictionTable.get_or_build(table_directory, input_data, start_year, config, decay,
+                                                        fitting_method)
+
+    return run(input_data, obs, start_year, config, decay, fitting_method, calculate_params_accuracy, session,
+               accuracy_config, prediction_table, instrumentation, initial_values, optimizer)
+
+
+def tritium_method(input: Tuple[np.ndarray, np.ndarray, np.ndarray], obs: np.ndarray,
+                   alpha: Union[float, Tuple[float, float]],
+                   model_configs: List[List[Union[str, float]]], calculate_params_accuracy=False,
+                   session: FittingSession = None, accuracy_config: AccuracyConfig = None, parallel: str = None,
+                   callback: Callable[[FittingResult], None] = None, table_directory: Path = None,
+                   instrumentation: Instrumentation = None, optimizer: str = None):
     """
     Calculate output concentration based on provided data, calculations are obtained for each model configuration.
 
+    Models can be fitted in parallel: in 'process' mode they are fitted in worker processes of the session and
+    params accuracy refits run inside these workers, in 'thread' mode they are fitted in threads and refits run in
+    worker processes of the session. In both modes the number of processes is limited by the session workers.
+
     :param input: input data with dates and monthly h3 concentration and precipitation (data must be provided
     for whole year)
     :param obs: observations data with date and h3 concentration
-    :param alpha: infiltration rate (from 0.01 to 1)
+    :param alpha: infiltration rate (from 0.01 to 1) or its range if it should be fitted together with model params
+    (beta is fitted if its range is set in model configuration, params accuracy is not available in both cases)
     :param model_configs: models configuration for which the output concentration should be calculated
     :param calculate_params_accuracy: True if accuracy of params should be included, False otherwise
-    :return: the list with calculated output concentration with the best fit for each provided model
+    :param session: session with worker processes reused for params accuracy of all models and across calls
+    (a temporary session is created if it is not provided)
+    :param accuracy_config: configuration of params accuracy calculation - uncertainty method and seed
+    :param parallel: None (models fitted one after another), 'process' or 'thread'
+    :param callback: function called with each fitting result as soon as it is calculated
+    :param table_directory: directory with prediction tables reused across calls with the same input (optional)
+    :param instrumentation: counters and timers of fitting stages - input preparation time is measured and data of
+    each model fit is attached to its result and reported to instrumentation (disabled by default)
+    :param optimizer: optimizer of fits and refits of params accuracy - 'TNC' or 'least_squares' (default optimizer
+    of fitting method if not provided)
+    :return: the list with calculated output concentration with the best fit for each provided model (in order of
+    model configurations)
     """
+    instrumentation = instrumentation or NULL_INSTRUMENTATION
+
     dates, concentration, precipitation = input
     start_year = int(str(min(dates.astype('datetime64[Y]'))))
-    input_data = TritiumInputPreparer(dates, concentration, precipitation, alpha).calculate_input()
+    alpha_range = tuple(alpha) if isinstance(alpha, (tuple, list)) else None
+    with instrumentation.timer('input_preparation'):
+        preparer = TritiumInputPreparer(dates, concentration, precipitation,
+                                        np.mean(alpha_range) if alpha_range is not None else alpha)
+        input_data = preparer.calculate_input()
+    alpha_inputs = preparer.calculate_alpha_inputs if alpha_range is not None else None
 
     decay = np.log(2) / const.DECAY_CONSTANTS['tritium']
 
-    output_data = []
     for model_cfg in model_configs:
-        config = ConfigModel(model_cfg)
+        get_fitting_method(ConfigModel(model_cfg).type)
+
+    models_instrumentation = [instrumentation.create_child(model_index=i, model_type=ConfigModel(j).type)
+                              for i, j in enumerate(model_configs)]
+
+    def report(fitting_result: FittingResult):
+        instrumentation.report(fitting_result.instrumentation)
 
-        try:
-            fitting_method = FITTING_METHODS[config.type]
-        except KeyError:
-            raise Exception('Model type not found: PFM, EM, EPM or DM')
+        if callback is not None:
+            callback(fitting_result)
 
-        fitting_result = run(input_data, obs, start_year, config, decay, fitting_method, calculate_params_accuracy)
+    if parallel is not None:
+        with nullcontext(session) if session is not None else FittingSession() as parallel_session:
+            models_session = parallel_session.in_worker() if parallel == 'process' else parallel_session
+            tasks = [(input_data, obs, start_year, decay, model_cfg, calculate_params_accuracy, models_session,
+                      accuracy_config, table_directory, alpha_inputs, alpha_range, model_instrumentation, None,
+                      optimizer)
+                     for model_cfg, model_instrumentation in zip(model_configs, models_instrumentation)]
+
+            return parallel_session.run_parallel(fit_model, tasks, parallel, report)
+
+    output_data = []
+    for model_cfg, model_instrumentation in zip(model_configs, models_instrumentation):
+        fitting_result = fit_model(input_data, obs, start_year, decay, model_cfg, calculate_params_accuracy, session,
+                                   accuracy_config, table_directory, alpha_inputs, alpha_range, model_instrumentation,
+                                   optimizer=optimizer)
+        report(fitting_result)
 
         output_data.append(fitting_result)
 
@@ -0,0 +1,46 @@
+import numpy as np
+
+
+def draw_uniform_observations(obs: np.ndarray, n_samples: int, random: np.random.Generator) -> np.ndarray:
+    """
+    Draw observations values uniformly within one sigma (standard deviation of observations) of each observation.
+
+    :param obs: observations data with dates and values
+    :param n_samples: number of observations sets
+    :param random: random numbers generator
+    :return: array of shape (n_samples, number of observations) with drawn observations values
+    """
+    std = np.std(obs[1])
+
+    return random.uniform(obs[1] - std, obs[1] + std, size=(n_samples, len(obs[1])))
+
+
+def draw_bootstrap_observations(obs: np.ndarray, predictions: np.ndarray, n_samples: int,
+                                random: np.random.Generator) -> np.ndarray:
+    """
+    Draw observations values as predictions of the best fit with residuals resampled with replacement.
+
+    :param obs: observations data with dates and values
+    :param predictions: predictions of the best fit interpolated at observations dates
+    :param n_samples: number of observations sets
+    :param random: random numbers generator
+    :return: array of shape (n_samples, number of observations) with drawn observations values
+    """
+    residuals = obs[1] - predictions
+
+    return predictions + random.choice(residuals, size=(n_samples, len(residuals)))
+
+
+def get_linearized_std(jacobian: np.ndarray, residuals: np.ndarray) -> np.ndarray:
+    """
+    Calculate standard deviations of params from covariance matrix of linearized model s^2 * (J^T J)^-1, where s^2
+    is the residual variance.
+
+    :param jacobian: Jacobian of residuals at the best fit, array of shape (number of observations, number of params)
+    :param residuals: residuals at the best fit
+    :return: standard deviations of params
+    """
+    degrees_of_freedom = max(len(residuals) - jacobian.shape[1], 1)
+    variance = np.sum(residuals ** 2) / degrees_of_freedom
+
+    return np.sqrt(np.abs(np.diag(np.linalg.pinv(jacobian.T @ jacobian)) * variance))
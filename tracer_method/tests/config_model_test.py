@@ -16,6 +16,15 @@ class TestClass(unittest.TestCase):
 
         self.assertTupleEqual((20, 90), self.cfg.params_range[0], 'Checking params range')
 
+        self.assertEqual('local', self.cfg.search, 'Checking default search mode')
+
+        self.assertEqual('global', ConfigModel(['EM', ((20.0, 90.0), ), 0, 'global']).search, 'Checking search mode')
+
+        self.assertIsNone(self.cfg.beta_range, 'Checking if beta is not fitted by default')
+
+        self.assertTupleEqual((0.1, 0.5), ConfigModel(['EM', ((20.0, 90.0), ), (0.1, 0.5)]).beta_range,
+                              'Checking beta range')
+
 
 if __name__ == '__main__':
     unittest.main()
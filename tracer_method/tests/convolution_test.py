@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+
+from tracer_method.core.curve_fitter.convolution import Convolver
+
+
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        random = np.random.default_rng(7)
+        self.input = random.uniform(0, 100, 600)
+        self.kernels = [random.uniform(0, 1, size) for size in (1, 20, 599, 600, 1000)]
+
+    def test_convolve(self):
+        for method in ('direct', 'fft', 'overlap-add'):
+            convolver = Convolver(self.input, method)
+
+            for kernel in self.kernels:
+                np.testing.assert_allclose(np.convolve(self.input, kernel, mode='full'), convolver.convolve(kernel),
+                                           atol=1e-9, err_msg=f'Checking {method} convolution')
+
+    def test_convolve_many(self):
+        kernels = np.array([self.kernels[3], self.kernels[3][::-1]])
+
+        for method in ('direct', 'fft', 'overlap-add'):
+            np.testing.assert_allclose([np.convolve(self.input, i, mode='full') for i in kernels],
+                                       Convolver(self.input, method).convolve(kernels), atol=1e-9,
+                                       err_msg=f'Checking {method} convolution of many kernels')
+
+    def test_choose_method(self):
+        convolver = Convolver(self.input)
+
+        self.assertEqual('direct', convolver.choose_method(20), 'Checking method chosen for short response function')
+
+        self.assertEqual('overlap-add', convolver.choose_method(1000),
+                         'Checking method chosen for long response function')
+
+        self.assertEqual('fft', Convolver(self.input, 'fft').choose_method(20), 'Checking explicitly set method')
+
+    def test_unknown_method(self):
+        self.assertRaises(ValueError, Convolver, self.input, 'wavelet')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tracer_method.core.read_data.file_cache import ParsedFileCache
+from tracer_method.core.read_data.read_input_file import read_tritium_file
+
+
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        pd.DataFrame({'Date': pd.date_range('1960-01-01', periods=24, freq='MS'),
+                      'Concentration': np.arange(24, dtype=float),
+                      'Precipitation': np.arange(24, dtype=float) + 100}).to_csv(self.path / 'input.csv', index=False)
+        pd.DataFrame({'Date': ['1974-05-30', '1975-10-23'],
+                      'Concentration': [10.0, 12.5]}).to_csv(self.path / 'observations.csv', index=False)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read(self):
+        cache = ParsedFileCache(self.path / 'cache')
+
+        first = cache.read_tritium_file(self.path / 'input.csv')
+        second = cache.read_tritium_file(self.path / 'input.csv')
+
+        for i, j, k in zip(read_tritium_file(self.path / 'input.csv'), first, second):
+            np.testing.assert_array_equal(i, j, err_msg='Checking arrays read on cache miss')
+            np.testing.assert_array_equal(i, k, err_msg='Checking arrays read from the cache')
+
+        np.testing.assert_array_equal(cache.read_observations(self.path / 'observations.csv'),
+                                      cache.read_observations(self.path / 'observations.csv'),
+                                      err_msg='Checking observations read from the cache')
+
+        cache.read_observations(self.path / 'observations.csv', legacy_rounding=True)
+
+        statistics = cache.statistics
+        self.assertEqual(2, statistics['hits'], 'Checking number of cache hits')
+
+        self.assertEqual(3, statistics['misses'], 'Checking number of cache misses')
+
+        self.assertEqual(3, statistics['entries'], 'Checking number of cached files')
+
+    def test_evict(self):
+        cache = ParsedFileCache(self.path / 'cache')
+        cache.read_tritium_file(self.path / 'input.csv')
+        cache.max_size = cache.statistics['size']
+
+        cache.read_observations(self.path / 'observations.csv')
+
+        self.assertEqual(1, cache.statistics['evictions'], 'Checking if the least recently used entry is removed')
+
+        cache.read_observations(self.path / 'observations.csv')
+
+        self.assertEqual(1, cache.hits, 'Checking if the most recently used entry is kept')
+
+    def test_concurrent_read(self):
+        cache = ParsedFileCache(self.path / 'cache', max_size=0)
+        expected = read_tritium_file(self.path / 'input.csv')
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(lambda _: cache.read_tritium_file(self.path / 'input.csv'), range(64)))
+
+        for result in results:
+            for i, j in zip(expected, result):
+                np.testing.assert_array_equal(i, j, err_msg='Checking arrays read by many threads')
+
+        self.assertListEqual([], list((self.path / 'cache').glob('*.tmp')), 'Checking if temporary files are removed')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
+from tracer_method.core.fit_state import FitState, FitStateStore
+from tracer_method.core.tritium.tritium_method import fit_model
+
+
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        self.input_data = np.array([np.round(np.arange(0.00001, 60, 1), 2), 10 + 50 * np.exp(-np.arange(60) / 10)])
+        self.obs = np.array([np.arange(1990.3, 2006, 4), np.linspace(20, 8, 4)])
+        self.new_obs = np.array([[2010.3, 2011.3], [6.0, 5.5]])
+        self.model_cfg = ['DM', ((5.0, 90.0), (0.01, 1.0))]
+        self.decay = np.log(2) / 12.32
+
+    def test_save_and_load(self):
+        state = FitState.create('well/1', self.model_cfg, self.input_data, 1950, self.decay, self.obs)
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = FitStateStore(Path(directory))
+            store.save(state)
+            loaded = store.load('well/1', self.model_cfg)
+
+            self.assertIsNone(store.load('well/2', self.model_cfg), 'Checking if missing state is not loaded')
+
+        self.assertEqual('well/1', loaded.site, 'Checking site of loaded state')
+
+        np.testing.assert_array_equal(state.params, loaded.params, err_msg='Checking params of loaded state')
+
+        np.testing.assert_array_equal(state.output, loaded.output, err_msg='Checking output of loaded state')
+
+        np.testing.assert_allclose(np.interp(self.obs[0], state.output[0], state.output[1]),
+                                   loaded.predict(self.obs[0]),
+                                   err_msg='Checking predictions interpolated from cached output')
+
+    def test_alpha_range(self):
+        with self.assertRaises(ValueError, msg='Checking if fit with alpha range is rejected'):
+            FitState.create('well-1', self.model_cfg, self.input_data, 1950, self.decay, self.obs, (0.3, 0.9))
+
+        with self.assertRaises(ValueError, msg='Checking if state with alpha in params is rejected'):
+            FitState('well-1', self.model_cfg, self.input_data, 1950, self.decay, self.obs, np.array([30, 0.5, 0.7]),
+                     self.input_data)
+
+    def test_update(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = FitStateStore(Path(directory))
+            store.save(FitState.create('well-1', self.model_cfg, self.input_data, 1950, self.decay, self.obs))
+
+            state = store.load('well-1', self.model_cfg)
+            result = store.update('well-1', self.model_cfg, self.new_obs)
+
+            updated_state = store.load('well-1', self.model_cfg)
+
+            self.assertEqual(6, updated_state.obs.shape[1], 'Checking if new observations are saved')
+
+        obs = np.concatenate([self.obs, self.new_obs], axis=1)
+        cold_result = fit_model(self.input_data, obs, 1950, self.decay, self.model_cfg)
+
+        self.assertLessEqual(result.mse, cold_result.mse * 1.01,
+                             'Checking if warm-started refit is as good as cold fit')
+
+        cold_solution, warm_solution = [ParamsFitter(self.input_data, obs, 1950, ConfigModel(self.model_cfg),
+                                                     self.decay).run_algorithm(i) for i in (None, state.params)]
+
+        self.assertLess(warm_solution.nfev, cold_solution.nfev, 'Checking if refit from the last optimum needs fewer '
+                                                                'evaluations than cold fit')
+
+        np.testing.assert_array_equal(result.optimum, updated_state.params,
+                                      err_msg='Checking if unrounded optimum is saved')
+
+
+if __name__ == '__main__':
+    unittest.main()
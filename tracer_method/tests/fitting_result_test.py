@@ -1,6 +1,13 @@
+import pickle
+import tempfile
 import unittest
+from pathlib import Path
 
-from tracer_method.core.fitting_result import FittingResult
+from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.curve_fitter.joint_params_fitter import JointParamsFitter
+from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
+from tracer_method.core.curve_fitter.pfm_params_fitter import PFMParamsFitter
+from tracer_method.core.fitting_result import FittingResult, get_results_columns, save_results
 import numpy as np
 
 
@@ -37,5 +44,100 @@ class TestClass(unittest.TestCase):
         self.assertEqual(111, self.fitting.model_efficiency, 'Checking if model efficiency are set')
 
 
+class TestLazyClass(unittest.TestCase):
+    def setUp(self):
+        input_data = np.array([np.round(np.arange(0.00001, 60, 1), 2), 10 + 50 * np.exp(-np.arange(60) / 10)])
+        obs = np.array([np.arange(1990.3, 2006, 4), np.linspace(20, 8, 4)])
+        self.fitter = ParamsFitter(input_data, obs, 1950, ConfigModel(['DM', ((5.0, 90.0), (0.01, 1.0))]), 0.056)
+        self.pfm_fitter = PFMParamsFitter(input_data, obs, 1950, ConfigModel(['PFM', ((1.0, 50.0), )]), 0.056)
+        self.joint_fitters = [JointParamsFitter(input_data, obs, 1950, ConfigModel(['EM', ((5.0, 90.0), ), (0.0, 0.5)]),
+                                                0.056) for _ in range(2)]
+
+    def test_lazy_output(self):
+        solution = self.fitter.run_algorithm()
+
+        self.assertIsNone(self.fitter.fit_data._output, 'Checking if optimizer does not write output')
+
+        result = self.fitter.get_data_solution(solution)
+        x, y = self.fitter._get_predictions(result.params)
+        t, g_t = self.fitter.get_response_function(result.params)
+
+        np.testing.assert_array_equal(np.round([x, y], 4), result.output, err_msg='Checking lazily calculated output')
+
+        np.testing.assert_array_equal(np.round([t, g_t], 4), result.response_function,
+                                      err_msg='Checking lazily calculated response function')
+
+        self.assertIsNone(result._fitter, 'Checking if fitter is released')
+
+    def test_lazy_output_reused_fitter(self):
+        fitter, other_fitter = self.joint_fitters
+        result = fitter.get_data_solution(fitter.run_algorithm())
+
+        self.assertIsNot(fitter, result._fitter, 'Checking if result does not keep the fitter')
+
+        self.assertDictEqual({}, result._fitter._ParamsFitter__grids, 'Checking if result does not keep cached grids')
+
+        fitter._get_predictions(np.array([85.0]))
+        expected = other_fitter.get_data_solution(other_fitter.run_algorithm())
+
+        np.testing.assert_array_equal(expected.output, result.output,
+                                      err_msg='Checking if output does not depend on reused fitter')
+
+        self.assertEqual(expected.beta, result.beta, 'Checking beta of the result')
+
+    def test_pickle(self):
+        result = self.fitter.get_data_solution(self.fitter.run_algorithm())
+        loaded = pickle.loads(pickle.dumps(result))
+
+        self.assertIsNone(loaded._fitter, 'Checking if fitter is not pickled')
+
+        np.testing.assert_array_equal(result.output, loaded.output, err_msg='Checking output of unpickled result')
+
+    def test_save_results(self):
+        results = [self.fitter.get_data_solution(self.fitter.run_algorithm()),
+                   self.pfm_fitter.get_data_solution(self.pfm_fitter.run_algorithm())]
+
+        self.assertIsNone(results[1].response_function, 'Checking if PFM has no response function')
+
+        with tempfile.TemporaryDirectory() as directory:
+            save_results(results, Path(directory) / 'results.npz')
+
+            with np.load(Path(directory) / 'results.npz') as data:
+                self.assertListEqual(['DM', 'PFM'], list(data['model_type']), 'Checking model types of saved results')
+
+                offsets = data['output_concentration_offsets']
+                np.testing.assert_array_equal(results[1].output[1],
+                                              data['output_concentration_values'][offsets[1]:offsets[2]],
+                                              err_msg='Checking saved output')
+
+                np.testing.assert_array_equal([0, 2, 3], data['params_offsets'], err_msg='Checking params offsets')
+
+    def test_results_columns_without_output(self):
+        _, list_columns = get_results_columns([FittingResult('EM', np.array([[1990.5], [10.0]]))])
+
+        for name in ('params', 'output_dates', 'output_concentration'):
+            np.testing.assert_array_equal([0, 0], list_columns[name][1],
+                                          err_msg=f'Checking if {name} of unfitted result is empty')
+
+    def test_save_results_parquet(self):
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            self.skipTest('pyarrow is not installed')
+
+        results = [self.fitter.get_data_solution(self.fitter.run_algorithm())]
+
+        with tempfile.TemporaryDirectory() as directory:
+            save_results(results, Path(directory) / 'results.parquet')
+            table = pyarrow.parquet.read_table(Path(directory) / 'results.parquet')
+
+        self.assertListEqual(list(results[0].params), table.column('params').to_pylist()[0],
+                             'Checking params of saved results')
+
+        np.testing.assert_array_equal(results[0].response_function[1],
+                                      table.column('response_function_values').to_pylist()[0],
+                                      err_msg='Checking saved response function')
+
+
 if __name__ == '__main__':
     unittest.main()
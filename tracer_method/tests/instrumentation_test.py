@@ -0,0 +1,78 @@
+import json
+import pickle
+import unittest
+
+import numpy as np
+
+from tracer_method.core.instrumentation import Instrumentation, NULL_INSTRUMENTATION
+from tracer_method.core.tritium.tritium_method import tritium_method
+
+
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        dates = np.arange('1953-01', '2003-01', dtype='datetime64[M]')
+        random = np.random.default_rng(0)
+        self.input = (dates, random.uniform(10, 100, len(dates)), random.uniform(0, 200, len(dates)))
+        self.obs = np.array([np.arange(1975.3, 2000, 4), np.linspace(40, 10, 7)])
+        self.model_configs = [['EM', ((5.0, 80.0), )], ['DM', ((5.0, 80.0), (0.05, 1.0))]]
+
+    def test_null_instrumentation(self):
+        with NULL_INSTRUMENTATION.timer('stage'):
+            NULL_INSTRUMENTATION.count('counter')
+
+        self.assertIs(NULL_INSTRUMENTATION, NULL_INSTRUMENTATION.create_child(model_index=0),
+                      'Checking if disabled instrumentation does not create children')
+
+        self.assertIsNone(NULL_INSTRUMENTATION.to_dict(), 'Checking if disabled instrumentation has no data')
+
+        output_data = tritium_method(self.input, self.obs, 0.7, self.model_configs)
+
+        self.assertListEqual([None, None], [i.instrumentation for i in output_data],
+                             'Checking if results have no instrumentation data by default')
+
+    def test_report(self):
+        reported = []
+        instrumentation = Instrumentation(hooks=[reported.append], labels={'site': 'well'})
+
+        child = instrumentation.create_child(model_index=0)
+        child.count('refits', 2)
+        child.add_time('convolution', 0.5)
+        instrumentation.report(child.to_dict())
+        instrumentation.report(None)
+
+        self.assertDictEqual({'labels': {'site': 'well', 'model_index': 0}, 'counters': {'refits': 2},
+                              'timers': {'convolution': 0.5}}, reported[0], 'Checking data passed to hook')
+
+        self.assertDictEqual({'refits': 2}, dict(instrumentation.counters), 'Checking counters of parent')
+
+        self.assertDictEqual(instrumentation.to_dict(), json.loads(instrumentation.to_json()),
+                             'Checking JSON export')
+
+        self.assertListEqual([], pickle.loads(pickle.dumps(instrumentation)).hooks,
+                             'Checking if hooks are not pickled')
+
+    def test_tritium_method(self):
+        reported = []
+        instrumentation = Instrumentation(hooks=[reported.append])
+
+        output_data = tritium_method(self.input, self.obs, 0.7, self.model_configs, instrumentation=instrumentation)
+
+        self.assertListEqual([{'model_index': 0, 'model_type': 'EM'}, {'model_index': 1, 'model_type': 'DM'}],
+                             [i['labels'] for i in reported], 'Checking if hooks are called once for each model')
+
+        self.assertListEqual(reported, [i.instrumentation for i in output_data],
+                             'Checking if instrumentation data is attached to results')
+
+        # interpolation is a part of convolution stage of numba engine
+        for stage in ['input_preparation', 'response_function', 'convolution', 'optimizer']:
+            self.assertGreater(instrumentation.timers[stage], 0, f'Checking timer of {stage} stage')
+
+        self.assertEqual(sum(i['counters']['objective_evaluations'] for i in reported),
+                         instrumentation.counters['objective_evaluations'],
+                         'Checking if counters of models are summed')
+
+        self.assertGreater(instrumentation.counters['optimizer_iterations'], 0, 'Checking optimizer iterations')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+import numpy as np
+
+from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.curve_fitter.numba_engine import NUMBA_AVAILABLE
+from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
+
+
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        self.input_data = np.array([np.round(np.arange(0.00001, 60, 1), 2),
+                                    10 + 1000 * np.exp(-((np.arange(60) - 13) / 3) ** 2)])
+        # the last observation is after the end of predictions of the shortest response functions
+        self.obs = np.array([np.array([1960.5, 1975.3, 1990.7, 2005.2, 2009.9, 2150.0]),
+                             np.array([30.0, 25.0, 21.0, 18.0, 12.0, 5.0])])
+        self.models = [(['EM', ((5.0, 300.0), )], np.array([[8.0], [37.5], [250.0]])),
+                       (['EPM', ((5.0, 300.0), (1.0, 3.0))], np.array([[8.0, 1.2], [37.5, 2.5], [250.0, 1.05]])),
+                       (['DM', ((5.0, 300.0), (0.01, 1.0))], np.array([[8.0, 0.02], [37.5, 0.3], [250.0, 0.9]]))]
+
+    def test_engine(self):
+        cfg = ConfigModel(self.models[0][0])
+
+        self.assertEqual('numba' if NUMBA_AVAILABLE else 'sparse', ParamsFitter(self.input_data, self.obs, 1950, cfg,
+                                                                                 0.056).engine,
+                         'Checking if numba engine is used if it is installed')
+
+        self.assertRaises(ValueError, ParamsFitter, self.input_data, self.obs, 1950, cfg, 0.056, engine='gpu')
+
+    def test_identical_results(self):
+        if not NUMBA_AVAILABLE:
+            self.skipTest('numba is not installed')
+
+        self.assert_identical_results('numba')
+
+    def test_sparse_engine(self):
+        self.assert_identical_results('sparse')
+
+        fitter = ParamsFitter(self.input_data, self.obs, 1950, ConfigModel(self.models[1][0]), 0.056, engine='sparse')
+        result = fitter.get_data_solution(fitter.run_algorithm())
+        x, y = ParamsFitter(self.input_data, self.obs, 1950, ConfigModel(self.models[1][0]), 0.056,
+                            engine='numpy')._get_predictions(result.params)
+
+        np.testing.assert_allclose(result.output, np.round([x, y], 4), err_msg='Checking full output of the result')
+
+    def assert_identical_results(self, engine: str):
+        for model_cfg, params in self.models:
+            for decay in (0.056, None):
+                fitters = [ParamsFitter(self.input_data, self.obs, 1950, ConfigModel(model_cfg), decay, engine=i)
+                           for i in ('numpy', engine)]
+
+                for i in params:
+                    np.testing.assert_allclose(*[j.residuals(i) for j in fitters], rtol=1e-10, atol=1e-12,
+                                               err_msg=f'Checking {model_cfg[0]} predictions of both engines')
+
+                    np.testing.assert_allclose(*[j.jacobian(i) for j in fitters], rtol=1e-10, atol=1e-12,
+                                               err_msg=f'Checking {model_cfg[0]} derivatives of both engines')
+
+                np.testing.assert_allclose(*[j.get_batch_predictions(params) for j in fitters], rtol=1e-10,
+                                           atol=1e-12, err_msg=f'Checking {model_cfg[0]} batch predictions')
+
+                solutions = [j.run_algorithm() for j in fitters]
+                np.testing.assert_allclose(*[j.x for j in solutions], rtol=1e-6,
+                                           err_msg=f'Checking {model_cfg[0]} solutions of both engines')
+
+    def test_least_squares(self):
+        if not NUMBA_AVAILABLE:
+            self.skipTest('numba is not installed')
+
+        cfg = ConfigModel(self.models[2][0])
+        results = [ParamsFitter(self.input_data, self.obs, 1950, cfg, 0.056, optimizer='least_squares', engine=i)
+                   for i in ('numpy', 'numba')]
+        results = [i.get_data_solution(i.run_algorithm()) for i in results]
+
+        np.testing.assert_array_equal(results[0].params, results[1].params, err_msg='Checking params of both engines')
+
+        self.assertEqual(results[0].mse, results[1].mse, 'Checking MSE of both engines')
+
+        self.assertEqual(results[0].model_efficiency, results[1].model_efficiency, 'Checking ME of both engines')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,11 @@
+import pickle
 import unittest
 
 import numpy as np
 
 from tracer_method.core.config.config_model import ConfigModel
 from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
+from tracer_method.core.curve_fitter.response_functions import dispersion
 
 
 class TestClass(unittest.TestCase):
@@ -36,6 +38,116 @@ class TestClass(unittest.TestCase):
                              [i for i in fitting_results.response_function[1]][:5],
                              'Checking values of response function')
 
+    def test_get_batch_predictions(self):
+        params = np.array([[20.0, 0.01], [55.0, 0.5], [90.0, 1.0]])
+        predictions = self.fitter.get_batch_predictions(params)
+
+        self.assertTupleEqual((3, 4), predictions.shape, 'Checking shape of batch predictions')
+
+        for i, j in zip(params, predictions):
+            x, y = self.fitter._get_predictions(i)
+            np.testing.assert_allclose(np.interp(self.fitter.fit_data.observations[0], x, y), j,
+                                       err_msg='Checking values of batch predictions')
+
+        self.assertEqual(3, len(self.fitter.calculate_batch_mse(params)), 'Checking batch MSE')
+
+    def test_jacobian(self):
+        input_data = np.array([np.round(np.arange(0.00001, 60, 1), 2), 10 + 50 * np.exp(-np.arange(60) / 10)])
+        obs = np.array([np.arange(1990.3, 2010, 4), np.linspace(20, 5, 5)])
+        models = [(['EM', ((5.0, 90.0), )], np.array([23.7])),
+                  (['EPM', ((5.0, 90.0), (1.0, 3.0))], np.array([23.7, 1.37])),
+                  (['DM', ((5.0, 90.0), (0.01, 1.0))], np.array([23.7, 0.21]))]
+
+        for model_cfg, params in models:
+            fitter = ParamsFitter(input_data, obs, 1950, ConfigModel(model_cfg), 0.06)
+            steps = params * 1e-6
+            finite_differences = np.array([(fitter.residuals(params + step) - fitter.residuals(params - step)) / (2 * h)
+                                           for step, h in zip(np.diag(steps), steps)]).T
+
+            np.testing.assert_allclose(finite_differences, fitter.jacobian(params), rtol=1e-5, atol=1e-8,
+                                       err_msg=f'Checking analytic derivatives of {model_cfg[0]} predictions')
+
+    def test_cached_grids(self):
+        input_data = np.array([np.round(np.arange(0.00001, 60, 1), 2), 10 + 50 * np.exp(-np.arange(60) / 10)])
+        obs = np.array([np.arange(1990.3, 2010, 4), np.linspace(20, 5, 5)])
+        fitter = ParamsFitter(input_data, obs, 1950, ConfigModel(['DM', ((5.0, 300.0), (0.01, 1.0))]), 0.06)
+
+        for params in [np.array([10.0, 0.1]), np.array([250.0, 0.5]), np.array([10.0, 0.1])]:
+            x, y = fitter._get_predictions(params)
+            t = np.arange(0.001, len(x) - 59, 1)
+            g_t = dispersion(t, params)
+
+            np.testing.assert_array_equal(np.round(np.arange(min(t) + 0.00001, max(t) + 60, 1), 2) + 1950, x,
+                                          err_msg='Checking cached x points of predictions')
+
+            np.testing.assert_array_equal(np.convolve(input_data[1], g_t * np.exp(-t * 0.06)), y,
+                                          err_msg='Checking predictions with cached decay kernel')
+
+        self.assertFalse(x.flags.writeable, 'Checking if cached x points are read-only')
+
+    def test_pickle(self):
+        input_data = np.array([np.round(np.arange(0.00001, 60, 1), 2), 10 + 50 * np.exp(-np.arange(60) / 10)])
+        obs = np.array([np.arange(1990.3, 2010, 4), np.linspace(20, 5, 5)])
+        fitter = ParamsFitter(input_data, obs, 1950, ConfigModel(['DM', ((5.0, 1000.0), (0.01, 1.0))]), 0.06,
+                              engine='sparse')
+        empty_size = len(pickle.dumps(fitter))
+
+        fitter.calculate_batch_mse(np.array([[i, 0.5] for i in np.linspace(5.0, 1000.0, 32)]))
+        loaded = pickle.loads(pickle.dumps(fitter))
+
+        self.assertEqual(empty_size, len(pickle.dumps(fitter)), 'Checking if cached grids are not pickled')
+
+        params = np.array([500.0, 0.5])
+        np.testing.assert_array_equal(fitter.residuals(params), loaded.residuals(params),
+                                      err_msg='Checking predictions of unpickled fitter')
+
+    def test_run_least_squares(self):
+        input_data = np.array([np.round(np.arange(0.00001, 60, 1), 2), 10 + 50 * np.exp(-np.arange(60) / 10)])
+        obs = np.array([np.arange(1990.3, 2010, 4), np.linspace(20, 5, 5)])
+        cfg = ConfigModel(['DM', ((5.0, 90.0), (0.01, 1.0))])
+
+        tnc_solution = ParamsFitter(input_data, obs, 1950, cfg, 0.06).run_algorithm()
+        least_squares_fitter = ParamsFitter(input_data, obs, 1950, cfg, 0.06, optimizer='least_squares')
+        least_squares_solution = least_squares_fitter.run_algorithm()
+
+        self.assertLessEqual(least_squares_solution.fun, tnc_solution.fun * 1.01,
+                             'Checking if least squares solution is as good as TNC solution')
+
+    def test_run_epm(self):
+        input_data = np.array([np.round(np.arange(0.00001, 70, 1), 2),
+                               10 + 1000 * np.exp(-((np.arange(70) - 13) / 3) ** 2)])
+        obs_dates = np.arange(1975.5, 2020, 4)
+        cfg = ConfigModel(['EPM', ((1.0, 100.0), (1.0, 3.0))])
+        x, y = ParamsFitter(input_data, np.array([obs_dates, obs_dates]), 1950, cfg, 0.056)._get_predictions(
+            np.array([30, 1.5]))
+        obs = np.array([obs_dates, np.interp(obs_dates, x, y) * np.random.default_rng(19).normal(1, 0.1, 12)])
+
+        fitter = ParamsFitter(input_data, obs, 1950, cfg, 0.056)
+        fitting_results = fitter.get_data_solution(fitter.run_algorithm())
+
+        # MSE of fit with finite differences (before analytic gradients were added) is 11.634
+        self.assertLessEqual(fitting_results.mse, 11.634 * 1.01, 'Checking if EPM fit is not worse than with finite '
+                                                                 'differences')
+
+    def test_run_global_search(self):
+        input_data = np.array([np.round(np.arange(0.00001, 70, 1), 2),
+                               10 + 1000 * np.exp(-((np.arange(70) - 13) / 3) ** 2)])
+        obs_dates = np.arange(1975.5, 2020, 4)
+        x, y = ParamsFitter(input_data, np.array([obs_dates, obs_dates]), 1950,
+                            ConfigModel(['EPM', ((1.0, 200.0), (1.0, 4.0))]), 0.056)._get_predictions(
+            np.array([12, 3.2]))
+        obs = np.array([obs_dates, np.interp(obs_dates, x, y)])
+
+        local_solution = ParamsFitter(input_data, obs, 1950, ConfigModel(['EPM', ((1.0, 200.0), (1.0, 4.0)), 0]),
+                                      0.056).run_algorithm()
+        global_solution = ParamsFitter(input_data, obs, 1950,
+                                       ConfigModel(['EPM', ((1.0, 200.0), (1.0, 4.0)), 0, 'global']),
+                                       0.056).run_algorithm()
+
+        self.assertLess(global_solution.fun, local_solution.fun, 'Checking if global search finds better minimum')
+
+        np.testing.assert_allclose([12, 3.2], global_solution.x, rtol=1e-2, err_msg='Checking global search params')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import warnings
 
 import numpy as np
 
@@ -24,6 +25,42 @@ class TestClass(unittest.TestCase):
         self.assertListEqual([4.449354233414397, 4.8938451658234285, 5.338336098232459, 5.7828270306414895],
                              [i for i in predictions[1][:4]], 'Checking values of Piston Flow response function')
 
+    def test_get_batch_predictions(self):
+        params = np.array([[3.0], [5.0], [7.5]])
+        predictions = self.fitter.get_batch_predictions(params)
+
+        for i, j in zip(params, predictions):
+            x, y = self.fitter._get_predictions(i)
+            np.testing.assert_allclose(np.interp(self.fitter.fit_data.observations[0], x, y), j,
+                                       err_msg='Checking values of batch predictions')
+
+    def test_run_grid_algorithm(self):
+        input_data = np.array([np.round(np.arange(0.00001, 70, 1), 2),
+                               10 + 1000 * np.exp(-((np.arange(70) - 13) / 3) ** 2)])
+        obs_dates = np.arange(1975.5, 2020, 4)
+        cfg = ConfigModel(['PFM', ((1.0, 40.0), )])
+
+        for transit_time in (3.3, 12.7, 25.1):
+            obs = np.array([obs_dates, obs_dates])
+            obs[1] = PFMParamsFitter(input_data, obs, 1950, cfg, 0.06).get_batch_predictions(np.array([[transit_time]]))
+
+            grid_solution = PFMParamsFitter(input_data, obs, 1950, cfg, 0.06).run_algorithm()
+            tnc_solution = PFMParamsFitter(input_data, obs, 1950, cfg, 0.06, optimizer='TNC').run_algorithm()
+
+            self.assertLessEqual(grid_solution.fun, tnc_solution.fun, 'Checking if grid solution is as good as TNC')
+
+            self.assertAlmostEqual(transit_time, grid_solution.x[0], 3, 'Checking transit time of grid solution')
+
+    def test_grid_tolerances(self):
+        fitter = PFMParamsFitter(self.fitter.input, self.fitter.fit_data.observations, 1950,
+                                 ConfigModel(['PFM', ((1.0, 10.0), )]), 0.06, tolerances={'ftol': 1e-4, 'maxiter': 5})
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            solution = fitter.run_algorithm()
+
+        self.assertLessEqual(solution.nit, 5, 'Checking if supported tolerances are passed to bounded minimization')
+
 
 if __name__ == '__main__':
     unittest.main()
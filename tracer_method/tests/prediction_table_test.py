@@ -0,0 +1,74 @@
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
+from tracer_method.core.curve_fitter.prediction_table import PredictionTable
+from tracer_method.core.tritium.tritium_method import fit_model
+
+
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        self.input_data = np.array([np.round(np.arange(0.00001, 60, 1), 2), 10 + 50 * np.exp(-np.arange(60) / 10)])
+        self.obs = np.array([np.arange(1990.3, 2010, 4), np.linspace(20, 5, 5)])
+        self.cfg = ConfigModel(['DM', ((5.0, 90.0), (0.01, 1.0)), 0.2])
+        self.decay = 0.056
+
+    def test_interpolate(self):
+        with tempfile.TemporaryDirectory() as directory:
+            table = PredictionTable.get_or_build(Path(directory), self.input_data, 1950, self.cfg, self.decay,
+                                                 ParamsFitter)
+            loaded = pickle.loads(pickle.dumps(table))
+            nodes = table.nodes[[0, 100, 1000]]
+
+            fitter = ParamsFitter(self.input_data, self.obs, 1950, self.cfg, self.decay)
+
+            np.testing.assert_allclose(fitter.get_batch_predictions(nodes), loaded.interpolate(nodes, self.obs[0]),
+                                       err_msg='Checking predictions of table nodes')
+
+            between = np.mean(table.nodes[[0, 42]], axis=0)
+            np.testing.assert_allclose(fitter.get_batch_predictions(between), loaded.interpolate(between, self.obs[0]),
+                                       rtol=0.05, err_msg='Checking predictions interpolated between table nodes')
+
+            self.assertEqual(table.path, PredictionTable.get_or_build(Path(directory), self.input_data, 1950,
+                                                                      self.cfg, self.decay, ParamsFitter).path,
+                             'Checking if table is reused for the same input')
+
+            del loaded, table
+
+    def test_run_with_table(self):
+        with tempfile.TemporaryDirectory() as directory:
+            table = PredictionTable.get_or_build(Path(directory), self.input_data, 1950, self.cfg, self.decay,
+                                                 ParamsFitter)
+            solution = ParamsFitter(self.input_data, self.obs, 1950, self.cfg, self.decay,
+                                    prediction_table=table).run_algorithm()
+            cold_solution = ParamsFitter(self.input_data, self.obs, 1950, self.cfg, self.decay).run_algorithm()
+
+            # observations after the last date of the table
+            late_obs = np.array([np.arange(1990.3, 2030, 4), np.linspace(20, 5, 10)])
+            late_solution = ParamsFitter(self.input_data, late_obs, 1950, self.cfg, self.decay,
+                                         prediction_table=table).run_algorithm()
+            late_cold_solution = ParamsFitter(self.input_data, late_obs, 1950, self.cfg, self.decay).run_algorithm()
+
+            del table
+
+        np.testing.assert_array_equal(late_cold_solution.x, late_solution.x,
+                                      err_msg='Checking if fit of observations outside of table is started cold')
+
+        self.assertLessEqual(solution.fun, cold_solution.fun * 1.01,
+                             'Checking if fit started from table is as good as cold fit')
+
+    def test_pfm_without_table(self):
+        with tempfile.TemporaryDirectory() as directory:
+            fit_model(self.input_data, self.obs, 1950, self.decay, ['PFM', ((5.0, 40.0), )],
+                      table_directory=Path(directory))
+
+            self.assertListEqual([], list(Path(directory).iterdir()), 'Checking if table is not built for PFM')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tracer_method.core.exceptions import FileException
+from tracer_method.core.read_data.read_input_file import read_tritium_file
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        self.data = pd.DataFrame({'Date': pd.date_range('1960-01-01', periods=24, freq='MS'),
+                                  'Concentration': np.arange(24, dtype=float),
+                                  'Precipitation': np.arange(24, dtype=float) + 100})
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check_input(self, input_data):
+        dates, concentration, precipitation = input_data
+
+        np.testing.assert_array_equal(np.arange('1960-01', '1962-01', dtype='datetime64[M]'), dates,
+                                      err_msg='Checking dates')
+
+        np.testing.assert_array_equal(self.data['Concentration'], concentration, err_msg='Checking concentration')
+
+        np.testing.assert_array_equal(self.data['Precipitation'], precipitation, err_msg='Checking precipitation')
+
+    def test_read_csv(self):
+        self.data.to_csv(self.path / 'input.csv', index=False)
+
+        self.check_input(read_tritium_file(self.path / 'input.csv', chunk_size=5))
+
+    def test_read_npz(self):
+        np.savez(self.path / 'input.npz', **{name: self.data[name].to_numpy() for name in self.data.columns})
+
+        self.check_input(read_tritium_file(self.path / 'input.npz'))
+
+    def test_read_npy(self):
+        array = np.zeros(24, dtype=[('Date', 'datetime64[D]'), ('Concentration', float), ('Precipitation', float)])
+        for name in self.data.columns:
+            array[name] = self.data[name].to_numpy()
+        np.save(self.path / 'input.npy', array)
+
+        self.check_input(read_tritium_file(self.path / 'input.npy', chunk_size=7))
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_read_parquet_and_feather(self):
+        self.data.to_parquet(self.path / 'input.parquet')
+        self.data.to_feather(self.path / 'input.feather')
+
+        self.check_input(read_tritium_file(self.path / 'input.parquet', chunk_size=5))
+
+        self.check_input(read_tritium_file(self.path / 'input.feather', chunk_size=5))
+
+    def test_invalid_data(self):
+        self.data.loc[5, 'Precipitation'] = np.nan
+        self.data.to_csv(self.path / 'input.csv', index=False)
+        self.data[['Date', 'Concentration']].to_csv(self.path / 'missing.csv', index=False)
+
+        with self.assertRaises(FileException, msg='Checking if missing values are found'):
+            read_tritium_file(self.path / 'input.csv', chunk_size=5)
+
+        with self.assertRaises(FileException, msg='Checking if missing column is found'):
+            read_tritium_file(self.path / 'missing.csv')
+
+        with self.assertRaises(FileException, msg='Checking not supported extension'):
+            read_tritium_file(self.path / 'input.txt')
+
+
+if __name__ == '__main__':
+    unittest.main()
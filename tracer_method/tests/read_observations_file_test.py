@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tracer_method.core.exceptions import FileException
+from tracer_method.core.read_data.read_observations_file import convert_date_to_year, iterate_sites_observations, \
+    read_observations, read_sites_observations
+
+
+class TestClass(unittest.TestCase):
+    def test_convert_date_to_year(self):
+        dates = np.array(['1974-05-30', '1976-07-02', '2000-12-31', '2001-01-01', '1969-07-02'], dtype='datetime64[D]')
+
+        np.testing.assert_allclose([1974 + 149 / 365, 1976.5, 2000 + 365 / 366, 2001, 1969 + 182 / 365],
+                                   convert_date_to_year(dates), err_msg='Checking conversion of dates to years')
+
+    def test_convert_date_to_year_legacy_rounding(self):
+        dates = np.array(['1974-05-30', '1975-10-23', '1976-04-22', '2000-12-31'], dtype='datetime64[D]')
+
+        self.assertListEqual([1974.41, 1975.81, 1976.31, 2001.0], list(convert_date_to_year(dates, True)),
+                             'Checking conversion of dates to years with legacy rounding')
+
+    def test_read_observations(self):
+        with tempfile.TemporaryDirectory() as directory:
+            obs_file = Path(directory) / 'observations.csv'
+            pd.DataFrame({'Date': ['1974-05-30', '1975-10-23', '1976-04-22'],
+                          'Concentration': [10.0, 12.5, 8.0]}).to_csv(obs_file, index=False)
+
+            observations = read_observations(obs_file, legacy_rounding=True, chunk_size=2)
+
+        np.testing.assert_array_equal([[1974.41, 1975.81, 1976.31], [10.0, 12.5, 8.0]], observations,
+                                      err_msg='Checking observations read in chunks')
+
+    def test_read_sites_observations(self):
+        with tempfile.TemporaryDirectory() as directory:
+            obs_file = Path(directory) / 'observations.csv'
+            data = pd.DataFrame({'Site': ['well-1', 'well-1', 'spring-2', 'spring-2', 'spring-2', 'well-3'],
+                                 'Date': ['1974-01-01', '1975-01-01', '1980-01-01', '1981-01-01', '1982-01-01',
+                                          '1990-01-01'],
+                                 'Concentration': [10.0, 11.0, 20.0, 21.0, 22.0, 30.0]})
+            data.to_csv(obs_file, index=False)
+
+            sites = read_sites_observations(obs_file, chunk_size=4)
+            iterated_sites = dict(iterate_sites_observations(obs_file, chunk_size=4))
+
+            self.assertListEqual(['well-1', 'spring-2', 'well-3'], list(sites), 'Checking sites in order of file')
+
+            np.testing.assert_array_equal([[1980, 1981, 1982], [20.0, 21.0, 22.0]], sites['spring-2'],
+                                          err_msg='Checking observations split by site')
+
+            for site, obs in sites.items():
+                np.testing.assert_array_equal(obs, iterated_sites[site], err_msg='Checking iterated observations')
+
+            data.iloc[[0, 2, 1]].to_csv(obs_file, index=False)
+
+            with self.assertRaises(FileException, msg='Checking if not grouped sites are found'):
+                list(iterate_sites_observations(obs_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,8 @@ import unittest
 
 import numpy as np
 
-from tracer_method.core.curve_fitter.response_functions import dispersion, exponential_piston_flow, exponential
+from tracer_method.core.curve_fitter.response_functions import dispersion, dispersion_batch, exponential, \
+    exponential_batch, exponential_piston_flow, exponential_piston_flow_batch
 
 
 class TestClass(unittest.TestCase):
@@ -30,6 +31,20 @@ class TestClass(unittest.TestCase):
                              [i for i in response_function],
                              'Checking values of exponential piston flow response function')
 
+    def test_batch_models(self):
+        models = [(exponential, exponential_batch, np.array([[5], [30], [120]])),
+                  (exponential_piston_flow, exponential_piston_flow_batch, np.array([[30, 1.05], [2, 2.5]])),
+                  (dispersion, dispersion_batch, np.array([[30, 0.05], [3, 0.5], [70, 1.1]]))]
+
+        for response_function, batch_response_function, parameters in models:
+            response_functions = batch_response_function(self.time, parameters)
+
+            self.assertTupleEqual((len(parameters), len(self.time)), response_functions.shape,
+                                  'Checking shape of batch response functions')
+
+            np.testing.assert_allclose([response_function(self.time, i) for i in parameters], response_functions,
+                                       err_msg='Checking values of batch response functions')
+
 
 if __name__ == '__main__':
     unittest.main()
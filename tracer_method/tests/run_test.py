@@ -5,6 +5,16 @@ import numpy as np
 from tracer_method.core.config.config_model import ConfigModel
 from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
 from tracer_method.core.run import run, get_params_accuracy, run_method
+from tracer_method.core.session import FittingSession
+
+
+class RecordingParamsFitter(ParamsFitter):
+    """ ParamsFitter which records optimizers of all created fitters. """
+    optimizers = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.optimizers.append(self.optimizer)
 
 
 class TestClass(unittest.TestCase):
@@ -32,6 +42,17 @@ class TestClass(unittest.TestCase):
         self.assertListEqual([0.0, 6.938893903907228e-18], [i for i in params_accuracy],
                              'Checking if params accuracy is calculated')
 
+    def test_run_optimizer(self):
+        input_data = np.array([np.round(np.arange(0.00001, 60, 1), 2), 10 + 50 * np.exp(-np.arange(60) / 10)])
+        obs = np.array([np.arange(1990.3, 2010, 4), np.linspace(20, 5, 5)])
+        config = ConfigModel(['DM', ((5.0, 90.0), (0.01, 1.0))])
+
+        with FittingSession(0, 4) as session:
+            run(input_data, obs, 1950, config, 0.06, RecordingParamsFitter, True, session, optimizer='least_squares')
+
+        self.assertListEqual(['least_squares'] * 6, RecordingParamsFitter.optimizers,
+                             'Checking if optimizer is used by the fit and refits of params accuracy')
+
     def test_run_method(self):
         solution = run_method(self.input_data, self.observations_data, 1, self.config, self.decay, self.fitter)
 
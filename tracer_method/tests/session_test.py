@@ -0,0 +1,144 @@
+import pickle
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from tracer_method.core.config.accuracy_config import AccuracyConfig
+from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
+from tracer_method.core.run import run
+from tracer_method.core.session import _attached_arrays, FittingSession, SharedArray
+
+
+def get_array_sum(shared: SharedArray) -> float:
+    return float(shared.get().sum())
+
+
+def get_attached_names(shared: SharedArray) -> set:
+    shared.get()
+    return set(_attached_arrays)
+
+
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        self.session = FittingSession(n_workers=2, n_samples=8)
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_share(self):
+        array = np.arange(12, dtype='float64').reshape(3, 4)
+        shared = self.session.share(array)
+
+        self.assertListEqual(array.tolist(), shared.get().tolist(), 'Checking if shared array has the same values')
+
+        self.assertEqual(shared.name, self.session.share(array.copy()).name,
+                         'Checking if array with the same content is shared once')
+
+        self.session.release(shared)
+        self.assertListEqual(array.tolist(), shared.get().tolist(), 'Checking if array is shared until all release it')
+
+        self.session.release(shared)
+        self.assertRaises(FileNotFoundError, shared_memory.SharedMemory, name=shared.name)
+
+    def test_release_in_workers(self):
+        names = []
+        for i in range(3):
+            shared = self.session.share(np.full(4, float(i)))
+            names.append(shared.name)
+            self.session.map(get_array_sum, [shared] * 4)
+            self.session.release(shared)
+
+        shared = self.session.share(np.zeros(4))
+        attached = set().union(*self.session.map(get_attached_names, [shared] * 8))
+        self.session.release(shared)
+
+        self.assertTrue(attached.isdisjoint(names), 'Checking if workers detach released arrays')
+
+        self.assertIn(shared.name, attached, 'Checking if used array is attached')
+
+    def test_concurrent_use(self):
+        array = np.arange(4, dtype='float64')
+        with ThreadPoolExecutor(8) as executor:
+            executors = list(executor.map(lambda _: self.session.executor, range(8)))
+            shared = list(executor.map(lambda _: self.session.share(array), range(8)))
+
+        self.assertEqual(1, len({id(i) for i in executors}), 'Checking if pool is started once')
+
+        self.assertEqual(1, len({i.name for i in shared}), 'Checking if array is shared once')
+
+        for i in shared:
+            self.session.release(i)
+        self.assertRaises(FileNotFoundError, shared_memory.SharedMemory, name=shared[0].name)
+
+        self.assertEqual(8, pickle.loads(pickle.dumps(self.session.in_worker())).n_samples,
+                         'Checking if session can be sent to workers')
+
+    def test_map(self):
+        self.assertListEqual([0, 1, 4, 9, 16], self.session.map(np.square, range(5)),
+                             'Checking if results are returned in order of tasks')
+
+    def test_run_parallel(self):
+        completed = []
+        for mode in ('process', 'thread'):
+            results = self.session.run_parallel(pow, [(2, 3), (3, 2), (5, 1)], mode, completed.append)
+
+            self.assertListEqual([8, 9, 5], results, 'Checking if results are returned in order of tasks')
+
+        self.assertEqual(6, len(completed), 'Checking if callback is called for each result')
+
+    def test_in_worker(self):
+        session = self.session.in_worker()
+
+        self.assertEqual(0, session.n_workers, 'Checking if session runs tasks in the calling process')
+
+        self.assertEqual(8, session.n_samples, 'Checking if number of samples is kept')
+
+        self.assertListEqual([0, 1, 4], session.map(np.square, range(3)), 'Checking tasks run in calling process')
+
+    def test_get_chunk_size(self):
+        self.assertEqual(13, self.session.get_chunk_size(100), 'Checking default chunk size')
+
+        self.assertEqual(5, FittingSession(chunk_size=5).get_chunk_size(100), 'Checking configured chunk size')
+
+    def test_run_with_session(self):
+        input_data = np.array([np.round(np.arange(0.00001, 40, 1), 2), 10 + 50 * np.exp(-np.arange(40) / 10)])
+        obs = np.array([np.arange(1975.3, 1990, 4), np.array([30.0, 25.0, 21.0, 18.0])])
+        config = ConfigModel(['EM', ((5.0, 50.0), )])
+
+        for _ in range(2):
+            result = run(input_data, obs, 1950, config, 0.056, ParamsFitter, True, self.session)
+
+            self.assertEqual(1, len(result.confidence_level), 'Checking if params accuracy is calculated')
+
+            self.assertTupleEqual((8, 2), result.refits_evaluations.shape,
+                                  'Checking if iterations and evaluations of each refit are reported')
+
+    def test_global_search_with_session(self):
+        input_data = np.array([np.round(np.arange(0.00001, 40, 1), 2), 10 + 50 * np.exp(-np.arange(40) / 10)])
+        obs = np.array([np.arange(1975.3, 1990, 4), np.array([30.0, 25.0, 21.0, 18.0])])
+        config = ConfigModel(['DM', ((5.0, 80.0), (0.05, 1.0)), 0, 'global'])
+
+        result = run(input_data, obs, 1950, config, 0.056, ParamsFitter, False, self.session)
+        expected = run(input_data, obs, 1950, config, 0.056, ParamsFitter, False, FittingSession(0))
+
+        np.testing.assert_allclose(expected.params, result.params,
+                                   err_msg='Checking if fitter is sent to worker processes in global search')
+
+    def test_warm_start(self):
+        input_data = np.array([np.round(np.arange(0.00001, 40, 1), 2), 10 + 50 * np.exp(-np.arange(40) / 10)])
+        obs = np.array([np.arange(1975.3, 1990, 4), np.array([8.61, 7.08, 6.63, 5.78])])
+        config = ConfigModel(['EM', ((5.0, 50.0), ), 0.2])
+        evaluations = []
+
+        for accuracy_config in (AccuracyConfig(seed=2, warm_start=False), AccuracyConfig(seed=2)):
+            result = run(input_data, obs, 1950, config, 0.056, ParamsFitter, True, self.session, accuracy_config)
+            evaluations.append(result.refits_evaluations[:, 1].sum())
+
+        self.assertLess(evaluations[1], evaluations[0], 'Checking if warm-started refits need fewer evaluations')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+from scipy import integrate
+
+from tracer_method.core.curve_fitter.response_functions import dispersion, exponential, exponential_piston_flow
+from tracer_method.core.curve_fitter.support_length import CUMULATIVE_FUNCTIONS, _get_support_length, get_support, \
+    get_support_length
+
+
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        self.models = [('EM', exponential, np.array([30.0, ])),
+                       ('EPM', exponential_piston_flow, np.array([30.0, 1.5])),
+                       ('DM', dispersion, np.array([30.0, 0.3]))]
+
+    def test_cumulative_functions(self):
+        for model_type, response_function, params in self.models:
+            expected = integrate.quad(response_function, 0.001, 100, args=(params,), points=[10])[0]
+            calculated = CUMULATIVE_FUNCTIONS[model_type](100, params) - CUMULATIVE_FUNCTIONS[model_type](0.001, params)
+
+            self.assertAlmostEqual(expected, calculated, 6, f'Checking cumulative function of {model_type}')
+
+    def test_get_support(self):
+        t = get_support('EM', np.array([5.0, ]))
+
+        self.assertListEqual([0.001, 1.001, 2.001], [i for i in t[:3]], 'Checking arguments of response function')
+
+        self.assertEqual(26, len(t), 'Checking if time range includes 99% of response function')
+
+    def test_get_support_length_is_cached(self):
+        length = get_support_length('DM', np.array([40.0, 0.2]))
+        hits = _get_support_length.cache_info().hits
+
+        self.assertEqual(length, get_support_length('DM', np.array([40.0 + 1e-9, 0.2])),
+                         'Checking if the same length is returned for close params')
+
+        self.assertEqual(hits + 1, _get_support_length.cache_info().hits,
+                         'Checking if params are rounded before caching')
+
+
+if __name__ == '__main__':
+    unittest.main()
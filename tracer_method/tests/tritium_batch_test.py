@@ -0,0 +1,88 @@
+import os
+import unittest
+
+import numpy as np
+
+from tracer_method.core.session import FittingSession
+from tracer_method.core.tritium.tritium_batch import tritium_method_alpha_sweep, tritium_method_batch
+from tracer_method.core.tritium.tritium_method import tritium_method
+
+
+class CrashingObservations:
+    """ Observations which make the worker process exit when they are unpickled. """
+
+    def __reduce__(self):
+        return os._exit, (1, )
+
+
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        dates = np.arange('1953-01', '2003-01', dtype='datetime64[M]')
+        concentration = np.random.default_rng(0).uniform(10, 100, len(dates))
+        self.input_data = (dates, concentration, np.full(len(dates), 50.0))
+        self.observations = {
+            'well-1': np.array([np.arange(1975.3, 2000, 4), np.linspace(40, 10, 7)]),
+            'spring-2': np.array([np.arange(1980.5, 2000, 5), np.linspace(30, 15, 4)]),
+            'broken': np.array([np.arange(1980.5, 2000, 5)]),
+        }
+        self.model_configs = [['EM', ((5.0, 80.0), )], ['DM', ((5.0, 80.0), (0.05, 1.0))]]
+
+    def test_tritium_method_batch(self):
+        completed = []
+        with FittingSession(n_workers=2) as session:
+            results = tritium_method_batch(self.input_data, self.observations, 0.7, self.model_configs,
+                                           session=session, callback=completed.append)
+
+        self.assertEqual(6, len(results), 'Checking if each site and model is fitted')
+
+        self.assertEqual(6, len(completed), 'Checking if callback is called for each result')
+
+        arrays = results.to_arrays()
+        failed = arrays['site'] == 'broken'
+
+        self.assertTrue(all(i is not None for i in arrays['error'][failed]), 'Checking if failures are isolated')
+
+        self.assertTrue(all(i is None for i in arrays['error'][~failed]), 'Checking if other sites are fitted')
+
+        self.assertTupleEqual((6, 2), arrays['params'].shape, 'Checking shape of params column')
+
+        expected = tritium_method(self.input_data, self.observations['well-1'], 0.7, self.model_configs)
+        for model_index, result in enumerate(expected):
+            row = np.flatnonzero((arrays['site'] == 'well-1') & (arrays['model_index'] == model_index))[0]
+
+            self.assertEqual(result.mse, arrays['mse'][row], 'Checking if batch result is the same as single fit')
+
+    def test_tritium_method_batch_crash(self):
+        observations = {'well-1': self.observations['well-1'], 'crash': CrashingObservations()}
+        with FittingSession(n_workers=2) as session:
+            results = tritium_method_batch(self.input_data, observations, 0.7, self.model_configs, session=session)
+
+            self.assertDictEqual({}, session._FittingSession__shared_blocks,
+                                 'Checking if shared input of the batch is released')
+
+        arrays = results.to_arrays()
+        crashed = arrays['site'] == 'crash'
+
+        self.assertEqual(4, len(results), 'Checking if each site and model is in results')
+
+        self.assertTrue(all('BrokenProcessPool' in i for i in arrays['error'][crashed]),
+                        'Checking if crash of worker process is stored as error')
+
+        self.assertTrue(all(i is None for i in arrays['error'][~crashed]), 'Checking if other sites are fitted')
+
+    def test_tritium_method_alpha_sweep(self):
+        obs = self.observations['well-1']
+        with FittingSession(n_workers=2) as session:
+            results = tritium_method_alpha_sweep(self.input_data, obs, [0.3, 0.7], self.model_configs, session=session)
+
+        self.assertListEqual([2, 2], [len(i) for i in results], 'Checking if each alpha and model is fitted')
+
+        for alpha, alpha_results in zip([0.3, 0.7], results):
+            for result, single_result in zip(alpha_results, tritium_method(self.input_data, obs, alpha,
+                                                                           self.model_configs)):
+                np.testing.assert_allclose(single_result.params, result.params,
+                                           err_msg='Checking if sweep gives the same params as tritium method')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,6 +18,23 @@ class TestClass(unittest.TestCase):
         self.assertListEqual([0.0, 17.794871794871796], [j for i in input for j in i],
                              'Check if input is calculated correct')
 
+    def test_calculate_alpha_inputs(self):
+        dates = np.arange('1953-01', '1963-01', dtype='datetime64[M]')
+        random = np.random.default_rng(0)
+        concentration, precipitation = random.uniform(10, 100, len(dates)), random.uniform(0, 200, len(dates))
+        alphas = np.array([0.01, 0.3, 0.7, 1.0])
+
+        inputs = TritiumInputPreparer(dates, concentration, precipitation, 0.5).calculate_alpha_inputs(alphas)
+
+        self.assertTupleEqual((4, 10), inputs.shape, 'Checking shape of inputs')
+
+        for alpha, alpha_input in zip(alphas, inputs):
+            rates = np.tile(np.where((np.arange(12) >= 3) & (np.arange(12) < 9), alpha, 1), 10)
+            expected = (precipitation * rates * concentration).reshape(10, 12).sum(axis=1) / \
+                (precipitation * rates).reshape(10, 12).sum(axis=1)
+
+            np.testing.assert_allclose(expected, alpha_input, rtol=1e-12, err_msg='Checking input for each alpha')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,91 @@
+import asyncio
+import unittest
+
+import numpy as np
+
+from tracer_method.core.tritium.tritium_jobs import TritiumJobs
+from tracer_method.core.tritium.tritium_method import tritium_method
+
+
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        dates = np.arange('1953-01', '2003-01', dtype='datetime64[M]')
+        concentration = np.random.default_rng(0).uniform(10, 100, len(dates))
+        self.input_data = (dates, concentration, np.full(len(dates), 50.0))
+        self.obs = np.array([np.arange(1975.3, 2000, 4), np.linspace(40, 10, 7)])
+        self.model_configs = [['EM', ((5.0, 80.0), )], ['DM', ((5.0, 80.0), (0.05, 1.0))]]
+
+    def test_submit(self):
+        async def submit():
+            completed = []
+            async with TritiumJobs(n_workers=2) as jobs:
+                job = jobs.submit(self.input_data, self.obs, 0.7, self.model_configs, callback=completed.append)
+                same_job = jobs.submit(self.input_data, self.obs.copy(), 0.7, self.model_configs)
+                other_job = jobs.submit(self.input_data, self.obs, 0.5, self.model_configs)
+
+                results, same_results, other_results = await asyncio.gather(job, same_job, other_job)
+                cached_job = jobs.submit(self.input_data, self.obs, 0.7, self.model_configs)
+
+                return job, same_job, other_job, cached_job, results, same_results, other_results, completed
+
+        job, same_job, other_job, cached_job, results, same_results, other_results, completed = asyncio.run(submit())
+
+        self.assertEqual(job.key, same_job.key, 'Checking if key depends on content of observations')
+
+        self.assertNotEqual(job.key, other_job.key, 'Checking if key depends on options of the fit')
+
+        self.assertTrue(all(i is j for i, j in zip(results, same_results)),
+                        'Checking if identical jobs are fitted once')
+
+        self.assertTupleEqual((2, 2), job.progress, 'Checking progress of finished job')
+
+        self.assertEqual(2, len(completed), 'Checking if callback is called for each result')
+
+        self.assertTrue(cached_job.done(), 'Checking if results of finished job are taken from the cache')
+
+        for result, expected in zip(results, tritium_method(self.input_data, self.obs, 0.7, self.model_configs)):
+            self.assertEqual(expected.mse, result.mse, 'Checking if job gives the same result as tritium method')
+
+    def test_cancel(self):
+        async def submit():
+            async with TritiumJobs(n_workers=1) as jobs:
+                job, same_job = [jobs.submit(self.input_data, self.obs, 0.7, self.model_configs,
+                                             calculate_params_accuracy=True) for _ in range(2)]
+                job.cancel()
+                results = await same_job
+
+                timed_out_job = jobs.submit(self.input_data, self.obs, 0.5, self.model_configs,
+                                            calculate_params_accuracy=True, timeout=0.01)
+                with self.assertRaises(asyncio.TimeoutError):
+                    await timed_out_job
+
+                return job, results, timed_out_job, dict(jobs.cache)
+
+        job, results, timed_out_job, cache = asyncio.run(submit())
+
+        self.assertTrue(job.cancelled(), 'Checking if job is cancelled')
+
+        self.assertEqual(2, len(results), 'Checking if identical job is fitted after cancellation of the other one')
+
+        self.assertTrue(timed_out_job.cancelled(), 'Checking if job is cancelled after timeout')
+
+        self.assertNotIn(timed_out_job.key, cache, 'Checking if cancelled job is not cached')
+
+    def test_errors(self):
+        async def submit():
+            async with TritiumJobs(n_workers=1) as jobs:
+                with self.assertRaises(Exception):
+                    jobs.submit(self.input_data, self.obs, 0.7, [['XM', ((5.0, 80.0), )]])
+
+                with self.assertRaises(Exception):
+                    await jobs.submit(self.input_data, self.obs[:1], 0.7, self.model_configs)
+
+                return dict(jobs.cache)
+
+        self.assertDictEqual({}, asyncio.run(submit()), 'Checking if failed job is not cached')
+
+        self.assertRaises(ValueError, TritiumJobs, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,11 @@ import unittest
 
 import numpy as np
 
+import tracer_method.core.constans as const
+from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
+from tracer_method.core.session import FittingSession
+from tracer_method.core.tritium.tritium_input_preparer import TritiumInputPreparer
 from tracer_method.core.tritium.tritium_method import tritium_method
 
 
@@ -28,5 +33,60 @@ class TestClass(unittest.TestCase):
         self.assertTrue(self.results[0].response_function, 'Checking if response function is calculated')
 
 
+class TestParallelClass(unittest.TestCase):
+    def setUp(self):
+        dates = np.arange('1953-01', '2003-01', dtype='datetime64[M]')
+        concentration = np.random.default_rng(0).uniform(10, 100, len(dates))
+        self.input_data = (dates, concentration, np.full(len(dates), 50.0))
+        self.observations_data = np.array([np.arange(1975.3, 2000, 4), np.linspace(40, 10, 7)])
+        self.model_configs = [['EM', ((5.0, 80.0), )], ['DM', ((5.0, 80.0), (0.05, 1.0))], ['PFM', ((1.0, 40.0), )]]
+
+    def test_tritium_method_parallel(self):
+        sequential_results = tritium_method(self.input_data, self.observations_data, 0.7, self.model_configs)
+
+        with FittingSession(n_workers=2, n_samples=4) as session:
+            for mode in ('process', 'thread'):
+                completed = []
+                results = tritium_method(self.input_data, self.observations_data, 0.7, self.model_configs, True,
+                                         session, parallel=mode, callback=lambda result: completed.append(result))
+
+                self.assertListEqual(['EM', 'DM', 'PFM'], [i.model_type for i in results],
+                                     'Checking if results are returned in order of model configurations')
+
+                self.assertEqual(3, len(completed), 'Checking if callback is called for each result')
+
+                for sequential_result, result in zip(sequential_results, results):
+                    self.assertListEqual(list(sequential_result.params), list(result.params),
+                                         'Checking if parallel results are the same as sequential')
+
+
+class TestJointClass(unittest.TestCase):
+    def setUp(self):
+        dates = np.arange('1953-01', '2013-01', dtype='datetime64[M]')
+        months = np.arange(len(dates))
+        concentration = 10 + 1000 * np.exp(-((months / 12 - 10) / 3) ** 2) * (1 + 0.8 * np.sin(2 * np.pi * months / 12))
+        self.input_data = (dates, concentration, 50 + 40 * np.sin(2 * np.pi * months / 12 + 1))
+
+        obs_dates = np.arange(1970.5, 2012, 2.0)
+        input_data = TritiumInputPreparer(*self.input_data, 0.4).calculate_input()
+        cfg = ConfigModel(['EPM', ((1.0, 80.0), (1.0, 3.0)), 0.2])
+        x, y = ParamsFitter(input_data, np.array([obs_dates, obs_dates]), 1953, cfg,
+                            np.log(2) / const.DECAY_CONSTANTS['tritium'])._get_predictions(np.array([41.3, 2.05]))
+        self.observations_data = np.array([obs_dates, np.interp(obs_dates, x, y)])
+
+    def test_tritium_method_joint(self):
+        result, = tritium_method(self.input_data, self.observations_data, (0.05, 1.0),
+                                 [['EPM', ((1.0, 80.0), (1.0, 3.0)), (0.0, 0.5), 'global']])
+
+        self.assertAlmostEqual(0.4, result.alpha, delta=0.02, msg='Checking fitted alpha')
+
+        self.assertAlmostEqual(0.2, result.beta, delta=0.01, msg='Checking fitted beta')
+
+        np.testing.assert_allclose([41.3, 2.05], result.params, rtol=0.02, err_msg='Checking fitted model params')
+
+        with self.assertRaises(ValueError, msg='Checking if params accuracy is not available for fitted alpha'):
+            tritium_method(self.input_data, self.observations_data, (0.05, 1.0), [['EM', ((1.0, 80.0), )]], True)
+
+
 if __name__ == '__main__':
     unittest.main()
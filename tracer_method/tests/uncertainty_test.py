@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+from tracer_method.core.config.accuracy_config import AccuracyConfig
+from tracer_method.core.config.config_model import ConfigModel
+from tracer_method.core.curve_fitter.params_fitter import ParamsFitter
+from tracer_method.core.run import get_params_accuracy
+from tracer_method.core.session import FittingSession
+from tracer_method.core.uncertainty import draw_bootstrap_observations, draw_uniform_observations, get_linearized_std
+
+
+class TestClass(unittest.TestCase):
+    def setUp(self):
+        self.obs = np.array([np.arange(1975.3, 1990, 4), np.array([30.0, 25.0, 21.0, 18.0])])
+
+    def test_draw_uniform_observations(self):
+        obs_values = draw_uniform_observations(self.obs, 50, np.random.default_rng(3))
+        std = np.std(self.obs[1])
+
+        self.assertTupleEqual((50, 4), obs_values.shape, 'Checking shape of drawn observations')
+
+        self.assertTrue(np.all(np.abs(obs_values - self.obs[1]) <= std), 'Checking if values are within one sigma')
+
+        np.testing.assert_array_equal(obs_values, draw_uniform_observations(self.obs, 50, np.random.default_rng(3)),
+                                      'Checking if drawn observations are reproducible')
+
+    def test_draw_bootstrap_observations(self):
+        predictions = np.array([29.0, 26.0, 20.0, 18.5])
+        obs_values = draw_bootstrap_observations(self.obs, predictions, 20, np.random.default_rng(3))
+
+        self.assertTrue(np.all(np.isin(np.round(obs_values - predictions, 6), np.round(self.obs[1] - predictions, 6))),
+                        'Checking if residuals are resampled')
+
+    def test_get_linearized_std(self):
+        jacobian = np.array([[1.0], [1.0], [1.0], [1.0]])
+        residuals = np.array([1.0, -1.0, 1.0, -1.0])
+
+        self.assertAlmostEqual(np.sqrt(4 / 3 / 4), get_linearized_std(jacobian, residuals)[0], 10,
+                               'Checking standard deviation of the mean')
+
+    def test_get_params_accuracy(self):
+        input_data = np.array([np.round(np.arange(0.00001, 40, 1), 2), 10 + 50 * np.exp(-np.arange(40) / 10)])
+        config = ConfigModel(['EM', ((5.0, 50.0), )])
+        params = ParamsFitter(input_data, self.obs, 1950, config, 0.056).run_algorithm().x
+
+        level, interval, _ = get_params_accuracy(params, input_data, self.obs, 1950, config, 0.056, ParamsFitter,
+                                                 accuracy_config=AccuracyConfig('linearized'))
+
+        self.assertListEqual([0.95], level, 'Checking confidence level of linearized method')
+
+        self.assertTrue(interval[0][0] < params[0] < interval[0][1], 'Checking confidence interval')
+
+        with FittingSession(n_workers=2, n_samples=6) as session:
+            accuracy = [get_params_accuracy(params, input_data, self.obs, 1950, config, 0.056, ParamsFitter, session,
+                                            AccuracyConfig('bootstrap', seed=1)) for _ in range(2)]
+
+        self.assertEqual(accuracy[0][:2], accuracy[1][:2], 'Checking if seeded params accuracy is reproducible')
+
+    def test_unknown_method(self):
+        self.assertRaises(ValueError, AccuracyConfig, 'jackknife')
+
+
+if __name__ == '__main__':
+    unittest.main()